@@ -102,6 +102,35 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+#
+# QUIZ_READ_CACHE stores per-user quiz list/detail responses (quiz_app/api/read_cache.py):
+#   off     no caching
+#   locmem  per process; only correct with a single web process and no job worker
+#   file    QUIZ_READ_CACHE_DIR on disk, shared by every process on the host
+#   shm     the same in /dev/shm (memory-backed), shared by every process on the host
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+_QUIZ_READ_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'quiz-reads'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache',
+             os.getenv('QUIZ_READ_CACHE_DIR', str(BASE_DIR / 'cache' / 'quiz-reads'))),
+    'shm': ('django.core.cache.backends.filebased.FileBasedCache', '/dev/shm/quizly-quiz-reads'),
+}
+QUIZ_READ_CACHE = os.getenv('QUIZ_READ_CACHE', 'off').lower()
+if QUIZ_READ_CACHE in _QUIZ_READ_CACHE_BACKENDS:
+    _backend, _location = _QUIZ_READ_CACHE_BACKENDS[QUIZ_READ_CACHE]
+    CACHES['quiz_reads'] = {
+        'BACKEND': _backend,
+        'LOCATION': _location,
+        'TIMEOUT': int(os.getenv('QUIZ_READ_CACHE_TIMEOUT', '600')),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('QUIZ_READ_CACHE_MAX_ENTRIES', '5000'))},
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -147,5 +176,14 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         "auth_app.auth.CookieJWTAuthentication",
         "rest_framework_simplejwt.authentication.JWTAuthentication",
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        "quiz_app.api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        "quiz_app.api.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
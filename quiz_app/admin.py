@@ -1,12 +1,20 @@
 # admin.py
 from django.contrib import admin, messages
-from django.http import HttpResponse
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import EmptyPage, Paginator
+from django.http import StreamingHttpResponse
 from django.utils.html import format_html
-from django.utils.timezone import localtime
+from django.utils import timezone
 from django import forms
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Prefetch, Q, QuerySet, Subquery
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 import json
 
-from .models import Quiz, Question
+from .models import Quiz, Question, QuizJob
+from .services import events, quiz_io, search
 
 
 # ---------- Forms ----------
@@ -40,6 +48,115 @@ class QuestionAdminForm(forms.ModelForm):
         return value
 
 
+# ---------- Changelist scaling ----------
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    Foreign-key filter that picks the related object with the admin's select2
+    autocomplete (searching the related ModelAdmin's search_fields) instead of
+    rendering every user or quiz as a choice.
+    """
+    template = "admin/quiz_app/autocomplete_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f"{field_path}__{field.target_field.attname}__exact"
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.admin_site = model_admin.admin_site
+        self.selected = self.used_parameters.get(self.lookup_kwarg, [None])[-1]
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def get_facet_counts(self, pk_attname, filtered_qs):
+        return {}
+
+    def choices(self, changelist):
+        self.query_template = changelist.get_query_string({self.lookup_kwarg: "__value__"})
+        yield {
+            "selected": self.selected is None,
+            "query_string": changelist.get_query_string(remove=[self.lookup_kwarg]),
+            "display": "All",
+        }
+
+    @property
+    def rendered_widget(self):
+        choices = forms.ModelChoiceField(
+            queryset=self.field.remote_field.model._default_manager.all(), required=False)
+        widget = AutocompleteSelect(self.field, self.admin_site, choices=choices.choices)
+        widget.is_required = False
+        return widget.render(self.lookup_kwarg, self.selected, attrs={"id": f"filter_{self.lookup_kwarg}"})
+
+
+def table_row_estimate(table: str):
+    """Row count SQLite's planner has for table (sqlite_stat1, written by ANALYZE), or None."""
+    if connection.vendor != "sqlite":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+        counts = [int(stat.split()[0]) for stat, in cursor.fetchall() if stat]
+    return max(counts, default=None)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts at most `cap` rows (COUNT over a LIMITed subquery). Beyond that an
+    unfiltered changelist reports SQLite's row estimate and a filtered one
+    reports the cap, so no page load counts a whole table.
+
+    An estimated count is for display only: a page past it is served if a
+    LIMIT/OFFSET probe finds a row there, and pages are never cut short at it.
+    """
+    cap = 10000
+    exact = True
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        if not isinstance(qs, QuerySet):
+            return super().count
+        capped = qs.order_by()[:self.cap + 1].count()
+        if capped <= self.cap:
+            return capped
+        self.exact = False
+        estimate = table_row_estimate(qs.model._meta.db_table) if not qs.query.where else None
+        return max(estimate or 0, self.cap)
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            number = int(number)
+            if self.count and not self.exact and number > 1 and self._page_has_rows(number):
+                return number
+            raise
+
+    def _page_has_rows(self, number):
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom:bottom + 1].exists()
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist defaults that stay fast on big tables: no full counts, no facet counts."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    @property
+    def media(self):
+        # select2 assets for AutocompleteFilter
+        return super().media + AutocompleteSelect(None, self.admin_site).media
+
+
 # ---------- Inlines ----------
 
 class QuestionInline(admin.TabularInline):
@@ -55,78 +172,76 @@ class QuestionInline(admin.TabularInline):
 
 # ---------- Admin Actions ----------
 
-def export_quizzes_as_json(modeladmin, request, queryset):
+@admin.action(description="Export selected quizzes as NDJSON")
+def export_quizzes_as_ndjson(modeladmin, request, queryset):
     """
-    Export selected quizzes (with nested questions) as a JSON file.
+    Stream the selected quizzes (with nested questions) as NDJSON, one quiz
+    per line, read in id chunks so memory stays flat however many are selected.
+    The file can be loaded with `manage.py import_quizzes`.
     """
-    payload = []
-    for quiz in queryset.select_related("user").prefetch_related("questions"):
-        payload.append({
-            "id": quiz.id,
-            "user_id": quiz.user_id,
-            "title": quiz.title,
-            "description": quiz.description,
-            "video_url": quiz.video_url,
-            "created_at": localtime(quiz.created_at).isoformat(),
-            "updated_at": localtime(quiz.updated_at).isoformat(),
-            "questions": [
-                {
-                    "id": q.id,
-                    "question_title": q.question_title,
-                    "question_options": q.question_options,
-                    "answer": q.answer,
-                    "created_at": localtime(q.created_at).isoformat(),
-                    "updated_at": localtime(q.updated_at).isoformat(),
-                }
-                for q in quiz.questions.all().order_by("id")
-            ],
-        })
-    data = json.dumps(payload, ensure_ascii=False, indent=2)
-    resp = HttpResponse(data, content_type="application/json; charset=utf-8")
-    resp["Content-Disposition"] = "attachment; filename=quizzes.json"
+    resp = StreamingHttpResponse(quiz_io.export_lines(queryset), content_type="application/x-ndjson")
+    resp["Content-Disposition"] = "attachment; filename=quizzes.ndjson"
     return resp
 
 
-export_quizzes_as_json.short_description = "Export selected quizzes as JSON"
+@admin.action(description="Export selected quizzes as JSON")
+def export_quizzes_as_json(modeladmin, request, queryset):
+    """
+    The selected quizzes (with nested questions) as one JSON array file, the
+    same records as the NDJSON export, streamed chunk by chunk.
+    """
+    resp = StreamingHttpResponse(quiz_io.export_json_array(queryset), content_type="application/json; charset=utf-8")
+    resp["Content-Disposition"] = "attachment; filename=quizzes.json"
+    return resp
 
 
 @admin.action(description="Duplicate selected quizzes (including questions)")
 def duplicate_quizzes(modeladmin, request, queryset):
-    copied = 0
-    for quiz in queryset.prefetch_related("questions"):
-        original_questions = list(quiz.questions.all().order_by("id"))
-        quiz.pk = None
-        quiz.title = f"Copy of {quiz.title}"
-        quiz.save()
-        for q in original_questions:
-            Question.objects.create(
-                quiz=quiz,
+    """
+    Copies are written with two bulk INSERTs (quizzes, then questions), so
+    the action costs the same handful of queries for 1 or 1000 quizzes.
+    """
+    originals = list(queryset.order_by("id").prefetch_related(
+        Prefetch("questions", queryset=Question.objects.order_by("id"))))
+    copies = []
+    for quiz in originals:
+        copy = Quiz(**{f.attname: getattr(quiz, f.attname) for f in Quiz._meta.concrete_fields if not f.primary_key})
+        copy.title = f"Copy of {quiz.title}"
+        copies.append(copy)
+    with transaction.atomic():
+        Quiz.objects.bulk_create(copies, batch_size=500)
+        Question.objects.bulk_create([
+            Question(
+                quiz=copy,
                 question_title=q.question_title,
                 question_options=q.question_options,
                 answer=q.answer,
             )
-        copied += 1
-    messages.success(request, f"Duplicated {copied} quiz(zes).")
+            for quiz, copy in zip(originals, copies)
+            for q in quiz.questions.all()
+        ], batch_size=500)
+    events.quizzes_changed([copy.id for copy in copies], [copy.user_id for copy in copies])
+    messages.success(request, f"Duplicated {len(copies)} quiz(zes).")
 
 
 # ---------- ModelAdmins ----------
 
 @admin.register(Quiz)
-class QuizAdmin(admin.ModelAdmin):
+class QuizAdmin(LargeTableAdmin):
     inlines = [QuestionInline]
     save_on_top = True
     list_display = (
         "id", "title", "user", "question_count", "video_preview", "created_at", "updated_at",
     )
     list_display_links = ("id", "title")
-    list_filter = ("user", "created_at", "updated_at")
+    list_filter = (("user", AutocompleteFilter), "created_at", "updated_at")
     search_fields = ("title", "description", "user__username",
                      "questions__question_title")
     date_hierarchy = "created_at"
     ordering = ("-created_at",)
     list_select_related = ("user",)
     readonly_fields = ("created_at", "updated_at")
-    actions = [duplicate_quizzes, export_quizzes_as_json]
+    actions = [duplicate_quizzes, export_quizzes_as_json, export_quizzes_as_ndjson]
     autocomplete_fields = ("user",)
 
     fieldsets = (
@@ -138,9 +253,51 @@ class QuizAdmin(admin.ModelAdmin):
         }),
     )
 
-    @admin.display(description="Questions", ordering="id")
+    def get_queryset(self, request):
+        # a correlated count per displayed row (question_quiz_id_idx), not a GROUP BY over the join
+        questions = (
+            Question.objects.filter(quiz=OuterRef("pk")).order_by()
+            .values("quiz").annotate(n=Count("*")).values("n")
+        )
+        return super().get_queryset(request).annotate(_question_count=Coalesce(Subquery(questions), 0))
+
+    def get_search_results(self, request, queryset, search_term):
+        # the FTS index replaces LIKE scans joined over every question
+        if not search.available() or not search.match_expression(search_term):
+            return super().get_search_results(request, queryset, search_term)
+        sql, params = search.matching_sql(search_term)
+        matches = Q(pk__in=RawSQL(sql, params)) | Q(user__username__icontains=search_term.strip())
+        return queryset.filter(matches), False
+
+    def save_formset(self, request, form, formset, change):
+        # rows are saved quietly; save_related emits once for the whole quiz
+        instances = formset.save(commit=False)
+        for obj in formset.deleted_objects:
+            obj.delete(emit=False)
+        for obj in instances:
+            obj.save(emit=False)
+        formset.save_m2m()
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # inline edits and deletes must move the quiz's Last-Modified forward
+        Quiz.objects.filter(pk=form.instance.pk).update(updated_at=timezone.now())
+        # a reassigned quiz also leaves its previous owner's list
+        events.quizzes_changed([form.instance.pk], [form.instance.user_id, form.initial.get("user")])
+
+    def delete_model(self, request, obj):
+        quiz_id = obj.pk
+        super().delete_model(request, obj)
+        events.quizzes_deleted([quiz_id], [obj.user_id])
+
+    def delete_queryset(self, request, queryset):
+        rows = list(queryset.values_list("pk", "user_id"))
+        super().delete_queryset(request, queryset)
+        events.quizzes_deleted([pk for pk, _ in rows], [user_id for _, user_id in rows])
+
+    @admin.display(description="Questions", ordering="_question_count")
     def question_count(self, obj: Quiz):
-        return obj.questions.count()
+        return obj._question_count
 
     @admin.display(description="Video")
     def video_preview(self, obj: Quiz):
@@ -150,19 +307,50 @@ class QuizAdmin(admin.ModelAdmin):
 
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(LargeTableAdmin):
     form = QuestionAdminForm
     save_on_top = True
     list_display = ("id", "short_title", "quiz", "answer", "created_at")
     list_display_links = ("id", "short_title")
-    list_filter = ("quiz", "created_at", "updated_at")
+    list_filter = (("quiz", AutocompleteFilter), "created_at", "updated_at")
     search_fields = ("question_title", "answer", "quiz__title")
-    ordering = ("quiz", "id")
+    ordering = ("quiz_id", "id")  # "quiz" would join and sort by Quiz.Meta.ordering
+    list_select_related = ("quiz",)
     readonly_fields = ("created_at", "updated_at")
     autocomplete_fields = ("quiz",)
     fields = ("quiz", "question_title", "question_options",
               "answer", "created_at", "updated_at")
 
+    # Question.save()/delete() emit the change for obj.quiz; bump it first so the
+    # refreshed snapshot carries the new updated_at
+    def save_model(self, request, obj, form, change):
+        previous = Question.objects.filter(pk=obj.pk).values_list("quiz_id", flat=True).first() if change else None
+        Quiz.objects.filter(pk__in=[obj.quiz_id, previous]).update(updated_at=timezone.now())
+        super().save_model(request, obj, form, change)
+        if previous != obj.quiz_id:
+            events.quizzes_changed([previous])
+
+    def delete_model(self, request, obj):
+        Quiz.objects.filter(pk=obj.quiz_id).update(updated_at=timezone.now())
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        quiz_ids = set(queryset.values_list("quiz_id", flat=True))
+        super().delete_queryset(request, queryset)
+        Quiz.objects.filter(pk__in=quiz_ids).update(updated_at=timezone.now())
+        events.quizzes_changed(quiz_ids)
+
     @admin.display(description="Question")
     def short_title(self, obj: Question):
         return (obj.question_title or "")[:70]
+
+
+@admin.register(QuizJob)
+class QuizJobAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "state", "stage", "quiz", "attempts", "created_at", "finished_at")
+    list_filter = ("state", "created_at")
+    search_fields = ("url", "user__username", "error")
+    ordering = ("-created_at",)
+    list_select_related = ("user", "quiz")
+    readonly_fields = ("created_at", "updated_at", "started_at", "finished_at")
+    autocomplete_fields = ("user", "quiz")
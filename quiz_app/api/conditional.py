@@ -0,0 +1,75 @@
+import hashlib
+from calendar import timegm
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def quiz_validators(queryset) -> dict:
+    """
+    One aggregate query over the quizzes in queryset and their questions:
+    row counts catch deletes, the newest updated_at catches edits and inserts.
+    """
+    return queryset.order_by().aggregate(
+        quiz_count=Count('id', distinct=True),
+        quiz_updated=Max('updated_at'),
+        question_count=Count('questions'),
+        question_updated=Max('questions__updated_at'),
+    )
+
+
+def quiz_instance_validators(quiz) -> dict:
+    """quiz_validators() for one loaded quiz, from its (prefetched) questions."""
+    questions = list(quiz.questions.all())
+    return {
+        'quiz_count': 1,
+        'quiz_updated': quiz.updated_at,
+        'question_count': len(questions),
+        'question_updated': max((q.updated_at for q in questions), default=None),
+    }
+
+
+def validators_digest(agg: dict) -> str:
+    return hashlib.sha1('|'.join(str(v) for v in agg.values()).encode()).hexdigest()
+
+
+def request_etag(request, digest: str) -> str:
+    """The ETag for request given validators_digest(); snapshots store the digest and tag the same way."""
+    raw = f'{request.user.pk}|{request.get_full_path()}|{digest}'
+    return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    ETag (and optionally Last-Modified) for GET, derived from quiz_validators()
+    so that a matching If-None-Match / If-Modified-Since is answered with 304
+    before any row is loaded or serialized.
+    """
+    send_last_modified = False
+
+    def get_validator_queryset(self):
+        raise NotImplementedError
+
+    def get_validators(self, request):
+        agg = quiz_validators(self.get_validator_queryset())
+        if not agg['quiz_count']:
+            return None, None
+        etag = request_etag(request, validators_digest(agg))
+        stamps = [t for t in (agg['quiz_updated'], agg['question_updated']) if t is not None]
+        last_modified = timegm(max(stamps).utctimetuple()) if self.send_last_modified and stamps else None
+        return etag, last_modified
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if etag is not None:
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                return not_modified
+        response = super().get(request, *args, **kwargs)
+        if etag is not None and response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,93 @@
+import os
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework.settings import api_settings
+
+from ..models import Question
+from .serializers import QuestionSerializer, QuizListSerializer, QuizSummarySerializer, check_fields, requested_fields
+
+# Read-only twins of QuizListSerializer / QuizSummarySerializer that work on
+# .values() rows: no model instances, no per-row field objects. The output
+# dicts have the same keys, order and value formatting as the serializers.
+
+QUIZ_FIELDS = tuple(QuizListSerializer.Meta.fields)
+SUMMARY_FIELDS = tuple(QuizSummarySerializer.Meta.fields)
+QUESTION_FIELDS = tuple(QuestionSerializer.Meta.fields)
+DATETIME_FIELDS = {'created_at', 'updated_at'}
+RELATED_FIELDS = {'questions', 'question_count'}
+
+
+def enabled() -> bool:
+    # custom DATETIME_FORMATs are left to the real serializers
+    return (os.getenv('FAST_SERIALIZERS_ENABLED', 'true').lower() == 'true'
+            and api_settings.DATETIME_FORMAT == ISO_8601)
+
+
+def format_datetime(value, tz):
+    """serializers.DateTimeField().to_representation() for ISO-8601 output."""
+    if not value:
+        return None
+    if tz is not None:
+        value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+    text = value.isoformat()
+    return text[:-6] + 'Z' if text.endswith('+00:00') else text
+
+
+def list_fields(request, summary: bool) -> tuple:
+    """The output fields for this request in serializer order; unknown ?fields= names are a 400."""
+    available = SUMMARY_FIELDS if summary else QUIZ_FIELDS
+    wanted = requested_fields(request)
+    if wanted is None:
+        return available
+    check_fields(wanted, available)
+    return tuple(name for name in available if name in wanted)
+
+
+def quiz_values(queryset, fields):
+    """queryset as .values() rows carrying fields plus the (created_at, id) paging key."""
+    columns = {'id', 'created_at', *(set(fields) - RELATED_FIELDS)}
+    if 'question_count' in fields:
+        queryset = queryset.annotate(question_count=Count('questions'))
+        columns.add('question_count')
+    return queryset.values(*columns)
+
+
+def _questions_by_quiz(quiz_ids, tz) -> dict:
+    grouped = {quiz_id: [] for quiz_id in quiz_ids}
+    rows = (
+        Question.objects
+        .filter(quiz_id__in=quiz_ids)
+        .order_by('id')
+        .values_list('quiz_id', *QUESTION_FIELDS)
+    )
+    for quiz_id, pk, title, options, answer, created_at, updated_at in rows:
+        grouped[quiz_id].append({
+            'id': pk,
+            'question_title': title,
+            'question_options': options,
+            'answer': answer,
+            'created_at': format_datetime(created_at, tz),
+            'updated_at': format_datetime(updated_at, tz),
+        })
+    return grouped
+
+
+def quiz_data(rows, fields) -> list:
+    """Serialize .values() rows from quiz_values(); one extra query when 'questions' is wanted."""
+    rows = list(rows)
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+    questions = _questions_by_quiz([row['id'] for row in rows], tz) if rows and 'questions' in fields else {}
+    data = []
+    for row in rows:
+        item = {}
+        for name in fields:
+            if name == 'questions':
+                item[name] = questions[row['id']]
+            elif name in DATETIME_FIELDS:
+                item[name] = format_datetime(row[name], tz)
+            else:
+                item[name] = row[name]
+        data.append(item)
+    return data
@@ -0,0 +1,150 @@
+import os, hashlib, threading, time, uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import parse_http_date_safe
+
+from ..services import counters, events
+
+ALIAS = 'quiz_reads'
+COUNTER = 'quiz_reads'
+
+# Entries are keyed by user and by a version token: one per user for the
+# list, one per quiz for the detail. A write replaces the tokens of the
+# quizzes and owners involved, so exactly their entries stop matching and
+# expire on their own; nobody else's are touched.
+
+
+def enabled() -> bool:
+    return ALIAS in settings.CACHES
+
+
+def _cache():
+    return caches[ALIAS]
+
+
+def _list_version(user_id) -> str:
+    return f'v:user:{user_id}'
+
+
+def _quiz_version(quiz_id) -> str:
+    return f'v:quiz:{quiz_id}'
+
+
+def _new_token() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _tokens(names) -> list:
+    # a version evicted from the cache gets a fresh token, never an old one back
+    cache = _cache()
+    found = cache.get_many(names)
+    missing = {name: _new_token() for name in names if name not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return [found[name] for name in names]
+
+
+def key_for(request, quiz_id=None) -> str:
+    """The cache key of this GET: user, path + query, media type and the list or quiz version."""
+    user_id = request.user.id
+    version = _list_version(user_id) if quiz_id is None else _quiz_version(quiz_id)
+    raw = '|'.join([request.get_full_path(), request.accepted_media_type or '', *_tokens([version])])
+    scope = 'list' if quiz_id is None else f'quiz:{quiz_id}'
+    return f'{scope}:{user_id}:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+
+def lookup(key: str):
+    entry = _cache().get(key)
+    _count(hit=entry is not None)
+    return entry
+
+
+def store(key: str, response):
+    """Keep a rendered 200 with the headers the view set (ETag, Last-Modified, Vary...)."""
+    if hasattr(response, 'render'):
+        response.render()
+    _cache().set(key, (bytes(response.content), dict(response.items())))
+
+
+def respond(request, entry) -> HttpResponse:
+    content, headers = entry
+    etag = headers.get('ETag')
+    last_modified = parse_http_date_safe(headers.get('Last-Modified') or '')
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(content)
+        for name, value in headers.items():
+            response[name] = value
+    elif etag:
+        response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@events.listen('changed')
+@events.listen('deleted')
+def invalidate(quiz_ids, user_ids):
+    if not enabled():
+        return
+    names = [_quiz_version(i) for i in quiz_ids] + [_list_version(u) for u in user_ids]
+    _cache().set_many({name: _new_token() for name in names}, timeout=None)
+
+
+class ReadCacheMixin:
+    """
+    Serves repeated JSON GETs of the same user from the quiz_reads cache
+    (settings.QUIZ_READ_CACHE) without touching the database. Views set
+    read_cache_quiz_kwarg for detail routes; list routes leave it None.
+    """
+    read_cache_quiz_kwarg = None
+
+    def get(self, request, *args, **kwargs):
+        self.read_cache_key = None
+        if enabled() and request.accepted_renderer.format == 'json':
+            quiz_id = self.kwargs[self.read_cache_quiz_kwarg] if self.read_cache_quiz_kwarg else None
+            key = key_for(request, quiz_id)
+            entry = lookup(key)
+            if entry is not None:
+                return respond(request, entry)
+            self.read_cache_key = key
+        return super().get(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'read_cache_key', None) and response.status_code == 200:
+            store(self.read_cache_key, response)
+        return response
+
+
+# --- hit-rate counters ---
+# tallied per process and added to CacheCounter(name='quiz_reads') in
+# batches, so a cache hit does not turn into a database write
+
+_tally = {'hits': 0, 'misses': 0}
+_tally_lock = threading.Lock()
+_flushed_at = time.monotonic()
+
+
+def _flush_every() -> int:
+    return int(os.getenv('QUIZ_READ_CACHE_COUNTER_FLUSH', '100'))
+
+
+def _count(hit: bool):
+    with _tally_lock:
+        _tally['hits' if hit else 'misses'] += 1
+        due = sum(_tally.values()) >= _flush_every() or time.monotonic() - _flushed_at > 60
+    if due:
+        flush_counters()
+
+
+def flush_counters():
+    global _flushed_at
+    with _tally_lock:
+        hits, misses = _tally['hits'], _tally['misses']
+        _tally['hits'] = _tally['misses'] = 0
+        _flushed_at = time.monotonic()
+    if hits or misses:
+        counters.add(COUNTER, hits=hits, misses=misses)
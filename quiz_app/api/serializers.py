@@ -1,9 +1,71 @@
 from rest_framework import serializers
-from quiz_app.models import Quiz, Question
+from quiz_app.models import Quiz, Question, QuizJob
+
+
+def requested_fields(request):
+    """Names from ?fields=a,b or None when the client did not ask for a subset."""
+    raw = request.query_params.get('fields') if request is not None else None
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(',') if name.strip()}
+
+
+def check_fields(wanted, available):
+    unknown = wanted - set(available)
+    if unknown:
+        raise serializers.ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(unknown))}"})
+
+
+class SparseFieldsMixin:
+    """Drops every field not listed in ?fields= (unknown names are a 400)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = requested_fields(self.context.get('request'))
+        if wanted is None:
+            return
+        check_fields(wanted, self.fields)
+        for name in set(self.fields) - wanted:
+            self.fields.pop(name)
 
 
 class CreateQuizRequestSerializer(serializers.Serializer):
     url = serializers.URLField()
+    mode = serializers.ChoiceField(choices=('sync', 'job'), required=False)
+    fresh = serializers.BooleanField(required=False, default=False)
+    start = serializers.FloatField(required=False, min_value=0)
+    end = serializers.FloatField(required=False, min_value=0)
+
+    def validate(self, attrs):
+        start, end = attrs.pop('start', None), attrs.pop('end', None)
+        if start is not None and end is None:
+            raise serializers.ValidationError({'end': 'Required when start is given.'})
+        if end is not None:
+            start = start or 0
+            if end <= start:
+                raise serializers.ValidationError({'end': 'Must be after start.'})
+            attrs['span'] = (start, end)
+        return attrs
+
+
+class QuizJobSerializer(serializers.ModelSerializer):
+    quiz_id = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = QuizJob
+        fields = (
+            'id',
+            'url',
+            'state',
+            'stage',
+            'quiz_id',
+            'questions_ready',
+            'error',
+            'created_at',
+            'updated_at',
+            'started_at',
+            'finished_at'
+        )
 
 
 class QuestionSerializer(serializers.ModelSerializer):
@@ -35,7 +97,7 @@ class QuizSerializer(serializers.ModelSerializer):
         ]
 
 
-class QuizListSerializer(serializers.ModelSerializer):
+class QuizListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     questions = QuestionSerializer(many=True, read_only=True)
 
     class Meta:
@@ -51,6 +113,22 @@ class QuizListSerializer(serializers.ModelSerializer):
         )
 
 
+class QuizSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    question_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Quiz
+        fields = (
+            'id',
+            'title',
+            'description',
+            'created_at',
+            'updated_at',
+            'video_url',
+            'question_count'
+        )
+
+
 class QuizDetailReadSerializer(serializers.ModelSerializer):
     questions = QuestionSerializer(many=True, read_only=True)
 
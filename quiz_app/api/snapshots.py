@@ -0,0 +1,82 @@
+import os
+from calendar import timegm
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from ..models import Quiz, Question, QuizSnapshot
+from ..services import events
+from .conditional import quiz_instance_validators, request_etag, validators_digest
+from .renderers import ORJSONRenderer
+from .serializers import QuizDetailReadSerializer
+
+
+def enabled() -> bool:
+    return os.getenv('QUIZ_SNAPSHOTS_ENABLED', 'true').lower() == 'true'
+
+
+def render(quiz: Quiz) -> bytes:
+    """The exact bytes QuizDetailView would send for quiz as application/json."""
+    return ORJSONRenderer().render(QuizDetailReadSerializer(quiz).data)
+
+
+def refresh(quiz_ids):
+    quizzes = (
+        Quiz.objects
+        .filter(id__in=quiz_ids)
+        .prefetch_related(Prefetch('questions', queryset=Question.objects.order_by('id')))
+    )
+    rows = []
+    for quiz in quizzes:
+        agg = quiz_instance_validators(quiz)
+        rows.append(QuizSnapshot(
+            quiz=quiz,
+            payload=render(quiz),
+            # the validators digest, so a snapshot hit and ConditionalGetMixin send the same ETag
+            etag=validators_digest(agg),
+            modified_at=max(t for t in (agg['quiz_updated'], agg['question_updated']) if t is not None),
+        ))
+    QuizSnapshot.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['quiz'], update_fields=['payload', 'etag', 'modified_at'])
+
+
+@events.listen('changed')
+def _on_changed(quiz_ids, user_ids):
+    refresh(quiz_ids)
+
+
+def fetch(quiz_id, user_id):
+    """(payload, validators digest, modified_at) of the user's quiz in one query, or None."""
+    return (
+        QuizSnapshot.objects
+        .filter(quiz_id=quiz_id, quiz__user_id=user_id)
+        .values_list('payload', 'etag', 'modified_at')
+        .first()
+    )
+
+
+class SnapshotMixin:
+    """JSON GETs of a detail route (lookup kwarg 'id') are answered from the stored snapshot."""
+
+    def get(self, request, *args, **kwargs):
+        use_snapshot = enabled() and request.accepted_renderer.format == 'json'
+        if use_snapshot:
+            row = fetch(self.kwargs['id'], request.user.id)
+            if row is not None:
+                return respond(request, *row)
+        response = super().get(request, *args, **kwargs)
+        if use_snapshot and response.status_code == 200:
+            refresh([self.kwargs['id']])
+        return response
+
+
+def respond(request, payload, digest: str, modified_at) -> HttpResponse:
+    etag, last_modified = request_etag(request, digest), timegm(modified_at.utctimetuple())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(bytes(payload), content_type='application/json')
+        response['Last-Modified'] = http_date(last_modified)
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
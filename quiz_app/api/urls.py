@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import CreateQuizView, QuizListView, QuizDetailView
+from .views import CreateQuizView, QuizListView, QuizSearchView, QuizDetailView, QuizJobDetailView, CacheStatsView
 
 urlpatterns = [
     path('createQuiz/', CreateQuizView.as_view(), name='create_quiz'),
     path('quizzes/', QuizListView.as_view(), name='quiz-list'),
-    path('quizzes/<int:id>/', QuizDetailView.as_view(), name='quiz-detail')
+    path('quizzes/search/', QuizSearchView.as_view(), name='quiz-search'),
+    path('quizzes/<int:id>/', QuizDetailView.as_view(), name='quiz-detail'),
+    path('jobs/<int:id>/', QuizJobDetailView.as_view(), name='quiz-job-detail'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
 ]
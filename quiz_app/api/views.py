@@ -1,12 +1,21 @@
 from rest_framework.views import APIView
-from rest_framework.generics import ListAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import ListAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .serializers import CreateQuizRequestSerializer, QuizSerializer, QuizListSerializer, QuizDetailReadSerializer, QuizPartialUpdateSerializer
-from quiz_app.services.service import create_quiz_from_url
-from django.db.models import Prefetch
-from ..models import Quiz, Question
+from .serializers import CreateQuizRequestSerializer, QuizSerializer, QuizListSerializer, QuizSummarySerializer, QuizDetailReadSerializer, QuizPartialUpdateSerializer, QuizJobSerializer, requested_fields
+from .pagination import QuizCursorPagination
+from .conditional import ConditionalGetMixin
+from .read_cache import ReadCacheMixin, flush_counters
+from .snapshots import SnapshotMixin
+from . import fast
+from quiz_app.services.service import create_quiz_from_url, has_cached_transcript
+from quiz_app.services.jobs import enqueue_quiz_job
+from quiz_app.services import counters, preflight, events, search
+from django.db.models import Count, Prefetch
+from django.urls import reverse
+import os
+from ..models import Quiz, Question, QuizJob
 from .permissions import IsQuizOwner
 
 
@@ -17,8 +26,38 @@ class CreateQuizView(APIView):
         s = CreateQuizRequestSerializer(data=request.data)
         s.is_valid(raise_exception=True)
         url = s.validated_data["url"]
+        fresh = s.validated_data["fresh"]
+        span = s.validated_data.get("span")
+        requested_mode = s.validated_data.get("mode")
+        mode = requested_mode or os.getenv("QUIZ_CREATE_MODE", "sync")
+        info = None
+        # a cached transcript needs no download, so there is nothing to probe or estimate
+        if preflight.enabled() and not has_cached_transcript(url, span):
+            try:
+                admission = preflight.admit(url, span)
+            except ValueError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            span, info = admission.span, admission.info
+            if admission.needs_queue and mode == "sync":
+                if requested_mode == "sync":
+                    # an explicit sync request keeps its contract: no silent switch to 202 + job
+                    return Response(
+                        {"detail": f"Estimated processing time of {admission.estimate:.0f}s exceeds the "
+                                   f"{preflight.sync_max_estimate():.0f}s limit for synchronous requests; "
+                                   f"use \"mode\": \"job\" or omit mode."},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                mode = "job"
+        if mode == "job":
+            options = {"fresh": fresh, "span": list(span)} if span else {"fresh": fresh}
+            job = enqueue_quiz_job(request.user, url, **options)
+            return Response(
+                QuizJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={"Location": reverse("quiz-job-detail", kwargs={"id": job.id})},
+            )
         try:
-            quiz = create_quiz_from_url(request.user, url)
+            quiz = create_quiz_from_url(request.user, url, fresh=fresh, span=span, info=info)
             return Response(QuizSerializer(quiz).data, status=status.HTTP_201_CREATED)
         except ValueError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -26,26 +65,94 @@ class CreateQuizView(APIView):
             return Response({"detail": "Failed to create quiz."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class QuizListView(ListAPIView):
+class QuizListView(ReadCacheMixin, ConditionalGetMixin, ListAPIView):
+    """
+    Full quizzes with questions by default. ?view=summary returns question_count
+    instead of the questions, ?fields=id,title limits the fields and
+    ?page_size= / ?cursor= switch on cursor pagination. Serialized from
+    .values() rows by api/fast.py unless FAST_SERIALIZERS_ENABLED=false.
+    """
     permission_classes = [IsAuthenticated]
-    serializer_class = QuizListSerializer
-    pagination_class = None
+    pagination_class = QuizCursorPagination
+
+    def get_validator_queryset(self):
+        return Quiz.objects.filter(user=self.request.user)
+
+    def is_summary(self):
+        return self.request.query_params.get('view') == 'summary'
+
+    def get_serializer_class(self):
+        return QuizSummarySerializer if self.is_summary() else QuizListSerializer
+
+    def list(self, request, *args, **kwargs):
+        if not fast.enabled():
+            return super().list(request, *args, **kwargs)
+        fields = fast.list_fields(request, self.is_summary())
+        rows = fast.quiz_values(self.get_base_queryset(), fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.quiz_data(page, fields))
+        return Response(fast.quiz_data(rows, fields))
+
+    def get_base_queryset(self):
+        return Quiz.objects.filter(user=self.request.user).order_by('-created_at', '-id')
 
     def get_queryset(self):
-        return (
-            Quiz.objects
-            .filter(user=self.request.user)
-            .prefetch_related(
+        qs = self.get_base_queryset()
+        wanted = requested_fields(self.request)
+        if self.is_summary():
+            if wanted is None or 'question_count' in wanted:
+                qs = qs.annotate(question_count=Count('questions'))
+            return qs
+        if wanted is None or 'questions' in wanted:
+            qs = qs.prefetch_related(
                 Prefetch('questions', queryset=Question.objects.order_by('id'))
             )
-            .order_by('-created_at')
-        )
+        return qs
+
+
+class QuizSearchView(APIView):
+    """
+    The user's quizzes matching ?q= in title, description, question titles or
+    options, best match first (FTS5, see services/search.py). ?limit= caps
+    the results (default 20, max 100); items are shaped like ?view=summary
+    and take ?fields= the same way.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit, max_limit = 20, 100
 
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request):
+        text = request.query_params.get('q', '')
+        if not search.match_expression(text):
+            return Response({"q": ["Enter at least one word to search for."]}, status=status.HTTP_400_BAD_REQUEST)
+        ids = search.search(text, user_id=request.user.id, limit=self.get_limit(request))
+        queryset = Quiz.objects.filter(user=request.user, id__in=ids)
+        rank = {quiz_id: i for i, quiz_id in enumerate(ids)}
+        if fast.enabled():
+            fields = fast.list_fields(request, summary=True)
+            rows = sorted(fast.quiz_values(queryset, fields), key=lambda row: rank[row['id']])
+            return Response(fast.quiz_data(rows, fields))
+        quizzes = sorted(queryset.annotate(question_count=Count('questions')), key=lambda quiz: rank[quiz.id])
+        return Response(QuizSummarySerializer(quizzes, many=True, context={'request': request}).data)
 
-class QuizDetailView(RetrieveUpdateDestroyAPIView):
+
+class QuizDetailView(ReadCacheMixin, SnapshotMixin, ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated, IsQuizOwner]
     lookup_url_kwarg = 'id'
     lookup_field = 'id'
+    send_last_modified = True
+    read_cache_quiz_kwarg = 'id'
+
+    def get_validator_queryset(self):
+        # other users' quizzes get no validators and fall through to the 403
+        return Quiz.objects.filter(user=self.request.user, id=self.kwargs['id'])
 
     def get_queryset(self):
         return (
@@ -61,3 +168,29 @@ class QuizDetailView(RetrieveUpdateDestroyAPIView):
             if self.request.method == 'GET'
             else QuizPartialUpdateSerializer
         )
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        events.quizzes_changed([serializer.instance.id], [serializer.instance.user_id])
+
+    def perform_destroy(self, instance):
+        quiz_id = instance.id
+        super().perform_destroy(instance)
+        events.quizzes_deleted([quiz_id], [instance.user_id])
+
+
+class QuizJobDetailView(RetrieveAPIView):
+    permission_classes = [IsAuthenticated, IsQuizOwner]
+    serializer_class = QuizJobSerializer
+    queryset = QuizJob.objects.all()
+    lookup_url_kwarg = 'id'
+    lookup_field = 'id'
+
+
+class CacheStatsView(APIView):
+    """Hit/miss counters of the quiz read cache, transcript cache and quiz response cache (staff only)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        flush_counters()
+        return Response(counters.stats())
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class QuizAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'quiz_app'
+
+    def ready(self):
+        # registers the events listeners
+        from .api import read_cache, snapshots  # noqa: F401
+        from .services import search  # noqa: F401
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = ('Refresh SQLite planner statistics (ANALYZE). The admin also reads the row estimates from them '
+            'instead of counting large tables; run it after big imports or from cron.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Only needed for SQLite.')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(self.style.SUCCESS('Statistics updated.'))
@@ -0,0 +1,75 @@
+import os, time, resource, subprocess, tempfile
+import multiprocessing as mp
+import numpy as np
+from django.core.management.base import BaseCommand
+from quiz_app.services.audio import SAMPLE_RATE, decode_pcm
+
+
+def _mp3_then_whisper_load(source: str, tmp: str) -> np.ndarray:
+    """The current path: FFmpegExtractAudio at 192 kbps, then whisper.load_audio."""
+    mp3 = os.path.join(tmp, 'audio.mp3')
+    subprocess.run(['ffmpeg', '-nostdin', '-loglevel', 'error', '-y', '-i', source, '-vn',
+                    '-acodec', 'libmp3lame', '-b:a', '192k', mp3], check=True)
+    out = subprocess.run(['ffmpeg', '-nostdin', '-threads', '0', '-i', mp3, '-f', 's16le',
+                          '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE), '-'],
+                         capture_output=True, check=True).stdout
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM, unlike ru_maxrss, is not inherited from the parent across fork/exec
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_path(name: str, source: str, queue):
+    with tempfile.TemporaryDirectory(prefix='bench_') as tmp:
+        t0 = time.perf_counter()
+        if name == 'mp3':
+            samples = _mp3_then_whisper_load(source, tmp)
+        elif name == 'pcm':
+            samples = decode_pcm(source)
+        else:
+            samples = decode_pcm(source, os.path.join(tmp, 'audio.f32'))
+        float(samples[::SAMPLE_RATE].sum())  # touch the buffer
+        elapsed = time.perf_counter() - t0
+        disk = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+    queue.put({
+        'seconds': elapsed,
+        'audio_seconds': len(samples) / SAMPLE_RATE,
+        'python_rss_mb': _peak_rss_mb(),
+        'ffmpeg_rss_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        'temp_mb': disk / 1e6,
+    })
+
+
+class Command(BaseCommand):
+    help = ('Compare the MP3 re-encode path with direct 16 kHz PCM decoding '
+            '(wall time and peak RSS, each run in a fresh process).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Native audio file as yt-dlp downloads it (webm/m4a/...).')
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        ctx = mp.get_context('spawn')
+        labels = {'mp3': 'mp3 192k + whisper.load_audio', 'pcm': 'pcm (in memory)', 'pcm-mmap': 'pcm (memmap)'}
+        self.stdout.write(f"{'path':32} {'best s':>8} {'audio s':>8} {'py RSS MB':>10} "
+                          f"{'ffmpeg RSS MB':>14} {'temp MB':>8}")
+        for name, label in labels.items():
+            runs = []
+            for _ in range(options['repeat']):
+                queue = ctx.Queue()
+                p = ctx.Process(target=_run_path, args=(name, options['source'], queue))
+                p.start()
+                runs.append(queue.get())
+                p.join()
+            best = min(runs, key=lambda r: r['seconds'])
+            self.stdout.write(
+                f"{label:32} {best['seconds']:8.2f} {best['audio_seconds']:8.1f} "
+                f"{max(r['python_rss_mb'] for r in runs):10.1f} "
+                f"{max(r['ffmpeg_rss_mb'] for r in runs):14.1f} {best['temp_mb']:8.1f}"
+            )
@@ -0,0 +1,47 @@
+import os, time
+import numpy as np
+import whisper
+from django.core.management.base import BaseCommand
+from quiz_app.services import chunking
+from quiz_app.services.audio import SAMPLE_RATE, decode_pcm
+
+
+class Command(BaseCommand):
+    help = 'Compare one model.transcribe call with chunked transcription on 1..N worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Audio file (anything ffmpeg can decode).')
+        parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts.')
+        parser.add_argument('--segment', type=float, default=chunking.segment_seconds())
+        parser.add_argument('--overlap', type=float, default=chunking.overlap_seconds())
+        parser.add_argument('--model', default=os.getenv('WHISPER_MODEL', 'base'))
+
+    def handle(self, *args, **options):
+        samples = decode_pcm(options['source'])
+        model_name = options['model']
+        self.stdout.write(f'{len(samples) / SAMPLE_RATE:.0f}s of audio, model={model_name}, '
+                          f'cores={os.cpu_count()}')
+
+        model = whisper.load_model(model_name)
+        t0 = time.perf_counter()
+        model.transcribe(samples, fp16=False, without_timestamps=True)
+        baseline = time.perf_counter() - t0
+        del model
+        self.stdout.write(f"{'single call':>14}: {baseline:8.1f}s")
+
+        pools = []
+        try:
+            for workers in [int(w) for w in options['workers'].split(',')]:
+                pool = chunking.new_pool(workers, model_name)
+                pools.append(pool)
+                # load the model in every worker before timing
+                list(pool.map(chunking._transcribe_segment, [np.zeros(SAMPLE_RATE, dtype=np.float32)] * workers))
+                t0 = time.perf_counter()
+                chunking.transcribe_parallel(samples, model_name, workers,
+                                             options['segment'], options['overlap'], executor=pool)
+                elapsed = time.perf_counter() - t0
+                self.stdout.write(f'{workers:>6} worker(s): {elapsed:8.1f}s  speedup x{baseline / elapsed:.2f}')
+                pool.shutdown()
+        finally:
+            for pool in pools:
+                pool.shutdown(cancel_futures=True)
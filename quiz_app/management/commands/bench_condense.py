@@ -0,0 +1,38 @@
+import time
+from django.core.management.base import BaseCommand
+from quiz_app.services import condense, llm, service
+
+
+class Command(BaseCommand):
+    help = 'Compare the single-prompt quiz call with map-reduce condensation on a transcript file (calls Gemini).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('transcript', help='Plain-text transcript file.')
+        parser.add_argument('--budget', type=int, default=condense.token_budget())
+        parser.add_argument('--workers', type=int, default=condense.workers())
+
+    def _prompt_tokens(self, material: str) -> int:
+        backend = llm.get_backend('gemini')
+        prompt = service.QUIZ_PROMPT.format(transcript=material)
+        return backend.client.models.count_tokens(model=backend.model, contents=prompt).total_tokens
+
+    def handle(self, *args, **options):
+        with open(options['transcript'], encoding='utf-8') as f:
+            transcript = f.read()
+
+        t0 = time.perf_counter()
+        service.make_quiz_with_gemini(transcript)
+        single = time.perf_counter() - t0
+        single_tokens = self._prompt_tokens(transcript)
+        self.stdout.write(f"{'single prompt':>14}: {single_tokens:7d} prompt tokens {single:7.1f}s")
+
+        t0 = time.perf_counter()
+        material, report = condense.condense(transcript, service.extract_key_facts,
+                                             options['budget'], options['workers'])
+        service.make_quiz_with_gemini(material)
+        condensed = time.perf_counter() - t0
+        condensed_tokens = self._prompt_tokens(material)
+        self.stdout.write(f"{'condensed':>14}: {condensed_tokens:7d} prompt tokens {condensed:7.1f}s "
+                          f"(map {report['map_seconds']:.1f}s, {report['calls']} call(s))")
+        self.stdout.write(f"{'saved':>14}: {single_tokens - condensed_tokens:7d} prompt tokens "
+                          f"{single - condensed:7.1f}s")
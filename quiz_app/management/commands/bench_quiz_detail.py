@@ -0,0 +1,54 @@
+import os, time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from quiz_app.api.views import QuizDetailView
+from quiz_app.services import service
+
+
+class Command(BaseCommand):
+    help = 'Time quiz detail GETs served by the serializer and from the stored snapshot (rolled back afterwards).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=10)
+        parser.add_argument('--requests', type=int, default=500)
+
+    def _run(self, user, quiz_id, n):
+        view, factory = QuizDetailView.as_view(), APIRequestFactory()
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            for _ in range(n):
+                request = factory.get(f'/api/quizzes/{quiz_id}/')
+                force_authenticate(request, user)
+                response = view(request, id=quiz_id)
+                if hasattr(response, 'render'):  # DRF responses render lazily, snapshots are bytes already
+                    response.render()
+            elapsed = time.perf_counter() - t0
+        return elapsed / n * 1000, len(ctx.captured_queries) / n, response.content
+
+    def handle(self, *args, **options):
+        previous = os.environ.get('QUIZ_SNAPSHOTS_ENABLED')
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(username='bench-quiz-detail')
+                quiz = service._save_quiz({'title': 'Benchmark', 'questions': [
+                    {'question_title': f'Question {i}?', 'question_options': ['a', 'b', 'c', 'd'], 'answer': 'a'}
+                    for i in range(options['questions'])
+                ]}, user, 'https://www.youtube.com/watch?v=bench')
+                results = {}
+                for label, flag in (('serializer', 'false'), ('snapshot', 'true')):
+                    os.environ['QUIZ_SNAPSHOTS_ENABLED'] = flag
+                    results[label] = self._run(user, quiz.id, options['requests'])
+                    ms, queries, _ = results[label]
+                    self.stdout.write(f'{label:>10}: {ms:7.3f} ms/request {queries:4.1f} queries/request')
+                same = results['serializer'][2] == results['snapshot'][2]
+                self.stdout.write(f"{'identical':>10}: {same}")
+                transaction.set_rollback(True)
+        finally:
+            if previous is None:
+                os.environ.pop('QUIZ_SNAPSHOTS_ENABLED', None)
+            else:
+                os.environ['QUIZ_SNAPSHOTS_ENABLED'] = previous
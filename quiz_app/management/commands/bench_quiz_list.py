@@ -0,0 +1,68 @@
+import os, time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from quiz_app.api.renderers import ORJSONRenderer
+from quiz_app.api.views import QuizListView
+from quiz_app.models import Question, Quiz
+
+
+class Command(BaseCommand):
+    help = 'Time GET /api/quizzes/ through the ModelSerializers + stdlib JSON and the values() fast path + orjson (rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quizzes', type=int, default=1000)
+        parser.add_argument('--questions', type=int, default=10, help='Questions per quiz.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--query', default='', help="Query string, e.g. '?view=summary'.")
+
+    def _seed(self, user, quizzes, questions):
+        Quiz.objects.bulk_create(
+            Quiz(user=user, title=f'Quiz {i}', description='Benchmark quiz', video_url='https://www.youtube.com/watch?v=bench')
+            for i in range(quizzes))
+        Question.objects.bulk_create((
+            Question(quiz_id=quiz_id, question_title=f'Question {j} about the topic?',
+                     question_options=['Option A', 'Option B', 'Option C', 'Option D'], answer='Option A')
+            for quiz_id in Quiz.objects.filter(user=user).values_list('id', flat=True)
+            for j in range(questions)
+        ), batch_size=1000)
+
+    def _run(self, user, query, renderer, repeat):
+        view = QuizListView.as_view(renderer_classes=[renderer, BrowsableAPIRenderer])
+        factory, best = APIRequestFactory(), None
+        for _ in range(repeat):
+            request = factory.get('/api/quizzes/' + query)
+            force_authenticate(request, user)
+            t0 = time.perf_counter()
+            response = view(request)
+            response.render()
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        return best, response.content
+
+    def handle(self, *args, **options):
+        previous = os.environ.get('FAST_SERIALIZERS_ENABLED')
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(username='bench-quiz-list')
+                self._seed(user, options['quizzes'], options['questions'])
+                total = options['quizzes'] * options['questions']
+                self.stdout.write(f"{options['quizzes']} quizzes, {total} questions, best of {options['repeat']}")
+
+                os.environ['FAST_SERIALIZERS_ENABLED'] = 'false'
+                slow, slow_body = self._run(user, options['query'], JSONRenderer, options['repeat'])
+                os.environ['FAST_SERIALIZERS_ENABLED'] = 'true'
+                fast, fast_body = self._run(user, options['query'], ORJSONRenderer, options['repeat'])
+
+                self.stdout.write(f"{'serializer':>10}: {slow * 1000:8.1f} ms ({len(slow_body)} bytes)")
+                self.stdout.write(f"{'fast':>10}: {fast * 1000:8.1f} ms ({len(fast_body)} bytes) {slow / fast:4.1f}x")
+                self.stdout.write(f"{'identical':>10}: {slow_body == fast_body}")
+                transaction.set_rollback(True)
+        finally:
+            if previous is None:
+                os.environ.pop('FAST_SERIALIZERS_ENABLED', None)
+            else:
+                os.environ['FAST_SERIALIZERS_ENABLED'] = previous
@@ -0,0 +1,33 @@
+import sys
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from quiz_app.models import Quiz
+from quiz_app.services import quiz_io
+
+
+class Command(BaseCommand):
+    help = 'Write quizzes with their questions as NDJSON (one quiz per line), streaming in id order.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', default='-', help="File to write, '-' for stdout.")
+        parser.add_argument('--user', help='Only quizzes of this username.')
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Quiz.objects.all()
+        if options['user']:
+            try:
+                queryset = queryset.filter(user=get_user_model().objects.get(username=options['user']))
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"No user {options['user']!r}")
+
+        out = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        count = 0
+        try:
+            for line in quiz_io.export_lines(queryset, options['chunk_size']):
+                out.write(line)
+                count += 1
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        self.stderr.write(f'Exported {count} quiz(zes).')
@@ -0,0 +1,53 @@
+import os
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from quiz_app.services import quiz_io
+
+
+class Command(BaseCommand):
+    help = ('Import an NDJSON quiz export in batched transactions. Progress is checkpointed in the database, '
+            'so re-running the same command after an interruption continues where it stopped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='NDJSON file written by export_quizzes or the admin export.')
+        parser.add_argument('--user', help='Give every imported quiz to this username instead of the exported user_id.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--checkpoint', help='Checkpoint name (default: the absolute file path).')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and import from the start.')
+
+    def _owner(self, username):
+        User = get_user_model()
+        if username:
+            try:
+                user_id = User.objects.get(username=username).id
+            except User.DoesNotExist:
+                raise CommandError(f'No user {username!r}')
+            return lambda record, line: user_id
+
+        known = {}
+
+        def exported_owner(record, line):
+            user_id = record.get('user_id')
+            if user_id not in known:
+                known[user_id] = User.objects.filter(id=user_id).exists()
+            if not known[user_id]:
+                raise quiz_io.InvalidRecord(f'line {line}: user {user_id!r} does not exist (use --user)')
+            return user_id
+        return exported_owner
+
+    def handle(self, *args, **options):
+        path = os.path.abspath(options['path'])
+        if not os.path.isfile(path):
+            raise CommandError(f'No such file: {path}')
+        name = options['checkpoint'] or path
+
+        def progress(checkpoint):
+            self.stdout.write(f'{checkpoint.quizzes} quiz(zes) imported, line {checkpoint.lines}')
+
+        try:
+            checkpoint = quiz_io.import_file(path, name, self._owner(options['user']), options['batch_size'],
+                                             restart=options['restart'], on_batch=progress)
+        except quiz_io.InvalidRecord as e:
+            raise CommandError(f'{e}. Batches before it are committed; fix the file and re-run to resume.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {checkpoint.quizzes} quiz(zes) from {checkpoint.lines} line(s) (checkpoint {name!r}).'))
@@ -0,0 +1,26 @@
+import threading
+from django.core.management.base import BaseCommand
+from quiz_app.services.jobs import start_worker_pool
+
+
+class Command(BaseCommand):
+    help = 'Run a pool of quiz-generation workers that process queued createQuiz jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--poll', type=float, default=2.0,
+                            help='Seconds between queue polls when idle.')
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        threads = start_worker_pool(options['workers'], stop, options['poll'])
+        self.stdout.write(f"Running {len(threads)} quiz worker(s). Ctrl+C to stop.")
+        try:
+            while any(t.is_alive() for t in threads):
+                for t in threads:
+                    t.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping workers after their current job...')
+            stop.set()
+            for t in threads:
+                t.join()
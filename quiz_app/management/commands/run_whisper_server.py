@@ -0,0 +1,33 @@
+import os, json
+import whisper
+from django.core.management.base import BaseCommand
+from quiz_app.services import whisper_server
+
+
+class Command(BaseCommand):
+    help = ('Run the shared Whisper transcription server on a Unix socket. '
+            'Web workers use it when WHISPER_BACKEND=server.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=whisper_server.socket_path())
+        parser.add_argument('--model', default=os.getenv('WHISPER_MODEL', 'base'))
+        parser.add_argument('--status', action='store_true',
+                            help='Print health and queue depth of a running server and exit.')
+
+    def handle(self, *args, **options):
+        os.environ['WHISPER_SERVER_SOCKET'] = options['socket']
+        if options['status']:
+            self.stdout.write(json.dumps(whisper_server.health(), indent=2))
+            return
+
+        self.stdout.write(f"Loading Whisper model '{options['model']}'...")
+        model = whisper.load_model(options['model'])
+        server = whisper_server.WhisperServer(options['socket'], model, options['model'])
+        server.warm_up()
+        self.stdout.write(f"Whisper server listening on {options['socket']}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-18 05:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0005_pipeline_flight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='transcript_source',
+            field=models.CharField(blank=True, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='transcriptcacheentry',
+            name='source',
+            field=models.CharField(blank=True, max_length=16),
+        ),
+    ]
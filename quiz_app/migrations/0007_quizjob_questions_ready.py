@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-18 06:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0006_transcript_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='questions_ready',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.2 on 2026-10-18 06:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_video_id(apps, schema_editor):
+    from quiz_app.services.video import resolve_video_key
+    Quiz = apps.get_model('quiz_app', 'Quiz')
+    batch = []
+    for quiz in Quiz.objects.only('id', 'video_url').iterator(chunk_size=1000):
+        quiz.video_id = resolve_video_key(quiz.video_url or '') or ''
+        if quiz.video_id:
+            batch.append(quiz)
+        if len(batch) >= 1000:
+            Quiz.objects.bulk_update(batch, ['video_id'])
+            batch = []
+    if batch:
+        Quiz.objects.bulk_update(batch, ['video_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0007_quizjob_questions_ready'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='video_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_video_id, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['quiz', 'id'], name='question_quiz_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='quiz_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['-created_at', '-id'], name='quiz_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['video_id', '-created_at'], name='quiz_video_created_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-18 06:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0008_quiz_video_id_and_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizSnapshot',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='quiz_app.quiz')),
+                ('payload', models.BinaryField()),
+                ('etag', models.CharField(max_length=64)),
+                ('modified_at', models.DateTimeField()),
+            ],
+        ),
+    ]
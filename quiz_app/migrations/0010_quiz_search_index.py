@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from quiz_app.services import search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    search.create_index()
+    search.rebuild()
+
+
+def drop_search_index(apps, schema_editor):
+    from quiz_app.services import search
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {search.TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0009_quiz_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -11,15 +11,35 @@ class Quiz(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     video_url = models.URLField()
+    # canonical '<extractor>:<id>' of video_url (see services.video), '' if unknown
+    video_id = models.CharField(max_length=64, blank=True, default='')
+    transcript_source = models.CharField(max_length=16, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # per-user list + cursor pagination: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=['user', '-created_at', '-id'], name='quiz_user_created_idx'),
+            # admin changelist / date hierarchy across all users
+            models.Index(fields=['-created_at', '-id'], name='quiz_created_idx'),
+            # reuse / dedup lookups by video, newest first
+            models.Index(fields=['video_id', '-created_at'], name='quiz_video_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'video_url' in update_fields:
+            from .services.video import resolve_video_key
+            self.video_id = resolve_video_key(self.video_url or '') or ''
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'video_id'}
+        super().save(*args, **kwargs)
+
 
 class Question(models.Model):
     quiz = models.ForeignKey(
@@ -32,6 +52,145 @@ class Question(models.Model):
 
     class Meta:
         ordering = ["id"]
+        indexes = [
+            # questions of a quiz in id order (detail view, list prefetch)
+            models.Index(fields=['quiz', 'id'], name='question_quiz_id_idx'),
+        ]
 
     def __str__(self):
         return self.question_title[:50]
+
+    # bulk writes, queryset deletes and emit=False bypass these; their callers emit the event
+    def save(self, *args, emit=True, **kwargs):
+        super().save(*args, **kwargs)
+        if emit:
+            from .services import events
+            events.quizzes_changed([self.quiz_id])
+
+    def delete(self, *args, emit=True, **kwargs):
+        quiz_id = self.quiz_id
+        result = super().delete(*args, **kwargs)
+        if emit:
+            from .services import events
+            events.quizzes_changed([quiz_id])
+        return result
+
+
+class QuizSnapshot(models.Model):
+    """Rendered detail JSON of a quiz, rebuilt on every write (see api/snapshots.py)."""
+    quiz = models.OneToOneField(
+        Quiz, on_delete=models.CASCADE, primary_key=True, related_name='snapshot')
+    payload = models.BinaryField()
+    etag = models.CharField(max_length=64)
+    modified_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'snapshot of quiz {self.quiz_id}'
+
+
+class ImportCheckpoint(models.Model):
+    """How far a resumable `manage.py import_quizzes` run got, committed with each batch."""
+    name = models.CharField(max_length=255, unique=True)
+    offset = models.PositiveBigIntegerField(default=0)  # bytes of the file already imported
+    lines = models.PositiveBigIntegerField(default=0)
+    quizzes = models.PositiveBigIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+
+class QuizJob(models.Model):
+    class State(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='quiz_jobs',
+    )
+    url = models.URLField()
+    options = models.JSONField(default=dict, blank=True)
+    state = models.CharField(
+        max_length=16, choices=State.choices, default=State.QUEUED)
+    stage = models.CharField(max_length=32, blank=True)
+    quiz = models.ForeignKey(
+        Quiz, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    questions_ready = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [models.Index(fields=['state', 'created_at'])]
+
+    def __str__(self):
+        return f'Job {self.pk} ({self.state})'
+
+
+class TranscriptCacheEntry(models.Model):
+    video_key = models.CharField(max_length=128)
+    model_name = models.CharField(max_length=64)
+    source = models.CharField(max_length=16, blank=True)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(default=0)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['video_key', 'model_name'], name='uniq_transcript_video_model'),
+        ]
+
+    def __str__(self):
+        return f'{self.video_key} [{self.model_name}]'
+
+
+class CacheCounter(models.Model):
+    name = models.CharField(max_length=64, unique=True)
+    hits = models.PositiveBigIntegerField(default=0)
+    misses = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
+
+
+class QuizResponseCacheEntry(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    payload = models.JSONField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.key
+
+
+class PipelineFlight(models.Model):
+    class State(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    key = models.CharField(max_length=200, unique=True)
+    owner = models.CharField(max_length=32)
+    state = models.CharField(
+        max_length=16, choices=State.choices, default=State.RUNNING)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    lease_expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.key} ({self.state})'
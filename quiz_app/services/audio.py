@@ -0,0 +1,92 @@
+import os, logging, subprocess
+import numpy as np
+import yt_dlp
+from yt_dlp.utils import DownloadError, download_range_func
+
+log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000  # what Whisper expects
+_READ_CHUNK = 1 << 20
+
+
+def range_opts(span) -> dict:
+    """yt-dlp options that fetch only span=(start, end) seconds of the media."""
+    if span is None:
+        return {}
+    return {
+        'download_ranges': download_range_func(None, [tuple(span)]),
+        'force_keyframes_at_cuts': True,
+    }
+
+
+def download_native_audio(url: str, out_dir: str, span=None) -> str:
+    """
+    Download the best audio stream as-is (webm/opus, m4a, ...) without the
+    FFmpegExtractAudio re-encode; decode_pcm does the only transcode.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'outtmpl': os.path.join(out_dir, '%(id)s.%(ext)s'),
+        'noplaylist': True,
+        'quiet': True,
+        **range_opts(span),
+    }
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+            path = ydl.prepare_filename(info)
+            log.info('YT downloaded (native %s): id=%s', info.get('ext'), info.get('id'))
+    except DownloadError as e:
+        raise ValueError(f'YouTube download failed: {e}')
+
+    if not os.path.exists(path):
+        raise ValueError('Audio download failed — no audio file found')
+    return path
+
+
+def ffmpeg_cmd(source: str, target: str, input_args: list = ()) -> list:
+    return [
+        'ffmpeg', '-nostdin', '-loglevel', 'error', '-threads', '0',
+        *input_args, '-i', source,
+        '-f', 'f32le', '-acodec', 'pcm_f32le', '-ac', '1', '-ar', str(SAMPLE_RATE),
+        target,
+    ]
+
+
+def decode_pcm(source: str, mmap_path: str = None) -> np.ndarray:
+    """
+    Decode any ffmpeg-readable file or URL once into 16 kHz mono float32.
+    With mmap_path the samples are written there and memory-mapped
+    copy-on-write instead of being held in a Python buffer.
+    """
+    if mmap_path:
+        run = subprocess.run(ffmpeg_cmd(source, mmap_path), capture_output=True)
+        if run.returncode != 0:
+            raise RuntimeError(f'Failed to decode audio: {run.stderr.decode(errors="replace")}')
+        if os.path.getsize(mmap_path) == 0:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(mmap_path, dtype=np.float32, mode='c')
+
+    proc = subprocess.Popen(ffmpeg_cmd(source, '-'), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    buf = bytearray()
+    while True:
+        chunk = proc.stdout.read(_READ_CHUNK)
+        if not chunk:
+            break
+        buf += chunk
+    err = proc.stderr.read()
+    if proc.wait() != 0:
+        raise RuntimeError(f'Failed to decode audio: {err.decode(errors="replace")}')
+    return np.frombuffer(buf, dtype=np.float32)
+
+
+def download_pcm(url: str, out_dir: str, span=None) -> np.ndarray:
+    path = download_native_audio(url, out_dir, span)
+    mmap_path = None
+    if os.getenv('AUDIO_PCM_MMAP', 'false').lower() == 'true':
+        mmap_path = os.path.splitext(path)[0] + '.f32'
+    audio = decode_pcm(path, mmap_path)
+    os.remove(path)
+    log.info('Decoded %.1fs of audio to PCM (%.1f MB)', len(audio) / SAMPLE_RATE, audio.nbytes / 1e6)
+    return audio
@@ -0,0 +1,124 @@
+import os, re, html, logging
+import xml.etree.ElementTree as ET
+import yt_dlp
+
+log = logging.getLogger(__name__)
+
+MIN_CAPTION_CHARS = 150
+_FORMATS = ('vtt', 'srv3', 'srv2', 'srv1')
+_TAG = re.compile(r'<[^>]+>')
+_CUE_NUMBER = re.compile(r'^\d+$')
+
+
+def enabled() -> bool:
+    return os.getenv('CAPTIONS_ENABLED', 'true').lower() == 'true'
+
+
+def _preferred_langs() -> list:
+    return [l.strip() for l in os.getenv('CAPTION_LANGS', 'en,de').split(',') if l.strip()]
+
+
+# --- parsing ---
+def _dedupe_lines(lines) -> str:
+    out = []
+    for line in lines:
+        line = ' '.join(line.split())
+        if line and (not out or line != out[-1]):
+            out.append(line)
+    return ' '.join(out)
+
+
+def _vtt_seconds(stamp: str) -> float:
+    parts = stamp.replace(',', '.').split(':')
+    return sum(float(p) * 60 ** i for i, p in enumerate(reversed(parts)))
+
+
+def _in_span(start: float, span) -> bool:
+    return span is None or span[0] <= start < span[1]
+
+
+def parse_vtt(text: str, span=None) -> str:
+    """Plain text of a WebVTT file; with span=(start, end) only cues starting inside it."""
+    lines, in_note, keep = [], False, True
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            in_note = False
+            continue
+        if in_note or line.startswith(('WEBVTT', 'Kind:', 'Language:', 'STYLE', 'REGION')):
+            continue
+        if line.startswith('NOTE'):
+            in_note = True
+            continue
+        if '-->' in line:
+            keep = _in_span(_vtt_seconds(line.split('-->')[0].strip()), span)
+            continue
+        if _CUE_NUMBER.match(line) or not keep:
+            continue
+        lines.append(html.unescape(_TAG.sub('', line)))
+    return _dedupe_lines(lines)
+
+
+def parse_srv(text: str, span=None) -> str:
+    """srv1/srv2 (<text start=s>) and srv3 (<p t=ms>/<s>) timed-text XML."""
+    root = ET.fromstring(text)
+    lines = []
+    for el in root.iter():
+        if el.tag not in ('text', 'p'):
+            continue
+        if span is not None:
+            start = float(el.get('start', 0)) if 'start' in el.attrib else float(el.get('t', 0)) / 1000
+            if not _in_span(start, span):
+                continue
+        lines.append(html.unescape(''.join(el.itertext())))
+    return _dedupe_lines(lines)
+
+
+def parse_captions(text: str, ext: str, span=None) -> str:
+    return parse_vtt(text, span) if ext == 'vtt' else parse_srv(text, span)
+
+
+# --- selection + download ---
+def _pick_track(info: dict, langs: list):
+    manual = info.get('subtitles') or {}
+    auto = info.get('automatic_captions') or {}
+    candidates = [('captions', manual, lang) for lang in langs]
+    for lang in langs:
+        # '<lang>-orig' is the original-language ASR track, plain '<lang>' may be a translation
+        candidates += [('auto_captions', auto, f'{lang}-orig'), ('auto_captions', auto, lang)]
+    for source, tracks, lang in candidates:
+        by_ext = {t.get('ext'): t for t in tracks.get(lang, [])}
+        for ext in _FORMATS:
+            if ext in by_ext:
+                return source, lang, by_ext[ext]
+    return None
+
+
+def fetch_captions(url: str, info: dict = None, span=None):
+    """
+    Returns (text, source) from the best available subtitle track,
+    or (None, None) when the video has no usable captions.
+    span=(start, end) in seconds limits the text to that part of the video.
+    """
+    langs = _preferred_langs()
+    opts = {'quiet': True, 'noplaylist': True, 'skip_download': True}
+    try:
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            if info is None:
+                info = ydl.extract_info(url, download=False)
+            picked = _pick_track(info, langs)
+            if picked is None:
+                log.info('Captions: none in %s', ','.join(langs))
+                return None, None
+            source, lang, track = picked
+            raw = ydl.urlopen(track['url']).read().decode('utf-8', 'replace')
+        text = parse_captions(raw, track['ext'], span)
+    except Exception as e:
+        log.warning('Captions unavailable, falling back to Whisper: %s', e)
+        return None, None
+
+    if len(text) < MIN_CAPTION_CHARS:
+        log.info('Captions: %s/%s too short (len=%d)', source, lang, len(text))
+        return None, None
+    log.info('Captions: using %s lang=%s ext=%s len=%d', source, lang, track['ext'], len(text))
+    return text, source
@@ -0,0 +1,187 @@
+import os, re, time, logging, threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from .audio import SAMPLE_RATE
+
+log = logging.getLogger(__name__)
+_FRAME = SAMPLE_RATE // 50  # 20 ms energy frames
+_POOL = None
+_POOL_KEY = None
+_POOL_LOCK = threading.Lock()
+_WORKER_MODEL = None
+
+
+def segment_seconds() -> float:
+    return float(os.getenv('WHISPER_SEGMENT_SECONDS', '120'))
+
+
+def overlap_seconds() -> float:
+    return float(os.getenv('WHISPER_SEGMENT_OVERLAP', '2'))
+
+
+def parallel_workers() -> int:
+    return int(os.getenv('WHISPER_PARALLEL_WORKERS', '1'))
+
+
+# --- splitting ---
+def _frame_energy(samples: np.ndarray) -> np.ndarray:
+    n = len(samples) // _FRAME
+    frames = np.asarray(samples[:n * _FRAME], dtype=np.float32).reshape(n, _FRAME)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def _quietest(energy: np.ndarray, lo: int, hi: int) -> int:
+    """Sample index of the quietest frame between sample offsets lo and hi."""
+    lo, hi = lo // _FRAME, max(lo // _FRAME + 1, hi // _FRAME)
+    return (lo + int(np.argmin(energy[lo:hi]))) * _FRAME
+
+
+def split_at_silence(samples: np.ndarray, segment_s: float, overlap_s: float,
+                     search_s: float = 5.0) -> list:
+    """
+    (start, end) sample ranges of about segment_s seconds. Each cut is moved to
+    the quietest 20 ms frame within search_s of the target, and every segment
+    after the first starts overlap_s before the previous cut.
+    """
+    n = len(samples)
+    seg, overlap, search = (int(x * SAMPLE_RATE) for x in (segment_s, overlap_s, search_s))
+    if n <= seg + search:
+        return [(0, n)]
+
+    energy = _frame_energy(samples)
+    ranges, start, cut_prev = [], 0, 0
+    while True:
+        target = cut_prev + seg
+        if target + search >= n:
+            ranges.append((start, n))
+            return ranges
+        cut = _quietest(energy, max(cut_prev + seg // 2, target - search), min(n, target + search))
+        ranges.append((start, cut))
+        start, cut_prev = max(0, cut - overlap), cut
+
+
+def next_cut(samples: np.ndarray, segment_s: float, search_s: float = 5.0):
+    """
+    For a growing buffer: the silence cut near segment_s once enough audio
+    has arrived to search around it, else None.
+    """
+    seg, search = int(segment_s * SAMPLE_RATE), int(search_s * SAMPLE_RATE)
+    if len(samples) < seg + search:
+        return None
+    window = samples[:seg + search]
+    return _quietest(_frame_energy(window), max(seg // 2, seg - search), seg + search)
+
+
+# --- stitching ---
+_WORD = re.compile(r"[\w']+")
+
+
+def _norm(word: str) -> str:
+    return ''.join(_WORD.findall(word.lower()))
+
+
+class Stitcher:
+    """
+    Joins segment transcripts, dropping the words at the start of each segment
+    that repeat the tail of the text so far (the overlapped audio).
+    Whisper may emit a partial word at a cut, so the match may start up to
+    max_skip words into the next segment.
+    """
+
+    def __init__(self, max_overlap_words: int = 40, max_skip: int = 2):
+        self.max_overlap_words = max_overlap_words
+        self.max_skip = max_skip
+        self.words = []
+
+    def add(self, text: str):
+        nxt = text.split()
+        tail = [_norm(w) for w in self.words[-self.max_overlap_words:]]
+        head = [_norm(w) for w in nxt[:self.max_overlap_words + self.max_skip]]
+        drop = 0
+        for k in range(min(len(tail), len(head)), 1, -1):
+            hit = next((j for j in range(self.max_skip + 1) if head[j:j + k] == tail[-k:]), None)
+            if hit is not None:
+                drop = hit + k
+                break
+        self.words.extend(nxt[drop:])
+
+    @property
+    def text(self) -> str:
+        return ' '.join(self.words)
+
+
+def stitch(texts: list, max_overlap_words: int = 40, max_skip: int = 2) -> str:
+    stitcher = Stitcher(max_overlap_words, max_skip)
+    for text in texts:
+        stitcher.add(text)
+    return stitcher.text
+
+
+# --- process pool ---
+def _init_worker(model_name: str, threads: int):
+    global _WORKER_MODEL
+    import torch, whisper
+    torch.set_num_threads(threads)
+    _WORKER_MODEL = whisper.load_model(model_name)
+
+
+def _transcribe_segment(samples: np.ndarray) -> str:
+    return _WORKER_MODEL.transcribe(samples, fp16=False, without_timestamps=True)['text']
+
+
+def new_pool(workers: int, model_name: str) -> ProcessPoolExecutor:
+    """A pool whose processes each load the model once; the caller shuts it down."""
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(model_name, threads),
+    )
+
+
+def get_pool(workers: int, model_name: str) -> ProcessPoolExecutor:
+    """One long-lived pool per (workers, model); each process loads the model once."""
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_KEY != (workers, model_name):
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = new_pool(workers, model_name)
+            _POOL_KEY = (workers, model_name)
+        return _POOL
+
+
+def drop_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool so the next get_pool() builds a fresh one; a no-op if it was already replaced."""
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL, _POOL_KEY = None, None
+    pool.shutdown(wait=False)
+
+
+def transcribe_parallel(samples: np.ndarray, model_name: str, workers: int = None,
+                        segment_s: float = None, overlap_s: float = None,
+                        executor=None, fn=_transcribe_segment) -> str:
+    workers = workers or parallel_workers()
+    ranges = split_at_silence(samples, segment_s or segment_seconds(),
+                              overlap_seconds() if overlap_s is None else overlap_s)
+    segments = [np.asarray(samples[a:b]) for a, b in ranges]
+    t0 = time.time()
+    if executor is not None:
+        texts = list(executor.map(fn, segments))
+    else:
+        pool = get_pool(workers, model_name)
+        try:
+            texts = list(pool.map(fn, segments))
+        except BrokenProcessPool:
+            # A worker died (OOM, killed); the pool is unusable from here on.
+            log.warning('Transcription pool broke; retrying on a fresh pool')
+            drop_pool(pool)
+            texts = list(get_pool(workers, model_name).map(fn, segments))
+    log.info('Parallel transcription: %d segment(s) on %d worker(s) in %.1fs',
+             len(ranges), workers, time.time() - t0)
+    return stitch(texts)
@@ -0,0 +1,84 @@
+import os, re, time, logging
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4  # close enough for English/German Gemini tokenization
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def token_budget() -> int:
+    """Input tokens the final quiz prompt may spend on transcript material."""
+    return int(os.getenv('GEMINI_INPUT_TOKEN_BUDGET', '8000'))
+
+
+def chunk_tokens() -> int:
+    return int(os.getenv('CONDENSE_CHUNK_TOKENS', '4000'))
+
+
+def workers() -> int:
+    return int(os.getenv('CONDENSE_WORKERS', '4'))
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def needed(transcript: str, budget: int = None) -> bool:
+    return estimate_tokens(transcript) > (budget or token_budget())
+
+
+def split_chunks(text: str, max_tokens: int) -> list:
+    """
+    Consecutive pieces of at most max_tokens each, cut at sentence ends.
+    Whisper output without punctuation falls back to word boundaries.
+    """
+    limit = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        while len(sentence) > limit:
+            cut = sentence.rfind(' ', 0, limit)
+            cut = cut if cut > 0 else limit
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+
+    chunks, current, size = [], [], 0
+    for piece in pieces:
+        if current and size + len(piece) + 1 > limit:
+            chunks.append(' '.join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece) + 1
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+def condense(transcript: str, extract, budget: int = None, max_workers: int = None, max_rounds: int = 3):
+    """
+    Map-reduce a long transcript down to key facts that fit the token budget.
+    extract(chunk) -> str is called once per chunk, max_workers at a time,
+    and the facts are joined in transcript order. If the facts alone are
+    still over budget they are condensed again (up to max_rounds).
+    Returns (material, report); short transcripts come back unchanged.
+    """
+    budget = budget or token_budget()
+    report = {'input_tokens': estimate_tokens(transcript), 'budget': budget, 'rounds': 0, 'calls': 0}
+    material, t0 = transcript, time.perf_counter()
+    while needed(material, budget) and report['rounds'] < max_rounds:
+        chunks = split_chunks(material, min(chunk_tokens(), budget))
+        with ThreadPoolExecutor(max_workers=max_workers or workers()) as pool:
+            facts = list(pool.map(extract, chunks))
+        material = '\n'.join(f.strip() for f in facts if f and f.strip())
+        report['rounds'] += 1
+        report['calls'] += len(chunks)
+    report['condensed_tokens'] = estimate_tokens(material)
+    report['tokens_saved'] = report['input_tokens'] - report['condensed_tokens']
+    report['map_seconds'] = round(time.perf_counter() - t0, 2)
+    if report['rounds']:
+        log.info('Condensed transcript %d -> %d tokens (budget %d) in %d call(s), %.1fs',
+                 report['input_tokens'], report['condensed_tokens'], budget,
+                 report['calls'], report['map_seconds'])
+    return material, report
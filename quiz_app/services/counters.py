@@ -0,0 +1,31 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from ..models import CacheCounter
+
+
+def record(name: str, hit: bool):
+    add(name, hits=int(hit), misses=int(not hit))
+
+
+def add(name: str, hits: int = 0, misses: int = 0):
+    """Add a batch of hits/misses in one UPDATE (callers that tally in memory)."""
+    delta = {'hits': F('hits') + hits, 'misses': F('misses') + misses}
+    if CacheCounter.objects.filter(name=name).update(**delta):
+        return
+    try:
+        with transaction.atomic():
+            CacheCounter.objects.create(name=name, hits=hits, misses=misses)
+    except IntegrityError:
+        CacheCounter.objects.filter(name=name).update(**delta)
+
+
+def stats() -> dict:
+    out = {}
+    for c in CacheCounter.objects.order_by('name'):
+        total = c.hits + c.misses
+        out[c.name] = {
+            'hits': c.hits,
+            'misses': c.misses,
+            'hit_rate': round(c.hits / total, 4) if total else 0.0,
+        }
+    return out
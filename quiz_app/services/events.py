@@ -0,0 +1,59 @@
+import logging
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+_listeners = {'changed': [], 'deleted': []}
+
+
+def listen(event: str):
+    """
+    Decorator: fn(quiz_ids, user_ids) runs after quizzes are written
+    ('changed') or removed ('deleted'); user_ids are their owners. Listeners
+    run once the surrounding transaction commits (at once in autocommit), so
+    they never see uncommitted rows, a rollback drops them, and a listener
+    error is logged instead of failing a write that already happened.
+    """
+    def register(fn):
+        if fn not in _listeners[event]:
+            _listeners[event].append(fn)
+        return fn
+    return register
+
+
+def _ids(values) -> list:
+    return sorted({int(v) for v in values if v is not None})
+
+
+def _emit(event: str, quiz_ids, user_ids):
+    ids = _ids(quiz_ids)
+    if not ids:
+        return
+    if not callable(user_ids):
+        user_ids = _ids(user_ids)
+
+    def dispatch():
+        users = _ids(user_ids()) if callable(user_ids) else user_ids
+        for fn in _listeners[event]:
+            try:
+                fn(ids, users)
+            except Exception:
+                log.exception('%s listener %s failed for quizzes %s', event, fn.__qualname__, ids)
+
+    transaction.on_commit(dispatch)
+
+
+def quizzes_changed(quiz_ids, user_ids=None):
+    """
+    Call after quizzes or their questions were created or edited. Pass the
+    owners when they are at hand (and any previous owner), else one query
+    looks them up.
+    """
+    if user_ids is None:
+        from ..models import Quiz
+        ids = _ids(quiz_ids)
+        user_ids = lambda: Quiz.objects.filter(id__in=ids).values_list('user_id', flat=True)
+    _emit('changed', quiz_ids, user_ids)
+
+
+def quizzes_deleted(quiz_ids, user_ids):
+    _emit('deleted', quiz_ids, user_ids)
@@ -0,0 +1,141 @@
+import os, logging, threading
+from datetime import timedelta
+from django.db import transaction, close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+from ..models import QuizJob
+from . import service
+
+log = logging.getLogger(__name__)
+_pool = []
+_pool_lock = threading.Lock()
+_wakeup = threading.Event()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# --- queue ---
+def enqueue_quiz_job(user, url: str, **options) -> QuizJob:
+    job = QuizJob.objects.create(user=user, url=url, options=options)
+    if _env_int('QUIZ_JOB_INPROCESS_WORKERS', 1) > 0:
+        ensure_worker_pool()
+    transaction.on_commit(_wakeup.set)
+    return job
+
+
+def claim_next_job():
+    """
+    Move the oldest queued job to RUNNING. The conditional UPDATE is the lock,
+    so several worker processes can poll the same table safely.
+    """
+    while True:
+        job_id = (
+            QuizJob.objects
+            .filter(state=QuizJob.State.QUEUED)
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = QuizJob.objects.filter(id=job_id, state=QuizJob.State.QUEUED).update(
+            state=QuizJob.State.RUNNING,
+            stage='',
+            started_at=now,
+            updated_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return QuizJob.objects.select_related('user').get(id=job_id)
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Jobs left RUNNING by a worker that died go back to the queue,
+    or fail once they used up their attempts.
+    """
+    cutoff = timezone.now() - timedelta(seconds=_env_int('QUIZ_JOB_STALE_SECONDS', 7200))
+    stale = QuizJob.objects.filter(state=QuizJob.State.RUNNING, updated_at__lt=cutoff)
+    max_attempts = _env_int('QUIZ_JOB_MAX_ATTEMPTS', 2)
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        state=QuizJob.State.FAILED,
+        error='Worker stopped while processing the job.',
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    requeued = stale.update(state=QuizJob.State.QUEUED, updated_at=timezone.now())
+    if failed or requeued:
+        log.warning('Stale jobs: requeued=%d failed=%d', requeued, failed)
+    return requeued
+
+
+def run_job(job: QuizJob) -> QuizJob:
+    def on_stage(name):
+        QuizJob.objects.filter(id=job.id).update(stage=name, updated_at=timezone.now())
+
+    def on_progress(quiz, ready):
+        QuizJob.objects.filter(id=job.id).update(quiz=quiz, questions_ready=ready, updated_at=timezone.now())
+
+    log.info('Job %s start: url=%s', job.id, job.url)
+    fields = {}
+    try:
+        quiz = service.create_quiz_from_url(
+            job.user, job.url, on_stage=on_stage, on_progress=on_progress, **job.options)
+    except ValueError as e:
+        fields.update(state=QuizJob.State.FAILED, error=str(e))
+    except Exception:
+        log.exception('Job %s crashed', job.id)
+        fields.update(state=QuizJob.State.FAILED, error='Failed to create quiz.')
+    else:
+        fields.update(state=QuizJob.State.SUCCEEDED, stage='done', quiz=quiz)
+
+    fields['finished_at'] = fields['updated_at'] = timezone.now()
+    QuizJob.objects.filter(id=job.id).update(**fields)
+    job.refresh_from_db()
+    log.info('Job %s finished: %s', job.id, job.state)
+    return job
+
+
+# --- workers ---
+def run_worker(stop_event: threading.Event, poll_interval: float = 2.0):
+    try:
+        while not stop_event.is_set():
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                _wakeup.wait(poll_interval)
+                _wakeup.clear()
+                continue
+            run_job(job)
+    finally:
+        connection.close()
+
+
+def start_worker_pool(size: int, stop_event: threading.Event, poll_interval: float = 2.0) -> list:
+    requeue_stale_jobs()
+    threads = []
+    for i in range(size):
+        t = threading.Thread(
+            target=run_worker,
+            args=(stop_event, poll_interval),
+            name=f'quiz-worker-{i}',
+            daemon=True,
+        )
+        t.start()
+        threads.append(t)
+    log.info('Quiz worker pool started: %d thread(s)', size)
+    return threads
+
+
+def ensure_worker_pool():
+    with _pool_lock:
+        if any(t.is_alive() for t in _pool):
+            return
+        _pool[:] = start_worker_pool(
+            _env_int('QUIZ_JOB_INPROCESS_WORKERS', 1), threading.Event())
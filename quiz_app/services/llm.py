@@ -0,0 +1,443 @@
+import os, re, json, time, queue, random, hashlib, logging, threading
+from concurrent.futures import ThreadPoolExecutor
+from google import genai
+from google.genai import errors, types
+
+log = logging.getLogger(__name__)
+_BACKENDS = {}
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+class LLMError(RuntimeError):
+    pass
+
+
+class CircuitOpen(LLMError):
+    pass
+
+
+class MalformedOutput(ValueError):
+    pass
+
+
+# Gemini structured output: an object with either the quiz fields or "error".
+QUIZ_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'title': {'type': 'STRING'},
+        'description': {'type': 'STRING'},
+        'questions': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'question_title': {'type': 'STRING'},
+                    'question_options': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+                    'answer': {'type': 'STRING'},
+                },
+                'required': ['question_title', 'question_options', 'answer'],
+            },
+        },
+        'error': {'type': 'STRING'},
+    },
+    # title first so a streamed response can name the quiz before the questions arrive
+    'property_ordering': ['title', 'description', 'questions', 'error'],
+}
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def parse_json(txt: str) -> dict:
+    t = re.sub(r'^```.*?\n|\n```$', '', (txt or '').strip(), flags=re.DOTALL)
+    try:
+        data = json.loads(t)
+    except json.JSONDecodeError as e:
+        raise MalformedOutput(f'LLM returned invalid JSON: {e}')
+    if not isinstance(data, dict):
+        raise MalformedOutput('LLM returned JSON that is not an object')
+    return data
+
+
+class ArrayItemStream:
+    """
+    Incremental scanner for a streamed JSON object: feed() text as it arrives
+    and get back each element of the top-level `key` array once its closing
+    brace is in, plus top-level string fields as soon as they are complete.
+    Every character is looked at once.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.fields = {}
+        self._text = ''
+        self._depth = 0
+        self._in_str = self._esc = False
+        self._str_start = None
+        self._last_str = None
+        self._current_key = None
+        self._expect_value = False
+        self._in_array = False
+        self._item_start = None
+
+    def feed(self, text: str) -> list:
+        start = len(self._text)
+        self._text += text
+        items = []
+        for i in range(start, len(self._text)):
+            c = self._text[i]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif c == '\\':
+                    self._esc = True
+                elif c == '"':
+                    self._in_str = False
+                    if self._depth == 1:
+                        self._closed_string(self._text[self._str_start:i + 1])
+                continue
+            if c == '"':
+                self._in_str, self._str_start = True, i
+            elif c == ':' and self._depth == 1:
+                self._current_key, self._expect_value = self._loads(self._last_str), True
+            elif c == ',' and self._depth == 1:
+                self._expect_value = False
+            elif c in '{[':
+                self._depth += 1
+                if c == '[' and self._depth == 2 and self._current_key == self.key:
+                    self._in_array = True
+                elif c == '{' and self._depth == 3 and self._in_array:
+                    self._item_start = i
+            elif c in '}]':
+                if c == '}' and self._depth == 3 and self._item_start is not None:
+                    items.append(self._loads(self._text[self._item_start:i + 1]))
+                    self._item_start = None
+                elif c == ']' and self._depth == 2:
+                    self._in_array = False
+                self._depth -= 1
+        return items
+
+    def _closed_string(self, raw: str):
+        if self._expect_value:
+            self.fields[self._current_key] = self._loads(raw)
+            self._expect_value = False
+        else:
+            self._last_str = raw
+
+    @staticmethod
+    def _loads(raw: str):
+        try:
+            return json.loads(raw)
+        except (TypeError, json.JSONDecodeError) as e:
+            raise MalformedOutput(f'LLM streamed invalid JSON: {e}')
+
+
+# --- backends ---
+class Backend:
+    """
+    generate(prompt, schema) -> raw response text. schema asks for JSON output.
+    generate_stream yields the same text in pieces; by default in one piece.
+    """
+    name = 'base'
+    model = ''
+
+    def generate(self, prompt: str, schema: dict = None) -> str:
+        raise NotImplementedError
+
+    def generate_stream(self, prompt: str, schema: dict = None):
+        yield self.generate(prompt, schema)
+
+
+class GeminiBackend(Backend):
+    name = 'gemini'
+
+    def __init__(self, model: str = None):
+        self.model = model or os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            key = os.getenv('GOOGLE_API_KEY')
+            if not key:
+                raise RuntimeError('GOOGLE_API_KEY not set.')
+            self._client = genai.Client(api_key=key)
+        return self._client
+
+    @staticmethod
+    def _config(schema: dict = None):
+        if schema is None:
+            return None
+        return types.GenerateContentConfig(response_mime_type='application/json', response_schema=schema)
+
+    def generate(self, prompt: str, schema: dict = None) -> str:
+        resp = self.client.models.generate_content(model=self.model, contents=prompt, config=self._config(schema))
+        return resp.text or ''
+
+    def generate_stream(self, prompt: str, schema: dict = None):
+        for chunk in self.client.models.generate_content_stream(
+                model=self.model, contents=prompt, config=self._config(schema)):
+            if chunk.text:
+                yield chunk.text
+
+
+class FakeBackend(Backend):
+    """
+    Offline stand-in: answers are derived from the prompt text only, so the
+    same transcript always yields the same quiz. LLM_FAKE_LATENCY_SECONDS
+    adds a fixed delay per call to model the real round trip.
+    """
+    name = 'fake'
+    model = 'fake'
+
+    def __init__(self, latency: float = None):
+        self.latency = _env_float('LLM_FAKE_LATENCY_SECONDS', 0) if latency is None else latency
+
+    @staticmethod
+    def _material(prompt: str) -> str:
+        blocks = re.findall(r'"""(.*?)"""', prompt, flags=re.DOTALL)
+        return (blocks[-1] if blocks else prompt).strip()
+
+    def generate(self, prompt: str, schema: dict = None) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._answer(prompt, schema)
+
+    def generate_stream(self, prompt: str, schema: dict = None, piece: int = 64):
+        answer = self._answer(prompt, schema)
+        pieces = [answer[i:i + piece] for i in range(0, len(answer), piece)]
+        for p in pieces:
+            if self.latency:
+                time.sleep(self.latency / len(pieces))
+            yield p
+
+    def _answer(self, prompt: str, schema: dict = None) -> str:
+        text = self._material(prompt)
+        sentences = [s.strip() for s in re.split(r'(?<=[.!?])\s+|\n+', text) if len(s.split()) >= 4]
+        if schema is None:
+            return '\n'.join(f'- {s.lstrip("- ")}' for s in sentences[:25])
+        if not sentences:
+            return json.dumps({'error': 'insufficient_content'})
+        words = sorted({w for w in re.findall(r'[^\W\d_]{4,}', text.lower())})
+        rng = random.Random(hashlib.sha256(text.encode('utf-8')).hexdigest())
+        questions = []
+        for i in range(10):
+            sentence = sentences[i % len(sentences)].split()
+            pos = max(range(len(sentence)), key=lambda k: (len(sentence[k]), -k))
+            answer = re.sub(r'\W', '', sentence[pos]) or sentence[pos]
+            distractors = [w for w in rng.sample(words, min(len(words), 8)) if w != answer.lower()][:3]
+            distractors += [f'{answer}{n}' for n in range(3 - len(distractors))]
+            options = [answer, *distractors]
+            rng.shuffle(options)
+            sentence[pos] = '___'
+            questions.append({
+                'question_title': f'Which word fills the gap: "{" ".join(sentence)}"?',
+                'question_options': options,
+                'answer': answer,
+            })
+        return json.dumps({
+            'title': f'Quiz: {" ".join(sentences[0].split()[:6])}',
+            'description': 'Generated offline by the fake LLM backend.',
+            'questions': questions,
+        })
+
+
+def get_backend(name: str = None) -> Backend:
+    """LLM_BACKEND selects 'gemini' (default) or 'fake'; one instance per process."""
+    name = (name or os.getenv('LLM_BACKEND', 'gemini')).lower()
+    if name not in _BACKENDS:
+        if name == 'gemini':
+            _BACKENDS[name] = GeminiBackend()
+        elif name == 'fake':
+            _BACKENDS[name] = FakeBackend()
+        else:
+            raise RuntimeError(f'Unknown LLM_BACKEND: {name}')
+    return _BACKENDS[name]
+
+
+# --- circuit breaker ---
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive transient failures and rejects calls
+    for `reset_seconds`; then lets one trial call through (half-open) and
+    closes again if it succeeds.
+    """
+
+    def __init__(self, threshold: int = None, reset_seconds: float = None):
+        self.threshold = threshold or int(os.getenv('LLM_BREAKER_THRESHOLD', '5'))
+        self.reset_seconds = _env_float('LLM_BREAKER_RESET_SECONDS', 60) if reset_seconds is None else reset_seconds
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        return 'half_open' if time.monotonic() - self.opened_at >= self.reset_seconds else 'open'
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == 'open' or (state == 'half_open' and self._trial):
+                raise CircuitOpen('Quiz generation is temporarily unavailable; try again later.')
+            if state == 'half_open':
+                self._trial = True
+
+    def record(self, ok: bool):
+        with self._lock:
+            self._trial = False
+            if ok:
+                self.failures, self.opened_at = 0, None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold or self.opened_at is not None:
+                if self.opened_at is None:
+                    log.warning('LLM circuit opened after %d consecutive failures', self.failures)
+                self.opened_at = time.monotonic()
+
+
+_BREAKER = CircuitBreaker()
+
+
+# --- calls with deadline + retries ---
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv('LLM_MAX_CONCURRENCY', '8')),
+                                           thread_name_prefix='llm-call')
+    return _EXECUTOR
+
+
+def _transient(e: Exception) -> bool:
+    if isinstance(e, (TimeoutError, ConnectionError, errors.ServerError)):
+        return True
+    if isinstance(e, errors.ClientError):
+        return e.code == 429
+    return type(e).__module__.startswith(('requests', 'urllib3', 'httpx'))
+
+
+def backoff(attempt: int) -> float:
+    """Full jitter: uniform in [0, base * 2^attempt], capped."""
+    base = _env_float('LLM_RETRY_BASE_SECONDS', 1)
+    return random.uniform(0, min(_env_float('LLM_RETRY_MAX_SECONDS', 20), base * 2 ** attempt))
+
+
+def _attempt(backend: Backend, prompt: str, schema: dict, timeout: float, on_chunk=None) -> str:
+    if on_chunk is None:
+        return _executor().submit(backend.generate, prompt, schema).result(timeout=timeout)
+
+    # the stream is read on a worker thread; on_chunk runs here so it can use this thread's DB connection
+    pieces = queue.Queue()
+
+    def produce():
+        try:
+            for piece in backend.generate_stream(prompt, schema):
+                pieces.put(piece)
+            pieces.put(None)
+        except Exception as e:
+            pieces.put(e)
+
+    _executor().submit(produce)
+    deadline, parts = time.monotonic() + timeout, []
+    while True:
+        try:
+            piece = pieces.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise TimeoutError
+        if piece is None:
+            return ''.join(parts)
+        if isinstance(piece, Exception):
+            raise piece
+        parts.append(piece)
+        on_chunk(piece)
+
+
+def call(prompt: str, schema: dict = None, parse=None, backend: Backend = None, breaker: CircuitBreaker = None,
+         on_chunk=None, on_attempt=None):
+    """
+    One LLM request with a deadline per attempt (LLM_TIMEOUT_SECONDS), up to
+    LLM_MAX_ATTEMPTS attempts with jittered backoff, behind the circuit breaker.
+    parse(text) may raise ValueError for unusable output, which is retried
+    without counting against the breaker. A timed-out attempt is abandoned,
+    not cancelled; its thread finishes in the background.
+    With on_chunk the response is streamed and on_chunk(piece) is called on
+    the calling thread as pieces arrive (MalformedOutput from it is retried);
+    on_attempt(n) runs before every attempt so partial results can be reset.
+    """
+    backend = backend or get_backend()
+    breaker = breaker or _BREAKER
+    timeout = _env_float('LLM_TIMEOUT_SECONDS', 120)
+    attempts = int(os.getenv('LLM_MAX_ATTEMPTS', '3'))
+    last = None
+    for attempt in range(attempts):
+        if attempt:
+            time.sleep(backoff(attempt - 1))
+        breaker.before_call()
+        if on_attempt is not None:
+            on_attempt(attempt)
+        t0 = time.monotonic()
+        try:
+            text = _attempt(backend, prompt, schema, timeout, on_chunk)
+        except MalformedOutput as e:
+            breaker.record(ok=True)
+            last = e
+            log.warning('LLM %s attempt %d/%d streamed unusable output: %s',
+                        backend.name, attempt + 1, attempts, e)
+            continue
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                e = TimeoutError(f'LLM call exceeded {timeout:.0f}s')
+            if not _transient(e):
+                breaker.record(ok=True)
+                raise
+            breaker.record(ok=False)
+            last = e
+            log.warning('LLM %s attempt %d/%d failed after %.1fs: %s',
+                        backend.name, attempt + 1, attempts, time.monotonic() - t0, e)
+            continue
+        breaker.record(ok=True)
+        if parse is None:
+            return text
+        try:
+            return parse(text)
+        except ValueError as e:
+            last = e
+            log.warning('LLM %s attempt %d/%d returned unusable output: %s',
+                        backend.name, attempt + 1, attempts, e)
+    raise LLMError(f'Quiz generation failed after {attempts} attempt(s): {last}')
+
+
+def generate_json(prompt: str, schema: dict = None, validate=None, **kwargs) -> dict:
+    def parse(text):
+        data = parse_json(text)
+        if validate is not None:
+            validate(data)
+        return data
+    return call(prompt, schema=schema, parse=parse, **kwargs)
+
+
+def stream_json(prompt: str, key: str, on_item, schema: dict = None, validate=None, on_attempt=None, **kwargs) -> dict:
+    """
+    generate_json over a streamed response: on_item(item, fields) is called
+    for each element of the top-level `key` array as soon as it is complete,
+    with the top-level string fields seen so far.
+    """
+    state = {}
+
+    def start(attempt):
+        state['parser'] = ArrayItemStream(key)
+        if on_attempt is not None:
+            on_attempt(attempt)
+
+    def on_chunk(piece):
+        parser = state['parser']
+        for item in parser.feed(piece):
+            on_item(item, parser.fields)
+
+    return generate_json(prompt, schema=schema, validate=validate,
+                         on_chunk=on_chunk, on_attempt=start, **kwargs)
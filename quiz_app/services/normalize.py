@@ -0,0 +1,85 @@
+import os, re, logging
+from .condense import estimate_tokens
+
+log = logging.getLogger(__name__)
+
+# Hesitations only; words like "so" or "like" carry meaning too often to drop.
+# A bare "um" is the German preposition, so only drawn-out spellings ("umm", "uum") count.
+_FILLER = re.compile(r'(?<!\S)(?:u{2,}m+|u+m{2,}|u+h+m*|e+rm+|äh+m*|h+m{2,}|mhm+|m{2,})[,.]?(?!\S)', re.IGNORECASE)
+_ANNOTATION = re.compile(r'\[(?:music|applause|laughter|musik|applaus|gelächter|inaudible)\]|♪+', re.IGNORECASE)
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_KEY = re.compile(r"[^\w']+")
+
+
+def enabled() -> bool:
+    return os.getenv('NORMALIZE_TRANSCRIPT', 'true').lower() == 'true'
+
+
+def _key(text: str) -> str:
+    return _KEY.sub('', text.lower())
+
+
+def drop_repeated_sentences(text: str) -> str:
+    """Consecutive sentences that only repeat the previous one are dropped."""
+    out, last = [], None
+    for sentence in _SENTENCE_END.split(text):
+        key = _key(sentence)
+        if key and key == last:
+            continue
+        out.append(sentence)
+        last = key
+    return ' '.join(out)
+
+
+def _loop_at(keys: list, i: int, max_n: int, min_repeats: int):
+    """(phrase length, end index) of a phrase loop starting at i, or None."""
+    for n in range(1, max_n + 1):
+        if i + n * min_repeats > len(keys):
+            return None
+        if keys[i + n] != keys[i]:
+            continue
+        phrase = keys[i:i + n]
+        j = i + n
+        while keys[j:j + n] == phrase:
+            j += n
+        if (j - i) // n >= min_repeats:
+            return n, j
+    return None
+
+
+def collapse_loops(words: list, max_n: int = 8, min_repeats: int = 3) -> list:
+    """
+    Runs of the same 1..max_n-word phrase repeated min_repeats times or more
+    (Whisper's "thank you thank you thank you ..." loops) are cut to one copy.
+    Each position is compared against at most max_n * min_repeats words
+    unless a loop starts there, and a loop is skipped as a whole, so the
+    pass is linear in the number of words.
+    """
+    keys = [_key(w) for w in words]
+    out, i = [], 0
+    while i < len(words):
+        loop = _loop_at(keys, i, max_n, min_repeats)
+        if loop is None:
+            out.append(words[i])
+            i += 1
+        else:
+            n, i_next = loop
+            out.extend(words[i:i + n])
+            i = i_next
+    return out
+
+
+def normalize(text: str) -> str:
+    """Strip annotations and hesitation fillers, drop repeated sentences and phrase loops, tidy whitespace."""
+    text = _ANNOTATION.sub(' ', text)
+    text = _FILLER.sub(' ', text)
+    text = drop_repeated_sentences(' '.join(text.split()))
+    return ' '.join(collapse_loops(text.split()))
+
+
+def clean(transcript: str) -> str:
+    """normalize() with the before/after size logged."""
+    cleaned = normalize(transcript)
+    log.info('Transcript normalized: %d -> %d chars, ~%d -> ~%d tokens',
+             len(transcript), len(cleaned), estimate_tokens(transcript), estimate_tokens(cleaned))
+    return cleaned
@@ -0,0 +1,101 @@
+import os, logging
+import yt_dlp
+from yt_dlp.utils import DownloadError
+from . import captions
+
+log = logging.getLogger(__name__)
+
+
+def enabled() -> bool:
+    return os.getenv('PREFLIGHT_ENABLED', 'true').lower() == 'true'
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def max_duration() -> float:
+    return _env_float('PREFLIGHT_MAX_DURATION_SECONDS', 3 * 3600)
+
+
+def max_estimate() -> float:
+    return _env_float('PREFLIGHT_MAX_ESTIMATE_SECONDS', 1800)
+
+
+def sync_max_estimate() -> float:
+    return _env_float('QUIZ_SYNC_MAX_ESTIMATE_SECONDS', 120)
+
+
+# --- metadata ---
+def probe(url: str) -> dict:
+    """yt-dlp metadata for url without downloading anything (format already picked)."""
+    opts = {'format': 'bestaudio/best', 'noplaylist': True, 'quiet': True}
+    try:
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            return ydl.extract_info(url, download=False)
+    except DownloadError as e:
+        raise ValueError(f'YouTube lookup failed: {e}')
+
+
+def estimate_seconds(duration: float, has_captions: bool) -> float:
+    """
+    Rough wall time of the pipeline: captions cost a fixed fetch, Whisper
+    scales with the audio length (PREFLIGHT_WHISPER_RTF seconds per second
+    of audio, download included); Gemini is a fixed cost on top.
+    """
+    generate = _env_float('PREFLIGHT_GENERATE_SECONDS', 20)
+    if has_captions and captions.enabled():
+        return _env_float('PREFLIGHT_CAPTIONS_SECONDS', 5) + generate
+    return duration * _env_float('PREFLIGHT_WHISPER_RTF', 0.3) + generate
+
+
+class Admission:
+    """Outcome of the pre-flight: the metadata to reuse and whether to run the request inline."""
+
+    def __init__(self, info: dict, span, duration: float, has_captions: bool, estimate: float):
+        self.info = info
+        self.span = span
+        self.duration = duration
+        self.has_captions = has_captions
+        self.estimate = estimate
+
+    @property
+    def needs_queue(self) -> bool:
+        return self.estimate > sync_max_estimate()
+
+
+def admit(url: str, span=None, info: dict = None) -> Admission:
+    """
+    Check a video before any media is downloaded. Raises ValueError for
+    live streams, age-gated or private videos and for videos that are too
+    long or too expensive; span=(start, end) restricts the check to that range.
+    """
+    info = probe(url) if info is None else info
+    live = info.get('live_status')
+    if info.get('is_live') or live in ('is_live', 'is_upcoming', 'post_live'):
+        raise ValueError('Live streams and premieres are not supported; try again once the video is published.')
+    if (info.get('age_limit') or 0) >= 18:
+        raise ValueError('Age-restricted videos are not supported.')
+    if info.get('availability') in ('private', 'premium_only', 'subscriber_only', 'needs_auth'):
+        raise ValueError('Video is not publicly available.')
+
+    duration = float(info.get('duration') or 0)
+    if span is not None:
+        start, end = span
+        if duration and start >= duration:
+            raise ValueError('Start time is beyond the end of the video.')
+        span = (start, min(end, duration) if duration else end)
+        duration = span[1] - span[0]
+    if duration > max_duration():
+        raise ValueError(
+            f'Video is {duration / 60:.0f} min long; the limit is {max_duration() / 60:.0f} min. '
+            'Pass start and end to use part of it.'
+        )
+
+    has_captions = captions._pick_track(info, captions._preferred_langs()) is not None
+    estimate = estimate_seconds(duration, has_captions)
+    log.info('Preflight: id=%s duration=%.0fs captions=%s estimate=%.0fs',
+             info.get('id'), duration, has_captions, estimate)
+    if estimate > max_estimate():
+        raise ValueError('Video would take too long to process; pass start and end to use part of it.')
+    return Admission(info, span, duration, has_captions, estimate)
@@ -0,0 +1,57 @@
+import os, hashlib, logging
+from django.db.models import F, Q
+from django.utils import timezone
+from ..models import QuizResponseCacheEntry
+from . import counters
+
+log = logging.getLogger(__name__)
+COUNTER = 'quiz_responses'
+
+
+def normalize_transcript(transcript: str) -> str:
+    return ' '.join(transcript.split())
+
+
+def make_key(transcript: str, model_name: str, prompt_version: int) -> str:
+    h = hashlib.sha256()
+    for part in (model_name, str(prompt_version), normalize_transcript(transcript)):
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def lookup(key: str):
+    row = QuizResponseCacheEntry.objects.filter(key=key).values_list('id', 'payload').first()
+    counters.record(COUNTER, hit=row is not None)
+    if row is None:
+        return None
+    QuizResponseCacheEntry.objects.filter(id=row[0]).update(
+        hits=F('hits') + 1, last_used_at=timezone.now())
+    return row[1]
+
+
+def store(key: str, payload: dict):
+    QuizResponseCacheEntry.objects.update_or_create(
+        key=key, defaults={'payload': payload, 'last_used_at': timezone.now()})
+    evict()
+
+
+def evict() -> int:
+    """
+    Keep the `limit` most recently used entries. The first entry past the limit
+    is read by index (OFFSET limit); under the limit that read is all it costs.
+    """
+    limit = int(os.getenv('QUIZ_RESPONSE_CACHE_MAX_ENTRIES', '1000'))
+    cutoff = list(
+        QuizResponseCacheEntry.objects
+        .order_by('-last_used_at', '-id')
+        .values_list('last_used_at', 'id')[limit:limit + 1]
+    )
+    if not cutoff:
+        return 0
+    used, pk = cutoff[0]
+    removed, _ = QuizResponseCacheEntry.objects.filter(
+        Q(last_used_at__lt=used) | Q(last_used_at=used, id__lte=pk)).delete()
+    if removed:
+        log.info('Quiz response cache evicted %d entr(y/ies)', removed)
+    return removed
@@ -0,0 +1,177 @@
+import logging
+import orjson
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils import timezone
+from django.utils.timezone import localtime
+from ..models import ImportCheckpoint, Question, Quiz
+from . import events
+from .video import resolve_video_key
+
+log = logging.getLogger(__name__)
+
+# NDJSON: one quiz per line with its questions nested, the record shape the
+# admin JSON export always had. Export walks the table by id in chunks and
+# import inserts in batches, so neither holds more than one chunk in memory.
+
+QUIZ_COLUMNS = ('id', 'user_id', 'title', 'description', 'video_url', 'transcript_source', 'created_at', 'updated_at')
+QUESTION_COLUMNS = ('id', 'question_title', 'question_options', 'answer', 'created_at', 'updated_at')
+
+
+# --- export ---
+
+def _stamp(value) -> str:
+    return localtime(value).isoformat()
+
+
+def export_records(queryset, chunk_size: int = 500):
+    """Yield one export record (quiz dict with its questions) per quiz in queryset, by ascending id."""
+    queryset = queryset.order_by('id').values(*QUIZ_COLUMNS)
+    last = 0
+    while True:
+        quizzes = list(queryset.filter(id__gt=last)[:chunk_size])
+        if not quizzes:
+            return
+        questions = {q['id']: [] for q in quizzes}
+        rows = (
+            Question.objects
+            .filter(quiz_id__in=list(questions))
+            .order_by('id')
+            .values('quiz_id', *QUESTION_COLUMNS)
+        )
+        for row in rows:
+            quiz_id = row.pop('quiz_id')
+            row['created_at'], row['updated_at'] = _stamp(row['created_at']), _stamp(row['updated_at'])
+            questions[quiz_id].append(row)
+        for quiz in quizzes:
+            quiz['created_at'], quiz['updated_at'] = _stamp(quiz['created_at']), _stamp(quiz['updated_at'])
+            quiz['questions'] = questions[quiz['id']]
+            yield quiz
+        last = quizzes[-1]['id']
+
+
+def export_lines(queryset, chunk_size: int = 500):
+    """Yield one encoded NDJSON line per quiz in queryset, by ascending id."""
+    for record in export_records(queryset, chunk_size):
+        yield orjson.dumps(record) + b'\n'
+
+
+def export_json_array(queryset, chunk_size: int = 500):
+    """The same records as one indented JSON array, still produced chunk by chunk."""
+    yield b'['
+    for i, record in enumerate(export_records(queryset, chunk_size)):
+        yield (b',\n' if i else b'\n') + orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    yield b'\n]\n'
+
+
+# --- import ---
+
+class InvalidRecord(ValueError):
+    pass
+
+
+def _record(line: bytes, number: int) -> dict:
+    try:
+        data = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        raise InvalidRecord(f'line {number}: not JSON ({e})')
+    if not isinstance(data, dict) or not isinstance(data.get('title'), str):
+        raise InvalidRecord(f'line {number}: expected an object with a title')
+    if not isinstance(data.get('questions', []), list):
+        raise InvalidRecord(f'line {number}: questions must be a list')
+    for i, q in enumerate(data.get('questions', []), 1):
+        if not isinstance(q, dict):
+            raise InvalidRecord(f'line {number}: question {i} must be an object')
+        if not isinstance(q.get('question_options', []), list):
+            raise InvalidRecord(f'line {number}: question {i}: question_options must be a list')
+    return data
+
+
+def _insert(records, user_for):
+    """Bulk-insert (line number, record) pairs; returns the new quizzes. Timestamps are kept."""
+    quizzes, stamps = [], []
+    for number, data in records:
+        user_id = user_for(data, number)
+        quizzes.append(Quiz(
+            user_id=user_id,
+            title=data['title'][:255],
+            description=data.get('description') or '',
+            video_url=data.get('video_url') or '',
+            transcript_source=data.get('transcript_source') or '',
+        ))
+        stamps.append((parse_datetime(data.get('created_at') or ''), parse_datetime(data.get('updated_at') or '')))
+    for quiz in quizzes:
+        # bulk_create skips Quiz.save(), which fills video_id
+        quiz.video_id = resolve_video_key(quiz.video_url) or ''
+    Quiz.objects.bulk_create(quizzes)
+
+    questions, question_stamps = [], []
+    for quiz, (_, data) in zip(quizzes, records):
+        for q in data.get('questions', []):
+            questions.append(Question(
+                quiz=quiz,
+                question_title=str(q.get('question_title', ''))[:500],
+                question_options=q.get('question_options', []),
+                answer=str(q.get('answer', ''))[:255],
+            ))
+            question_stamps.append((parse_datetime(q.get('created_at') or ''), parse_datetime(q.get('updated_at') or '')))
+    Question.objects.bulk_create(questions, batch_size=500)
+
+    # auto_now(_add) overwrote the timestamps on insert; put the exported ones back
+    for objs, model, pairs in ((quizzes, Quiz, stamps), (questions, Question, question_stamps)):
+        restored = []
+        for obj, (created, updated) in zip(objs, pairs):
+            if created or updated:
+                obj.created_at, obj.updated_at = created or obj.created_at, updated or obj.updated_at
+                restored.append(obj)
+        if restored:
+            model.objects.bulk_update(restored, ['created_at', 'updated_at'], batch_size=500)
+    return quizzes
+
+
+def import_file(path: str, name: str, user_for, batch_size: int = 500, restart: bool = False,
+                on_batch=None) -> ImportCheckpoint:
+    """
+    Import an NDJSON export. Each batch of quizzes is inserted in one
+    transaction together with the checkpoint row `name` (byte offset and line
+    of the file done so far), so an interrupted run resumes after the last
+    committed batch and never inserts a quiz twice. user_for(record, line)
+    returns the owner's id or raises InvalidRecord.
+    """
+    checkpoint, _ = ImportCheckpoint.objects.get_or_create(name=name)
+    if restart:
+        checkpoint.offset = checkpoint.lines = checkpoint.quizzes = 0
+        checkpoint.finished_at = None
+        checkpoint.save()
+    if checkpoint.finished_at is not None:
+        return checkpoint
+
+    with open(path, 'rb') as f:
+        f.seek(checkpoint.offset)
+        offset, number = checkpoint.offset, checkpoint.lines
+        batch = []
+        while True:
+            line = f.readline()
+            if line:
+                offset += len(line)
+                number += 1
+                if line.strip():
+                    batch.append((number, _record(line, number)))
+            if batch and (len(batch) >= batch_size or not line):
+                with transaction.atomic():
+                    quizzes = _insert(batch, user_for)
+                    checkpoint.offset, checkpoint.lines = offset, number
+                    checkpoint.quizzes += len(quizzes)
+                    checkpoint.save(update_fields=['offset', 'lines', 'quizzes', 'updated_at'])
+                events.quizzes_changed([q.id for q in quizzes], [q.user_id for q in quizzes])
+                batch = []
+                if on_batch:
+                    on_batch(checkpoint)
+            if not line:
+                break
+
+    checkpoint.offset, checkpoint.lines = offset, number
+    checkpoint.finished_at = timezone.now()
+    checkpoint.save()
+    log.info('Import %s finished: %d quizzes from %d lines', name, checkpoint.quizzes, checkpoint.lines)
+    return checkpoint
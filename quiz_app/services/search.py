@@ -0,0 +1,130 @@
+import logging, re
+from django.db import connection
+from django.db.models import Q
+from ..models import Quiz
+from . import events
+
+log = logging.getLogger(__name__)
+
+# One FTS5 row per quiz (rowid = quiz id): its title, description and the
+# titles and options of all its questions. Kept current through the events
+# hook, so searching never joins or LIKE-scans the question table.
+
+TABLE = 'quiz_app_quizsearch'
+# bm25() weights per column: user_id (unindexed), title, description, questions
+WEIGHTS = (0.0, 10.0, 4.0, 1.0)
+CHUNK = 500
+
+CREATE_SQL = f'''
+CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+    user_id UNINDEXED, title, description, questions,
+    tokenize = 'unicode61 remove_diacritics 2'
+)'''
+
+# options are read with json_each so that non-ASCII text is indexed, not its \\u escapes
+_INSERT_SQL = f'''
+INSERT INTO {TABLE}(rowid, user_id, title, description, questions)
+SELECT quiz.id, quiz.user_id, quiz.title, quiz.description, COALESCE((
+    SELECT group_concat(question.question_title || ' ' || (
+        SELECT COALESCE(group_concat(opt.value, ' '), '') FROM json_each(question.question_options) AS opt
+    ), char(10))
+    FROM quiz_app_question AS question WHERE question.quiz_id = quiz.id
+), '')
+FROM quiz_app_quiz AS quiz'''
+
+
+def available() -> bool:
+    return connection.vendor == 'sqlite'
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for i in range(0, len(ids), CHUNK):
+        yield ids[i:i + CHUNK]
+
+
+def create_index():
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+
+
+def rebuild():
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE}')
+        cursor.execute(_INSERT_SQL)
+
+
+def index(quiz_ids):
+    """(Re)index these quizzes; ids that no longer exist just drop out."""
+    with connection.cursor() as cursor:
+        for chunk in _chunks(quiz_ids):
+            marks = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM {TABLE} WHERE rowid IN ({marks})', chunk)
+            cursor.execute(f'{_INSERT_SQL} WHERE quiz.id IN ({marks})', chunk)
+
+
+def remove(quiz_ids):
+    with connection.cursor() as cursor:
+        for chunk in _chunks(quiz_ids):
+            marks = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM {TABLE} WHERE rowid IN ({marks})', chunk)
+
+
+@events.listen('changed')
+def _on_changed(quiz_ids, user_ids):
+    if available():
+        index(quiz_ids)
+
+
+@events.listen('deleted')
+def _on_deleted(quiz_ids, user_ids):
+    if available():
+        remove(quiz_ids)
+
+
+# --- querying ---
+
+def match_expression(text: str) -> str:
+    """
+    User input as an FTS5 query: every word must match, the last one as a
+    prefix (search-as-you-type). Words are quoted, so FTS syntax in the
+    input (AND, NEAR, column:, quotes) is just text.
+    """
+    words = re.findall(r'\w+', text or '')
+    if not words:
+        return ''
+    return ' '.join(f'"{w}"' for w in words) + '*'
+
+
+def matching_sql(text: str):
+    """(sql, params) selecting the ids of all matching quizzes, for pk__in=RawSQL(...)."""
+    return f'SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s', [match_expression(text)]
+
+
+def search(text: str, user_id=None, limit: int = 20) -> list:
+    """Ids of the best matching quizzes (of user_id, if given), best first."""
+    expr = match_expression(text)
+    if not expr:
+        return []
+    if not available():
+        return _search_like(text, user_id, limit)
+    sql = f'SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s'
+    params = [expr]
+    if user_id is not None:
+        sql += ' AND user_id = %s'
+        params.append(user_id)
+    sql += f" ORDER BY bm25({TABLE}, {', '.join(map(str, WEIGHTS))}), rowid DESC LIMIT %s"
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_like(text: str, user_id, limit: int) -> list:
+    # unranked fallback for databases without FTS5
+    qs = Quiz.objects.all() if user_id is None else Quiz.objects.filter(user_id=user_id)
+    for word in re.findall(r'\w+', text):
+        qs = qs.filter(Q(title__icontains=word) | Q(description__icontains=word)
+                       | Q(questions__question_title__icontains=word))
+    matches = Quiz.objects.filter(id__in=qs.values('id')).order_by('-created_at', '-id')
+    return list(matches.values_list('id', flat=True)[:limit])
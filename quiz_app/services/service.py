@@ -1,17 +1,19 @@
-import os, re, json, time, tempfile, logging
+import os, time, tempfile, logging
 import whisper, yt_dlp
 from yt_dlp.utils import DownloadError
-from google import genai
 from django.db import transaction
+from django.utils import timezone
 from ..models import Quiz, Question
+from . import transcripts, quiz_cache, singleflight, captions, audio, whisper_server, chunking, streaming, vad, condense, normalize, llm, events
+from .timing import StageTimer
+from .video import resolve_video_key
 
 log = logging.getLogger(__name__)
 _WHISPER_MODEL = None
-_client = None
 
 
 # --- YT audio download (full video) ---
-def download_audio_file(url: str, out_dir: str) -> str:
+def download_audio_file(url: str, out_dir: str, span=None) -> str:
     os.makedirs(out_dir, exist_ok=True)
     outtmpl = os.path.join(out_dir, '%(id)s.%(ext)s')
 
@@ -23,6 +25,7 @@ def download_audio_file(url: str, out_dir: str) -> str:
         'postprocessors': [
             {'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3', 'preferredquality': '192'}
         ],
+        **audio.range_opts(span),
     }
 
     try:
@@ -43,45 +46,59 @@ def download_audio_file(url: str, out_dir: str) -> str:
 
 
 # --- Whisper ---
+def _whisper_model_name() -> str:
+    return os.getenv('WHISPER_MODEL', 'base')
+
+
 def _get_whisper_model():
     global _WHISPER_MODEL
     if _WHISPER_MODEL is None:
-        name = os.getenv('WHISPER_MODEL', 'base')
+        name = _whisper_model_name()
         log.info('Whisper load start: %s', name)
         _WHISPER_MODEL = whisper.load_model(name)
         log.info('Whisper load done: %s', name)
     return _WHISPER_MODEL
 
 
-def transcribe_with_whisper(audio_path: str) -> str:
+def _transcribe_local(source) -> str:
     model = _get_whisper_model()
     log.info('Whisper transcribe call')
-    result = model.transcribe(audio_path, fp16=False, without_timestamps=True)
-    transcript = result['text']
+    result = model.transcribe(source, fp16=False, without_timestamps=True)
+    return result['text']
+
+
+def transcribe_with_whisper(source) -> str:
+    """
+    source is an audio file path or a 16 kHz mono float32 array.
+    WHISPER_BACKEND=server sends it to the shared transcription server and
+    falls back to the in-process model if the server is not running; a
+    server that accepted the job but timed out is reported as a failure.
+    With WHISPER_PARALLEL_WORKERS > 1, long audio is split at silences and
+    transcribed on a process pool.
+    """
+    transcript = None
+    if os.getenv('WHISPER_BACKEND', 'local').lower() == 'server':
+        try:
+            log.info('Whisper transcribe call (server)')
+            transcript = whisper_server.transcribe(source)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            log.warning('Whisper server unavailable (%s); transcribing in-process', e)
+    if transcript is None and chunking.parallel_workers() > 1:
+        samples = whisper.load_audio(source) if isinstance(source, str) else source
+        if len(samples) > 1.5 * chunking.segment_seconds() * audio.SAMPLE_RATE:
+            transcript = chunking.transcribe_parallel(samples, _whisper_model_name())
+        source = samples
+    if transcript is None:
+        transcript = _transcribe_local(source)
     snippet = transcript[:240].replace('\n', ' ')
     log.info('Transcript len=%d sample="%s..."', len(transcript), snippet)
     return transcript
 
 
 # --- Gemini ---
-def get_gemini_client():
-    global _client
-    if _client is None:
-        key = os.getenv('GOOGLE_API_KEY')
-        if not key:
-            raise RuntimeError('GOOGLE_API_KEY not set.')
-        _client = genai.Client(api_key=key)
-    return _client
-
-
-def _coerce_json(txt: str) -> dict:
-    t = re.sub(r'^```.*?\n|\n```$', '', txt.strip(), flags=re.DOTALL)
-    return json.loads(t)
-
-
-def make_quiz_with_gemini(transcript: str) -> dict:
-    client = get_gemini_client()
-    prompt = f"""
+# Bump PROMPT_VERSION whenever QUIZ_PROMPT changes so cached responses are not reused.
+PROMPT_VERSION = 1
+QUIZ_PROMPT = """
         You are given a transcript from which you have to create a quiz in STRICT JSON:
 
         {{
@@ -107,8 +124,100 @@ def make_quiz_with_gemini(transcript: str) -> dict:
         Transcript:
         \"\"\"{transcript}\"\"\"
         """
-    resp = client.models.generate_content(model='gemini-2.5-flash', contents=prompt)
-    return _coerce_json(resp.text)
+
+
+def _llm_model_name() -> str:
+    return llm.get_backend().model
+
+
+def validate_question(q: dict, i: int = 1):
+    options = q.get('question_options')
+    if not q.get('question_title') or not isinstance(options, list) or len(options) != 4:
+        raise ValueError(f'question {i} needs a title and exactly 4 options')
+    if q.get('answer') not in options:
+        raise ValueError(f'question {i} answer is not one of its options')
+
+
+def validate_quiz(data: dict):
+    """Raises ValueError unless data is a usable quiz or the insufficient_content marker."""
+    if data.get('error'):
+        return
+    questions = data.get('questions')
+    if not isinstance(questions, list) or not questions:
+        raise ValueError('quiz has no questions')
+    for i, q in enumerate(questions, 1):
+        validate_question(q, i)
+
+
+def _stream_enabled() -> bool:
+    return os.getenv('LLM_STREAM', 'true').lower() == 'true'
+
+
+def make_quiz_with_gemini(transcript: str, progress=None) -> dict:
+    """
+    With a ProgressiveQuiz as progress (and LLM_STREAM on) the response is
+    streamed and every question is validated and saved as soon as it is complete.
+    """
+    prompt = QUIZ_PROMPT.format(transcript=transcript)
+    if progress is None or not _stream_enabled():
+        return llm.generate_json(prompt, schema=llm.QUIZ_SCHEMA, validate=validate_quiz)
+
+    def on_item(question, fields):
+        try:
+            validate_question(question, progress.saved + 1)
+        except ValueError as e:
+            raise llm.MalformedOutput(str(e))
+        progress.add(question, fields)
+
+    return llm.stream_json(prompt, 'questions', on_item, schema=llm.QUIZ_SCHEMA,
+                           validate=validate_quiz, on_attempt=progress.reset)
+
+
+FACTS_PROMPT = """
+        Below is one part of a lecture transcript. List the key facts, definitions,
+        numbers and cause/effect relations a quiz about the lecture could ask about.
+
+        Rules:
+        - One fact per line, starting with "- ".
+        - Only facts stated in this part; no commentary.
+        - At most {max_facts} lines.
+
+        Transcript part:
+        \"\"\"{chunk}\"\"\"
+        """
+
+
+def extract_key_facts(chunk: str) -> str:
+    """Map step of transcript condensation: one Gemini call per chunk."""
+    prompt = FACTS_PROMPT.format(chunk=chunk, max_facts=int(os.getenv('CONDENSE_MAX_FACTS', '25')))
+    return llm.call(prompt)
+
+
+def generate_quiz(transcript: str, fresh: bool = False, progress=None) -> dict:
+    """
+    make_quiz_with_gemini behind the response cache; fresh=True skips the lookup
+    but still refreshes the cached entry. Transcripts over the input token
+    budget are condensed to key facts first and only those go into the prompt.
+    progress receives questions as they stream in (cache hits skip it).
+    """
+    budget = condense.token_budget()
+    version = f'{PROMPT_VERSION}:condensed:{budget}' if condense.needed(transcript, budget) else PROMPT_VERSION
+    key = quiz_cache.make_key(transcript, _llm_model_name(), version)
+    if not fresh:
+        cached = quiz_cache.lookup(key)
+        if cached is not None:
+            log.info('Step 3: quiz response cache hit')
+            return cached
+    material, report = condense.condense(transcript, extract_key_facts, budget)
+    t0 = time.perf_counter()
+    quiz_json = make_quiz_with_gemini(material, progress)
+    if report['rounds']:
+        log.info('Step 3: quiz prompt used %d instead of %d transcript tokens (map %.1fs, final %.1fs)',
+                 report['condensed_tokens'], report['input_tokens'],
+                 report['map_seconds'], time.perf_counter() - t0)
+    if not quiz_json.get('error'):
+        quiz_cache.store(key, quiz_json)
+    return quiz_json
 
 
 # --- DB save ---
@@ -119,37 +228,248 @@ def _save_quiz(data: dict, user, url: str) -> Quiz:
             title=data.get('title', 'Quiz'),
             description=data.get('description', ''),
             video_url=url,
+            transcript_source=data.get('transcript_source', ''),
         )
-        for q in data.get('questions', []):
-            Question.objects.create(
-                quiz=quiz,
-                question_title=q.get('question_title', ''),
-                question_options=q.get('question_options', []),
-                answer=q.get('answer', ''),
-            )
+        _bulk_add_questions(quiz, data.get('questions', []))
+    events.quizzes_changed([quiz.id], [user.id])
     return quiz
 
 
-# --- function which is called in views.py to create quiz ---
-def create_quiz_from_url(user, url: str) -> Quiz:
-    t0 = time.time()
-    with tempfile.TemporaryDirectory(prefix='quiz_') as tmp:
-        log.info('Step 1: download start')
-        audio_path = download_audio_file(url, tmp)
-        log.info('Step 1: download done in %.1fs', time.time() - t0)
+def _bulk_add_questions(quiz: Quiz, questions: list):
+    Question.objects.bulk_create([
+        Question(
+            quiz=quiz,
+            question_title=q.get('question_title', ''),
+            question_options=q.get('question_options', []),
+            answer=q.get('answer', ''),
+        )
+        for q in questions
+    ])
 
-        log.info('Step 2: whisper start')
-        transcript = transcribe_with_whisper(audio_path)
+
+class ProgressiveQuiz:
+    """
+    Builds the Quiz row while the LLM response streams in: the quiz is
+    created with the first complete question and each further question is
+    saved as it arrives. on_progress(quiz, questions_ready) runs after every
+    change so job status can point clients at the partial quiz. Readers
+    (snapshot, search, read cache) are refreshed for the first question and
+    then once per emit_every questions, not per row.
+    """
+    emit_every = 5
+
+    def __init__(self, user, url: str, on_progress=None):
+        self.user = user
+        self.url = url
+        self.on_progress = on_progress or (lambda quiz, ready: None)
+        self.quiz = None
+        self.saved = 0
+        self.emitted = 0
+
+    def add(self, q: dict, fields: dict):
+        if self.quiz is None:
+            self.quiz = Quiz.objects.create(
+                user=self.user,
+                title=fields.get('title') or 'Quiz',
+                description=fields.get('description', ''),
+                video_url=self.url,
+            )
+        Question(
+            quiz=self.quiz,
+            question_title=q['question_title'],
+            question_options=q['question_options'],
+            answer=q['answer'],
+        ).save(emit=False)
+        self.saved += 1
+        if self.emitted == 0 or self.saved - self.emitted >= self.emit_every:
+            events.quizzes_changed([self.quiz.id], [self.user.id])
+            self.emitted = self.saved
+        self.on_progress(self.quiz, self.saved)
+
+    def reset(self, attempt: int):
+        """A retried LLM call starts over, so drop what the failed attempt saved."""
+        if attempt and self.quiz is not None and self.saved:
+            self.quiz.questions.all().delete()
+            Quiz.objects.filter(id=self.quiz.id).update(updated_at=timezone.now())
+            events.quizzes_changed([self.quiz.id], [self.user.id])
+            self.saved = self.emitted = 0
+            self.on_progress(self.quiz, 0)
+
+    def finish(self, data: dict) -> Quiz:
+        questions = data.get('questions', [])
+        if self.quiz is None:
+            self.quiz = _save_quiz(data, self.user, self.url)
+        else:
+            with transaction.atomic():
+                Quiz.objects.filter(id=self.quiz.id).update(
+                    title=data.get('title', self.quiz.title),
+                    description=data.get('description', self.quiz.description),
+                    transcript_source=data.get('transcript_source', ''),
+                    updated_at=timezone.now(),
+                )
+                _bulk_add_questions(self.quiz, questions[self.saved:])
+            events.quizzes_changed([self.quiz.id], [self.user.id])
+            self.quiz.refresh_from_db()
+        self.saved = len(questions)
+        self.on_progress(self.quiz, self.saved)
+        return self.quiz
+
+    def discard(self):
+        if self.quiz is not None:
+            quiz_id = self.quiz.id
+            self.quiz.delete()
+            events.quizzes_deleted([quiz_id], [self.user.id])
+            self.quiz = None
+
+
+# --- transcript: cache -> captions -> audio + Whisper ---
+def _audio_download_mode() -> str:
+    return os.getenv('AUDIO_DOWNLOAD_MODE', 'pcm').lower()
+
+
+def fetch_audio(url: str, out_dir: str, span=None):
+    """
+    'pcm' keeps the native stream and decodes it once to a float32 array;
+    'mp3' is the original extract-to-MP3 path that Whisper decodes again.
+    span=(start, end) downloads only that part of the video.
+    """
+    if _audio_download_mode() == 'mp3':
+        return download_audio_file(url, out_dir, span)
+    return audio.download_pcm(url, out_dir, span)
+
+
+def _audio_transcript(url: str, out_dir: str, stage, timer: StageTimer, span=None, info=None) -> str:
+    gate = vad.SpeechGate() if vad.enabled() else None
+
+    def transcribe_speech(samples) -> str:
+        if gate is not None:
+            with timer.stage('vad'):
+                samples = gate(samples)
+            if not len(samples):
+                return ''
+        return transcribe_with_whisper(samples)
+
+    if _audio_download_mode() == 'stream':
+        log.info('Step 1+2: streaming download + whisper start')
+        stage('transcribe')
+        transcript = streaming.stream_transcribe(url, transcribe_speech, timer, span, info)
+        if transcript is not None:
+            if gate is not None:
+                gate.check(final=True)
+            return transcript
+        log.info('Step 1+2: stream not available, downloading instead')
+
+    log.info('Step 1: download start')
+    stage('download')
+    with timer.stage('download'):
+        samples = fetch_audio(url, out_dir, span)
+    if gate is not None:
+        # the whole file is here, so judge the speech ratio on all of it
+        gate = vad.SpeechGate(probe_seconds=0)
+        if isinstance(samples, str):
+            samples = whisper.load_audio(samples)
+
+    log.info('Step 2: whisper start')
+    stage('transcribe')
+    with timer.stage('transcribe'):
+        return transcribe_speech(samples)
+
+
+def _span_key(video_key, span):
+    if not video_key or span is None:
+        return video_key
+    return f'{video_key}@{span[0]:g}-{span[1]:g}'
+
+
+def has_cached_transcript(url: str, span=None) -> bool:
+    """True when get_transcript() will be answered from the transcript cache."""
+    video_key = _span_key(resolve_video_key(url), tuple(span) if span else None)
+    return bool(video_key) and transcripts.contains(video_key, _whisper_model_name())
+
+
+def get_transcript(url: str, out_dir: str, stage, timer: StageTimer, span=None, info=None):
+    """
+    Returns (transcript, source) where source is cache, captions, auto_captions or whisper.
+    span=(start, end) transcribes only that range; info is pre-flight metadata to reuse.
+    """
+    model_name = _whisper_model_name()
+    video_key = _span_key(resolve_video_key(url), span)
+    if video_key:
+        cached, origin = transcripts.lookup(video_key, model_name)
+        if cached is not None:
+            log.info('Step 1+2: transcript cache hit for %s (origin=%s)', video_key, origin)
+            return cached, 'cache'
+
+    if captions.enabled():
+        stage('captions')
+        with timer.stage('captions'):
+            text, source = captions.fetch_captions(url, info, span)
+        if text:
+            log.info('Step 1+2: %s transcript, Whisper skipped', source)
+            if video_key:
+                transcripts.store(video_key, model_name, text, source)
+            return text, source
+
+    transcript = _audio_transcript(url, out_dir, stage, timer, span, info)
+    if video_key:
+        transcripts.store(video_key, model_name, transcript, 'whisper')
+    return transcript, 'whisper'
+
+
+# --- pipeline: URL -> quiz JSON ---
+def build_quiz_data(url: str, stage, fresh: bool = False, span=None, info=None, progress=None) -> dict:
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory(prefix='quiz_') as tmp:
+        transcript, source = get_transcript(url, tmp, stage, timer, span, info)
+        if transcript and normalize.enabled():
+            with timer.stage('normalize'):
+                transcript = normalize.clean(transcript)
         if not transcript or len(transcript.strip()) < 150:
             raise ValueError('Transcript too short or low-signal; try another video.')
-        log.info('Step 2: whisper done (len=%d)', len(transcript))
+        log.info('Step 2: transcript ready (len=%d, source=%s)', len(transcript), source)
 
         log.info('Step 3: gemini start')
-        quiz_json = make_quiz_with_gemini(transcript)
+        stage('generate')
+        with timer.stage('generate'):
+            quiz_json = generate_quiz(transcript, fresh=fresh, progress=progress)
         if quiz_json.get('error') == 'insufficient_content':
             raise ValueError('Video not instructional; cannot create quiz.')
-        log.info('Step 3: gemini done in %.1fs', time.time() - t0)
+        timer.log_report()
+        return {**quiz_json, 'transcript_source': source}
+
+
+# --- function which is called in views.py to create quiz ---
+def create_quiz_from_url(user, url: str, on_stage=None, fresh: bool = False,
+                         span=None, info: dict = None, on_progress=None) -> Quiz:
+    """
+    span=(start, end) in seconds limits the quiz to part of the video;
+    info is the metadata from preflight.admit so it is not fetched twice.
+    on_progress(quiz, questions_ready) reports questions saved while the
+    quiz is still being generated.
+    """
+    t0 = time.time()
+    stage = on_stage or (lambda name: None)
+    span = tuple(span) if span else None
+    video_key = _span_key(resolve_video_key(url), span)
+    progress = ProgressiveQuiz(user, url, on_progress)
+    try:
+        if video_key and not fresh:
+            # Concurrent requests for the same video share one pipeline run.
+            def run(heartbeat):
+                def owner_stage(name):
+                    heartbeat()
+                    stage(name)
+                return build_quiz_data(url, owner_stage, span=span, info=info, progress=progress)
 
-        quiz = _save_quiz(quiz_json, user, url)
-        log.info('Step 4: saved quiz in DB. Total %.1fs', time.time() - t0)
-        return quiz
+            flight_key = f'{video_key}:{_whisper_model_name()}'
+            quiz_json = singleflight.run_once(flight_key, run, on_wait=lambda: stage('waiting'))
+        else:
+            quiz_json = build_quiz_data(url, stage, fresh=fresh, span=span, info=info, progress=progress)
+
+        stage('save')
+        quiz = progress.finish(quiz_json)
+    except Exception:
+        progress.discard()
+        raise
+    log.info('Step 4: saved quiz in DB. Total %.1fs', time.time() - t0)
+    return quiz
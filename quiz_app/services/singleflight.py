@@ -0,0 +1,144 @@
+import os, threading, time, uuid, logging
+from datetime import timedelta
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.utils import timezone
+from ..models import PipelineFlight
+
+log = logging.getLogger(__name__)
+
+
+def _seconds(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+_LOCKED = ('database is locked', 'database table is locked')
+
+
+def _retrying(op, attempts: int = 20):
+    """
+    Run a small read/write, retrying while SQLite reports the database as
+    locked (the owner and its waiters touch the same row concurrently).
+    Any other OperationalError is raised at once.
+    """
+    for attempt in range(attempts):
+        try:
+            return op()
+        except OperationalError as e:
+            if attempt == attempts - 1 or not any(m in str(e) for m in _LOCKED):
+                raise
+            time.sleep(min(_seconds('SINGLEFLIGHT_POLL_SECONDS', 1.0), 0.05 * (attempt + 1)))
+
+
+def _lease() -> timedelta:
+    return timedelta(seconds=_seconds('SINGLEFLIGHT_LEASE_SECONDS', 900))
+
+
+def _keep_alive(heartbeat, stop: threading.Event):
+    """Renew the lease every third of its length until stop is set, so a long stage cannot outlive it."""
+    interval = max(_lease().total_seconds() / 3, 1.0)
+    try:
+        while not stop.wait(interval):
+            try:
+                heartbeat()
+            except Exception:
+                log.warning('Single-flight heartbeat failed', exc_info=True)
+    finally:
+        connection.close()
+
+
+def _acquire(key: str, token: str):
+    """
+    Returns (True, None) if this caller now owns the flight, otherwise
+    (False, flight) with the flight to wait on.
+    """
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            PipelineFlight.objects.create(key=key, owner=token, lease_expires_at=now + _lease())
+        return True, None
+    except IntegrityError:
+        pass
+
+    flight = PipelineFlight.objects.filter(key=key).first()
+    if flight is None:
+        return _acquire(key, token)
+
+    result_ttl = timedelta(seconds=_seconds('SINGLEFLIGHT_RESULT_TTL_SECONDS', 120))
+    expired = (
+        flight.lease_expires_at < now
+        if flight.state == PipelineFlight.State.RUNNING
+        else flight.updated_at < now - result_ttl
+    )
+    if not expired:
+        return False, flight
+
+    taken = PipelineFlight.objects.filter(
+        id=flight.id, owner=flight.owner, updated_at=flight.updated_at,
+    ).update(
+        owner=token, state=PipelineFlight.State.RUNNING, result=None, error='',
+        lease_expires_at=now + _lease(), updated_at=now,
+    )
+    if taken:
+        log.info('Single-flight %s taken over from %s', key, flight.owner)
+        return True, None
+    return False, PipelineFlight.objects.filter(key=key).first()
+
+
+def _wait(key: str, flight: PipelineFlight):
+    poll = _seconds('SINGLEFLIGHT_POLL_SECONDS', 1.0)
+    while flight is not None and flight.state == PipelineFlight.State.RUNNING:
+        if flight.lease_expires_at < timezone.now():
+            return None
+        time.sleep(poll)
+        flight = _retrying(PipelineFlight.objects.filter(key=key).first)
+    return flight
+
+
+def run_once(key: str, fn, on_wait=None):
+    """
+    Run fn(heartbeat) at most once at a time per key across all processes that
+    share the database. Concurrent callers block until the owner finishes and
+    get its result (or its ValueError). While fn runs a background thread
+    extends the owner's lease, and fn may call heartbeat() to extend it too;
+    an expired lease lets a waiter take over.
+    """
+    token = uuid.uuid4().hex
+
+    mine = PipelineFlight.objects.filter(key=key, owner=token)
+
+    def heartbeat():
+        _retrying(lambda: mine.update(
+            lease_expires_at=timezone.now() + _lease(), updated_at=timezone.now()))
+
+    while True:
+        owner, flight = _retrying(lambda: _acquire(key, token))
+        if owner:
+            break
+        if on_wait:
+            on_wait()
+        log.info('Single-flight %s: waiting on %s', key, flight.owner if flight else '-')
+        flight = _wait(key, flight)
+        if flight is None:
+            continue
+        if flight.state == PipelineFlight.State.DONE:
+            return flight.result
+        raise ValueError(flight.error)
+
+    stop = threading.Event()
+    threading.Thread(target=_keep_alive, args=(heartbeat, stop), daemon=True).start()
+    try:
+        try:
+            result = fn(heartbeat)
+        finally:
+            stop.set()
+    except ValueError as e:
+        _retrying(lambda: mine.update(
+            state=PipelineFlight.State.FAILED, error=str(e), updated_at=timezone.now()))
+        raise
+    except BaseException:
+        # Unexpected failures are not shared; the next waiter retries.
+        _retrying(mine.delete)
+        raise
+    _retrying(lambda: mine.update(
+        state=PipelineFlight.State.DONE, result=result, updated_at=timezone.now()))
+    return result
@@ -0,0 +1,114 @@
+import os, queue, logging, threading, subprocess
+import numpy as np
+import yt_dlp
+from yt_dlp.utils import DownloadError
+from . import chunking
+from .audio import SAMPLE_RATE, ffmpeg_cmd
+
+log = logging.getLogger(__name__)
+_READ_CHUNK = 1 << 18
+
+
+def stream_segment_seconds() -> float:
+    return float(os.getenv('STREAM_SEGMENT_SECONDS', '30'))
+
+
+def resolve_stream(url: str, info: dict = None):
+    """
+    Direct media URL and headers of the best audio format, or None if it is not plain HTTP(S).
+    info from an earlier extract_info with the same format selection is reused.
+    """
+    if info is None:
+        opts = {'format': 'bestaudio/best', 'noplaylist': True, 'quiet': True}
+        try:
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                info = ydl.extract_info(url, download=False)
+        except DownloadError as e:
+            raise ValueError(f'YouTube download failed: {e}')
+    if info.get('protocol') not in ('http', 'https') or not info.get('url'):
+        return None
+    return info['url'], info.get('http_headers') or {}
+
+
+def transcribe_stream(stream, transcribe, timer, segment_s: float = None, overlap_s: float = None) -> str:
+    """
+    Read 16 kHz float32 PCM from stream on a download thread, cut it into
+    segments at silences as it arrives and transcribe each segment on the
+    calling thread while the rest is still downloading.
+    """
+    segment_s = segment_s or stream_segment_seconds()
+    overlap = int((chunking.overlap_seconds() if overlap_s is None else overlap_s) * SAMPLE_RATE)
+    segments, errors = queue.Queue(), []
+
+    def produce():
+        timer.start('download')
+        buf, pending, emitted = np.zeros(0, dtype=np.float32), b'', 0
+        try:
+            while True:
+                chunk = stream.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                pending += chunk
+                usable = len(pending) - len(pending) % 4
+                buf = np.concatenate([buf, np.frombuffer(pending[:usable], dtype=np.float32)])
+                pending = pending[usable:]
+                while (cut := chunking.next_cut(buf, segment_s)) is not None:
+                    segments.put(buf[:cut])
+                    buf = buf[max(0, cut - overlap):]
+                    emitted += 1
+            if len(buf) > overlap or not emitted:
+                segments.put(buf)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            timer.stop('download')
+            segments.put(None)
+
+    producer = threading.Thread(target=produce, name='audio-stream', daemon=True)
+    producer.start()
+    stitcher, count = chunking.Stitcher(), 0
+    while (segment := segments.get()) is not None:
+        with timer.stage('transcribe'):
+            stitcher.add(transcribe(segment))
+        count += 1
+        log.info('Streaming transcript: segment %d (%.0fs audio), %d words so far',
+                 count, len(segment) / SAMPLE_RATE, len(stitcher.words))
+    producer.join()
+    if errors:
+        raise errors[0]
+    return stitcher.text
+
+
+def stream_transcribe(url: str, transcribe, timer, span=None, info: dict = None):
+    """
+    Decode the audio stream with ffmpeg straight from the media URL and
+    transcribe it chunk by chunk. Returns None when the format cannot be
+    streamed so the caller can fall back to a full download.
+    span=(start, end) makes ffmpeg seek and read only that range.
+    """
+    resolved = resolve_stream(url, info)
+    if resolved is None:
+        return None
+    media_url, headers = resolved
+    input_args = ['-headers', ''.join(f'{k}: {v}\r\n' for k, v in headers.items())] if headers else []
+    if span is not None:
+        input_args += ['-ss', f'{span[0]:g}', '-to', f'{span[1]:g}']
+    proc = subprocess.Popen(ffmpeg_cmd(media_url, '-', input_args),
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    killed = False
+    try:
+        text = transcribe_stream(proc.stdout, transcribe, timer)
+        try:
+            proc.wait(timeout=10)  # stdout is at EOF, so ffmpeg is exiting
+        except subprocess.TimeoutExpired:
+            pass
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            killed = True
+        err = proc.stderr.read()
+        proc.wait()
+    # any other failure may have cut the audio short; a partial transcript must not be returned (or cached)
+    if proc.returncode and not killed:
+        raise ValueError(f'Audio stream failed: {err.decode(errors="replace")[:300]}')
+    return text
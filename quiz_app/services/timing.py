@@ -0,0 +1,60 @@
+import time, logging, threading
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """
+    Records when each pipeline stage runs. Stages may run concurrently
+    (download and transcription when streaming); the report compares the
+    summed stage time with the wall time to show how much overlapped.
+    """
+
+    def __init__(self):
+        self.t0 = time.monotonic()
+        self._lock = threading.Lock()
+        self._open = {}
+        self.intervals = {}
+
+    def start(self, name: str):
+        with self._lock:
+            self._open[name] = time.monotonic()
+
+    def stop(self, name: str):
+        with self._lock:
+            started = self._open.pop(name, None)
+            if started is not None:
+                self.intervals.setdefault(name, []).append((started - self.t0, time.monotonic() - self.t0))
+
+    @contextmanager
+    def stage(self, name: str):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.t0
+
+    def report(self) -> dict:
+        stages = {
+            name: round(sum(end - start for start, end in spans), 2)
+            for name, spans in self.intervals.items()
+        }
+        wall = self.elapsed()
+        serial = sum(stages.values())
+        return {
+            'stages': stages,
+            'wall': round(wall, 2),
+            'serial': round(serial, 2),
+            'overlap': round(max(0.0, serial - wall), 2),
+        }
+
+    def log_report(self, prefix: str = 'Pipeline timings'):
+        r = self.report()
+        parts = ' '.join(f'{k}={v:.1f}s' for k, v in r['stages'].items())
+        log.info('%s: %s | wall=%.1fs serial=%.1fs overlap=%.1fs',
+                 prefix, parts, r['wall'], r['serial'], r['overlap'])
+        return r
@@ -0,0 +1,79 @@
+import os, zlib, logging
+from datetime import timedelta
+from django.db.models import F, Sum
+from django.utils import timezone
+from ..models import TranscriptCacheEntry
+from . import counters
+
+log = logging.getLogger(__name__)
+COUNTER = 'transcripts'
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv('TRANSCRIPT_CACHE_MAX_MB', '200')) * 1024 * 1024)
+
+
+def _max_age() -> timedelta:
+    return timedelta(days=float(os.getenv('TRANSCRIPT_CACHE_MAX_AGE_DAYS', '90')))
+
+
+def _fresh(video_key: str, model_name: str):
+    return TranscriptCacheEntry.objects.filter(
+        video_key=video_key, model_name=model_name, created_at__gte=timezone.now() - _max_age())
+
+
+def contains(video_key: str, model_name: str) -> bool:
+    """Whether lookup() would hit, without reading the transcript or counting a lookup."""
+    return _fresh(video_key, model_name).exists()
+
+
+def lookup(video_key: str, model_name: str):
+    """Returns (transcript, source) or (None, None)."""
+    row = (
+        _fresh(video_key, model_name)
+        .values_list('id', 'data', 'source')
+        .first()
+    )
+    counters.record(COUNTER, hit=row is not None)
+    if row is None:
+        return None, None
+    TranscriptCacheEntry.objects.filter(id=row[0]).update(
+        hits=F('hits') + 1, last_used_at=timezone.now())
+    return zlib.decompress(bytes(row[1])).decode('utf-8'), row[2]
+
+
+def store(video_key: str, model_name: str, transcript: str, source: str = ''):
+    data = zlib.compress(transcript.encode('utf-8'), 6)
+    now = timezone.now()
+    TranscriptCacheEntry.objects.update_or_create(
+        video_key=video_key,
+        model_name=model_name,
+        defaults={'data': data, 'size': len(data), 'source': source,
+                  'created_at': now, 'last_used_at': now},
+    )
+    log.info('Transcript cached: %s [%s/%s] %d -> %d bytes',
+             video_key, model_name, source, len(transcript), len(data))
+    evict()
+
+
+def evict() -> int:
+    """
+    Drop entries past the max age, then least recently used entries
+    until the compressed total fits the size budget.
+    """
+    removed, _ = TranscriptCacheEntry.objects.filter(
+        created_at__lt=timezone.now() - _max_age()).delete()
+
+    budget = _max_bytes()
+    total = TranscriptCacheEntry.objects.aggregate(s=Sum('size'))['s'] or 0
+    if total > budget:
+        doomed = []
+        for pk, size in TranscriptCacheEntry.objects.order_by('last_used_at').values_list('id', 'size'):
+            if total <= budget:
+                break
+            doomed.append(pk)
+            total -= size
+        removed += TranscriptCacheEntry.objects.filter(id__in=doomed).delete()[0]
+    if removed:
+        log.info('Transcript cache evicted %d entr(y/ies)', removed)
+    return removed
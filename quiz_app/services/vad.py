@@ -0,0 +1,112 @@
+import os, logging
+import numpy as np
+from .audio import SAMPLE_RATE
+
+log = logging.getLogger(__name__)
+
+_FRAME = SAMPLE_RATE * 30 // 1000  # 30 ms
+_WINDOW = 33  # ~1 s of frames for the modulation check
+
+
+def enabled() -> bool:
+    return os.getenv('VAD_ENABLED', 'true').lower() == 'true'
+
+
+def reject_enabled() -> bool:
+    return os.getenv('VAD_REJECT', 'true').lower() == 'true'
+
+
+def min_speech_ratio() -> float:
+    return float(os.getenv('VAD_MIN_SPEECH_RATIO', '0.1'))
+
+
+def _frame_db(samples: np.ndarray) -> np.ndarray:
+    n = len(samples) // _FRAME
+    frames = np.asarray(samples[:n * _FRAME], dtype=np.float32).reshape(n, _FRAME)
+    return 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+
+
+def _dilate(mask: np.ndarray, radius: int) -> np.ndarray:
+    if radius <= 0 or not mask.any():
+        return mask
+    kernel = np.ones(2 * radius + 1)
+    return np.convolve(mask.astype(np.float32), kernel, mode='same') > 0
+
+
+def speech_mask(samples: np.ndarray, pad_s: float = 0.2) -> np.ndarray:
+    """
+    Per-30 ms-frame speech decision from energy alone. A frame counts as speech
+    when it is well above the noise floor and the surrounding second has the
+    loud/quiet modulation of syllables; steady music, hum or silence fails
+    one of the two tests. Speech regions are padded by pad_s on both sides.
+    """
+    db = _frame_db(samples)
+    if not len(db):
+        return np.zeros(0, dtype=bool)
+    floor = np.percentile(db, 10)
+    loud = db > max(floor + float(os.getenv('VAD_ENERGY_DB', '12')), -55.0)
+
+    # rolling std of the dB envelope over ~1 s
+    pad = _WINDOW // 2
+    padded = np.pad(db, pad, mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, _WINDOW)
+    modulated = windows.std(axis=1) > float(os.getenv('VAD_MIN_MODULATION_DB', '4'))
+
+    return _dilate(loud & modulated, int(pad_s * 1000 / 30))
+
+
+def trim(samples: np.ndarray, mask: np.ndarray = None):
+    """(speech-only samples, speech ratio) with non-speech frames dropped."""
+    mask = speech_mask(samples) if mask is None else mask
+    if not len(mask):
+        return samples[:0], 0.0
+    keep = np.repeat(mask, _FRAME)
+    tail = len(samples) - len(keep)
+    if tail:
+        keep = np.concatenate([keep, np.full(tail, keep[-1])])
+    return np.asarray(samples)[keep], float(mask.mean())
+
+
+class SpeechGate:
+    """
+    Trims non-speech out of audio as it passes through. Once probe_seconds of
+    audio have been seen with too little speech in them it fails fast
+    (VAD_REJECT, on by default), or with reject=False stops trimming and lets
+    Whisper have the rest untouched.
+    """
+
+    def __init__(self, min_ratio: float = None, probe_seconds: float = None, reject: bool = None):
+        self.min_ratio = min_speech_ratio() if min_ratio is None else min_ratio
+        self.probe = int(SAMPLE_RATE * (float(os.getenv('VAD_PROBE_SECONDS', '90'))
+                                        if probe_seconds is None else probe_seconds))
+        self.reject = reject_enabled() if reject is None else reject
+        self.bypass = False
+        self.total = 0
+        self.speech = 0
+
+    @property
+    def ratio(self) -> float:
+        return self.speech / self.total if self.total else 0.0
+
+    def check(self, final: bool = False):
+        if self.bypass or not (final or self.total >= self.probe) or self.ratio >= self.min_ratio:
+            return
+        log.info('VAD: speech ratio %.2f below %.2f after %.0fs of audio',
+                 self.ratio, self.min_ratio, self.total / SAMPLE_RATE)
+        if self.reject:
+            raise ValueError('Video has too little speech; cannot create quiz.')
+        log.warning('VAD: passing the remaining audio to Whisper untrimmed')
+        self.bypass = True
+
+    def __call__(self, samples: np.ndarray, final: bool = False) -> np.ndarray:
+        if self.bypass:
+            return samples
+        trimmed, _ = trim(samples)
+        self.total += len(samples)
+        self.speech += len(trimmed)
+        self.check(final)
+        if self.bypass:
+            return samples
+        log.info('VAD: kept %.0fs of %.0fs (ratio so far %.2f)',
+                 len(trimmed) / SAMPLE_RATE, len(samples) / SAMPLE_RATE, self.ratio)
+        return trimmed
@@ -0,0 +1,19 @@
+from functools import lru_cache
+from yt_dlp.extractor import gen_extractor_classes
+from yt_dlp.extractor.youtube import YoutubeIE
+
+
+@lru_cache(maxsize=1024)
+def resolve_video_key(url: str):
+    """
+    Canonical '<extractor>:<id>' key for a video URL, as yt-dlp would report it,
+    without any network access. Returns None if no specific extractor matches.
+    """
+    if YoutubeIE.suitable(url):
+        return f'youtube:{YoutubeIE.get_temp_id(url)}'
+    for ie in gen_extractor_classes():
+        if ie.ie_key() == 'Generic' or not ie.suitable(url):
+            continue
+        vid = ie.get_temp_id(url)
+        return f'{ie.ie_key().lower()}:{vid}' if vid else None
+    return None
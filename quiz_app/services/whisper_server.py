@@ -0,0 +1,147 @@
+import os, json, time, queue, socket, struct, logging, threading, socketserver
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = '/tmp/quizly-whisper.sock'
+_HEADER = struct.Struct('!I')
+
+
+def socket_path() -> str:
+    return os.getenv('WHISPER_SERVER_SOCKET', DEFAULT_SOCKET)
+
+
+# --- wire format: 4-byte length, JSON header, optional raw payload ---
+def _recv_exact(sock, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError('Whisper server connection closed')
+        buf += chunk
+    return bytes(buf)
+
+
+def _send(sock, header: dict, payload: bytes = b''):
+    head = json.dumps({**header, 'payload_bytes': len(payload)}).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(head)) + head)
+    if payload:
+        sock.sendall(payload)
+
+
+def _recv(sock):
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    header = json.loads(_recv_exact(sock, size))
+    payload = _recv_exact(sock, header.get('payload_bytes', 0))
+    return header, payload
+
+
+# --- server ---
+class WhisperServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Holds one Whisper model for all web workers. Connections are handled on
+    threads, transcriptions run one at a time on a single worker thread.
+    """
+    daemon_threads = True
+
+    def __init__(self, path: str, model, model_name: str = ''):
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o660)
+        self.model = model
+        self.model_name = model_name
+        self.started = time.time()
+        self.jobs = queue.Queue()
+        self.busy = False
+        self.processed = 0
+        self.failed = 0
+        self._worker = threading.Thread(target=self._work, name='whisper-worker', daemon=True)
+        self._worker.start()
+
+    def warm_up(self):
+        t0 = time.time()
+        self.model.transcribe(np.zeros(16000, dtype=np.float32), fp16=False)
+        log.info('Whisper server warm-up done in %.1fs', time.time() - t0)
+
+    def health(self) -> dict:
+        return {
+            'ok': True,
+            'model': self.model_name,
+            'queue_depth': self.jobs.qsize() + int(self.busy),
+            'busy': self.busy,
+            'processed': self.processed,
+            'failed': self.failed,
+            'uptime': round(time.time() - self.started, 1),
+        }
+
+    def submit(self, source) -> dict:
+        done, box = threading.Event(), {}
+        self.jobs.put((source, done, box))
+        done.wait()
+        return box
+
+    def _work(self):
+        while True:
+            source, done, box = self.jobs.get()
+            self.busy = True
+            t0 = time.time()
+            try:
+                result = self.model.transcribe(source, fp16=False, without_timestamps=True)
+                box.update(ok=True, text=result['text'], seconds=round(time.time() - t0, 2))
+                self.processed += 1
+            except Exception as e:
+                log.exception('Whisper server transcription failed')
+                box.update(ok=False, error=str(e))
+                self.failed += 1
+            finally:
+                self.busy = False
+                done.set()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        header, payload = _recv(self.request)
+        op = header.get('op')
+        if op == 'health':
+            _send(self.request, self.server.health())
+        elif op == 'transcribe':
+            source = header.get('path') or np.frombuffer(payload, dtype=np.float32)
+            _send(self.request, self.server.submit(source))
+        else:
+            _send(self.request, {'ok': False, 'error': f'unknown op {op!r}'})
+
+
+# --- client ---
+def _call(header: dict, payload: bytes = b'', timeout: float = None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path())
+        _send(sock, header, payload)
+        response, _ = _recv(sock)
+    return response
+
+
+def health(timeout: float = 5.0) -> dict:
+    return _call({'op': 'health'}, timeout=timeout)
+
+
+def transcribe(source) -> str:
+    """
+    Transcribe a file path (the server must see the same filesystem) or a
+    16 kHz float32 array. Connection problems raise OSError.
+    """
+    timeout = float(os.getenv('WHISPER_SERVER_TIMEOUT', '1800'))
+    if isinstance(source, str):
+        response = _call({'op': 'transcribe', 'path': os.path.abspath(source)}, timeout=timeout)
+    else:
+        pcm = np.ascontiguousarray(source, dtype=np.float32).tobytes()
+        response = _call({'op': 'transcribe'}, pcm, timeout=timeout)
+    if not response.get('ok'):
+        raise RuntimeError(f"Whisper server error: {response.get('error')}")
+    return response['text']
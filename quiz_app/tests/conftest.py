@@ -0,0 +1,83 @@
+import pytest
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.transaction import Atomic
+from rest_framework.test import APIClient
+
+from quiz_app.services import events, service
+
+
+@pytest.fixture(autouse=True)
+def commit_hooks_at_test_level(monkeypatch):
+    """
+    django_db tests run inside atomic blocks that never commit, so
+    transaction.on_commit() callbacks (the events hook) would never run. Run
+    them whenever only the test's own blocks are left open, which is where a
+    real commit would have happened; rolled-back savepoints drop theirs as usual.
+    """
+    def flush(conn):
+        if conn.in_atomic_block and all(getattr(b, "_from_testcase", False) for b in conn.atomic_blocks):
+            while conn.run_on_commit:
+                _, func, _ = conn.run_on_commit.pop(0)
+                func()
+
+    on_commit, atomic_exit = BaseDatabaseWrapper.on_commit, Atomic.__exit__
+
+    def on_commit_then_flush(self, func, robust=False):
+        on_commit(self, func, robust)
+        flush(self)
+
+    def exit_then_flush(self, exc_type, exc_value, traceback):
+        atomic_exit(self, exc_type, exc_value, traceback)
+        flush(connections[self.using or "default"])
+
+    monkeypatch.setattr(BaseDatabaseWrapper, "on_commit", on_commit_then_flush)
+    monkeypatch.setattr(Atomic, "__exit__", exit_then_flush)
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(username="test", password="x")
+
+
+@pytest.fixture
+def client_for():
+    """client_for(user) -> an APIClient authenticated as user."""
+    def make(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+    return make
+
+
+@pytest.fixture
+def api(client_for, user):
+    return client_for(user)
+
+
+@pytest.fixture
+def quiz_data():
+    """quiz_data(n) -> quiz JSON as the LLM returns it, with questions Q0..Q{n-1} unless questions are given."""
+    def make(n=3, title="Cells", description="", questions=None, options=("a", "b", "c", "d")):
+        questions = [f"Q{i}" for i in range(n)] if questions is None else questions
+        return {"title": title, "description": description, "questions": [
+            {"question_title": q, "question_options": list(options), "answer": options[0]} for q in questions
+        ]}
+    return make
+
+
+@pytest.fixture
+def make_quiz(quiz_data):
+    """make_quiz(user, title, ...) -> a quiz saved through the pipeline's _save_quiz, with its events."""
+    def make(user, title="Cells", description="", questions=None, n=3, options=("a", "b", "c", "d"),
+             video_url="https://www.youtube.com/watch?v=abc"):
+        return service._save_quiz(quiz_data(n, title, description, questions, options), user, video_url)
+    return make
+
+
+@pytest.fixture
+def changed_events(monkeypatch):
+    """Quiz id lists of every 'changed' event emitted during the test."""
+    calls = []
+    monkeypatch.setitem(events._listeners, "changed", [*events._listeners["changed"], lambda ids, users: calls.append(ids)])
+    return calls
@@ -0,0 +1,88 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from quiz_app.admin import EstimatedCountPaginator, QuizAdmin
+from quiz_app.models import Question, Quiz, QuizJob
+
+pytestmark = pytest.mark.django_db
+
+
+def seed(user, quizzes, questions=3):
+    for i in range(quizzes):
+        quiz = Quiz.objects.create(user=user, title=f"Quiz {i}", video_url="https://x")
+        Question.objects.bulk_create(
+            Question(quiz=quiz, question_title=f"Q{j}", question_options=["a", "b", "c", "d"], answer="a")
+            for j in range(questions))
+        QuizJob.objects.create(user=user, url="https://x", quiz=quiz)
+
+
+def changelist_queries(client, name, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.get(reverse(f"admin:quiz_app_{name}_changelist"), params)
+    assert res.status_code == 200
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize("name", ["quiz", "question", "quizjob"])
+def test_changelist_queries_do_not_grow_with_rows(admin_client, admin_user, name):
+    seed(admin_user, 2)
+    few = changelist_queries(admin_client, name)
+    seed(admin_user, 20)
+    assert changelist_queries(admin_client, name) == few
+    assert changelist_queries(admin_client, name, q="Quiz") <= few + 1
+
+
+def test_question_counts_are_annotated(admin_client, admin_user):
+    seed(admin_user, 1, questions=4)
+    Quiz.objects.create(user=admin_user, title="Empty", video_url="https://x")
+    res = admin_client.get(reverse("admin:quiz_app_quiz_changelist"), {"o": "4"})  # ordered by question count
+    assert [(quiz.title, quiz._question_count) for quiz in res.context["cl"].result_list] == [("Empty", 0), ("Quiz 0", 4)]
+
+
+def test_autocomplete_filters(admin_client, admin_user, django_user_model):
+    other = django_user_model.objects.create_user(username="other", password="x")
+    seed(admin_user, 2)
+    seed(other, 1)
+    for i in range(30):
+        django_user_model.objects.create_user(username=f"unused{i}", password="x")
+
+    res = admin_client.get(reverse("admin:quiz_app_quiz_changelist"), {"user__id__exact": other.id})
+    html = res.content.decode()
+    assert [quiz.user_id for quiz in res.context["cl"].result_list] == [other.id]
+    assert 'data-field-name="user"' in html and "unused7" not in html  # no full choice list
+    assert f'<option value="{other.id}" selected>other</option>' in html
+
+    quiz = Quiz.objects.get(user=other)
+    res = admin_client.get(reverse("admin:quiz_app_question_changelist"), {"quiz__id__exact": quiz.id})
+    assert {q.quiz_id for q in res.context["cl"].result_list} == {quiz.id}
+    assert 'data-field-name="quiz"' in res.content.decode()
+
+
+def test_counts_are_capped_or_estimated(admin_client, admin_user, monkeypatch):
+    monkeypatch.setattr(EstimatedCountPaginator, "cap", 5)
+    seed(admin_user, 8, questions=0)
+    url = reverse("admin:quiz_app_quiz_changelist")
+    assert admin_client.get(url).context["cl"].result_count == 5  # no statistics yet
+
+    call_command("analyze_db")
+    assert admin_client.get(url).context["cl"].result_count == 8
+    filtered = admin_client.get(url, {"user__id__exact": admin_user.id}).context["cl"]
+    assert filtered.result_count == 5 and filtered.full_result_count is None
+
+
+def test_pages_past_an_estimated_count_are_served(admin_client, admin_user, monkeypatch):
+    monkeypatch.setattr(EstimatedCountPaginator, "cap", 5)
+    monkeypatch.setattr(QuizAdmin, "list_per_page", 2)
+    seed(admin_user, 8, questions=0)
+    url = reverse("admin:quiz_app_quiz_changelist")
+
+    pages = [admin_client.get(url, {"p": p}) for p in (1, 2, 3, 4)]
+    assert all(res.status_code == 200 for res in pages)
+    ids = [q.id for res in pages for q in res.context["cl"].result_list]
+    assert sorted(ids) == sorted(Quiz.objects.values_list("id", flat=True))
+
+    res = admin_client.get(url, {"p": 5})
+    assert res.status_code == 302 and "e=1" in res.url
@@ -0,0 +1,46 @@
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from quiz_app.services import audio, service
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+@pytest.fixture
+def opus_file(tmp_path):
+    path = tmp_path / "tone.webm"
+    subprocess.run(["ffmpeg", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=3",
+                    "-ac", "2", "-ar", "48000", "-c:a", "libopus", str(path)], check=True)
+    return str(path)
+
+
+@needs_ffmpeg
+def test_decode_pcm_gives_16k_mono_float32(opus_file, tmp_path):
+    samples = audio.decode_pcm(opus_file)
+    assert samples.dtype == np.float32
+    assert abs(len(samples) - 3 * audio.SAMPLE_RATE) < audio.SAMPLE_RATE // 10
+    assert 0.05 < float(np.abs(samples).max()) <= 1.0
+
+    mapped = audio.decode_pcm(opus_file, str(tmp_path / "tone.f32"))
+    assert isinstance(mapped, np.memmap)
+    np.testing.assert_array_equal(mapped, samples)
+
+
+@needs_ffmpeg
+def test_decode_pcm_reports_ffmpeg_errors(tmp_path):
+    bogus = tmp_path / "bogus.webm"
+    bogus.write_bytes(b"not audio")
+    with pytest.raises(RuntimeError, match="Failed to decode audio"):
+        audio.decode_pcm(str(bogus))
+
+
+def test_fetch_audio_modes(monkeypatch):
+    monkeypatch.setattr(service, "download_audio_file", lambda url, out, span=None: "legacy.mp3")
+    monkeypatch.setattr(service.audio, "download_pcm", lambda url, out, span=None: "pcm")
+    monkeypatch.setenv("AUDIO_DOWNLOAD_MODE", "mp3")
+    assert service.fetch_audio("u", "d") == "legacy.mp3"
+    monkeypatch.setenv("AUDIO_DOWNLOAD_MODE", "pcm")
+    assert service.fetch_audio("u", "d") == "pcm"
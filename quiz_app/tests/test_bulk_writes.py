@@ -0,0 +1,55 @@
+import pytest
+from django.contrib.admin.sites import site
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from quiz_app.admin import duplicate_quizzes
+from quiz_app.models import Question, Quiz
+from quiz_app.services import service
+
+pytestmark = pytest.mark.django_db
+
+
+def count_queries(fn):
+    with CaptureQueriesContext(connection) as ctx:
+        fn()
+    return len(ctx.captured_queries)
+
+
+def test_save_quiz_query_count_does_not_grow_with_questions(user, quiz_data):
+    small = count_queries(lambda: service._save_quiz(quiz_data(1), user, "https://x"))
+    large = count_queries(lambda: service._save_quiz(quiz_data(50), user, "https://x"))
+    assert small == large <= 9  # savepoint, quiz, questions, release + snapshot (3) + search index (2)
+    quiz = Quiz.objects.latest("id")
+    assert list(quiz.questions.order_by("id").values_list("question_title", flat=True)) == [
+        f"Q{i}" for i in range(50)]
+
+
+def duplicate(queryset):
+    request = RequestFactory().post("/admin/quiz_app/quiz/")
+    request.session = {}
+    request._messages = FallbackStorage(request)
+    duplicate_quizzes(site._registry[Quiz], request, queryset)
+
+
+def test_duplicate_action_uses_bounded_queries(user, quiz_data):
+    for i in range(2):
+        service._save_quiz(quiz_data(3), user, "https://x")
+    two = count_queries(lambda: duplicate(Quiz.objects.all()))
+
+    for i in range(20):
+        service._save_quiz(quiz_data(5), user, "https://x")
+    many = count_queries(lambda: duplicate(Quiz.objects.filter(title="Cells")))
+    assert two == many <= 11  # + snapshot refresh (3) and search index (2) of the copies
+
+
+def test_duplicate_copies_questions_in_order(user, quiz_data):
+    original = service._save_quiz(quiz_data(4), user, "https://x")
+    duplicate(Quiz.objects.filter(id=original.id))
+    copy = Quiz.objects.exclude(id=original.id).get()
+    assert copy.title == "Copy of Cells"
+    assert copy.user_id == user.id and copy.video_url == "https://x"
+    assert list(copy.questions.order_by("id").values_list("question_title", flat=True)) == ["Q0", "Q1", "Q2", "Q3"]
+    assert Question.objects.filter(quiz=original).count() == 4
@@ -0,0 +1,82 @@
+import pytest
+
+from quiz_app.services.timing import StageTimer
+from quiz_app.services import captions, service
+
+AUTO_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.500 align:start position:0%
+welcome<00:00:00.400><c> to</c><00:00:00.800><c> the</c><00:00:01.200><c> lecture</c>
+
+00:00:02.500 --> 00:00:02.510 align:start position:0%
+welcome to the lecture
+ 
+
+00:00:02.510 --> 00:00:05.000 align:start position:0%
+welcome to the lecture
+today<00:00:03.000><c> we</c><00:00:03.400><c> cover</c><00:00:03.800><c> cells &amp; tissues</c>
+"""
+
+SRV3 = """<?xml version="1.0" encoding="utf-8" ?><timedtext format="3"><body>
+<p t="0" d="2000"><s>welcome</s><s t="400"> to</s><s t="800"> the lecture</s></p>
+<p t="2000" d="3000">today we cover cells &amp; tissues</p>
+</body></timedtext>"""
+
+SRV1 = """<?xml version="1.0" encoding="utf-8" ?><transcript>
+<text start="0" dur="2">welcome to the lecture</text>
+<text start="2" dur="3">today we cover cells &amp;amp; tissues</text>
+</transcript>"""
+
+EXPECTED = "welcome to the lecture today we cover cells & tissues"
+
+
+def test_parse_auto_generated_vtt_strips_timing_and_rolling_duplicates():
+    assert captions.parse_vtt(AUTO_VTT) == EXPECTED
+
+
+@pytest.mark.parametrize("xml", [SRV3, SRV1])
+def test_parse_srv(xml):
+    assert captions.parse_srv(xml) == EXPECTED
+
+
+def test_pick_track_prefers_manual_then_original_asr(monkeypatch):
+    info = {
+        "subtitles": {"fr": [{"ext": "vtt", "url": "fr"}]},
+        "automatic_captions": {
+            "en": [{"ext": "vtt", "url": "en-translated"}],
+            "en-orig": [{"ext": "json3", "url": "x"}, {"ext": "srv3", "url": "en-orig"}],
+        },
+    }
+    source, lang, track = captions._pick_track(info, ["en", "de"])
+    assert (source, lang, track["url"]) == ("auto_captions", "en-orig", "en-orig")
+
+    info["subtitles"]["de"] = [{"ext": "srv1", "url": "de-manual"}]
+    assert captions._pick_track(info, ["en", "de"])[0:2] == ("captions", "de")
+    assert captions._pick_track({}, ["en"]) is None
+
+
+@pytest.mark.django_db
+def test_captions_skip_download_and_whisper(monkeypatch, tmp_path):
+    def fail(*args, **kwargs):
+        raise AssertionError("Whisper path should be skipped")
+
+    text = EXPECTED * 10
+    monkeypatch.setattr(service, "fetch_audio", fail)
+    monkeypatch.setattr(service.captions, "fetch_captions", lambda url, info=None, span=None: (text, "captions"))
+
+    result = service.get_transcript("https://youtu.be/dQw4w9WgXcQ", str(tmp_path), lambda n: None, StageTimer())
+    assert result == (text, "captions")
+    assert service.transcripts.lookup("youtube:dQw4w9WgXcQ", service._whisper_model_name()) == (text, "captions")
+
+
+@pytest.mark.django_db
+def test_missing_captions_fall_back_to_whisper(monkeypatch, tmp_path):
+    monkeypatch.setenv("VAD_ENABLED", "false")
+    monkeypatch.setattr(service.captions, "fetch_captions", lambda url, info=None, span=None: (None, None))
+    monkeypatch.setattr(service, "fetch_audio", lambda url, out, span=None: "audio.mp3")
+    monkeypatch.setattr(service, "transcribe_with_whisper", lambda path: "spoken words")
+
+    result = service.get_transcript("https://youtu.be/dQw4w9WgXcQ", str(tmp_path), lambda n: None, StageTimer())
+    assert result == ("spoken words", "whisper")
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from quiz_app.services import chunking
+from quiz_app.services.audio import SAMPLE_RATE
+
+
+def speech_with_pauses(seconds, pauses):
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(seconds * SAMPLE_RATE) * 0.3).astype(np.float32)
+    for at in pauses:
+        samples[int(at * SAMPLE_RATE):int((at + 0.5) * SAMPLE_RATE)] = 0
+    return samples
+
+
+def test_split_cuts_at_nearby_silence_with_overlap():
+    samples = speech_with_pauses(100, pauses=[28, 57, 88])
+    ranges = chunking.split_at_silence(samples, segment_s=30, overlap_s=2, search_s=5)
+
+    assert len(ranges) == 4
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(samples)
+    for (start, cut), pause in zip(ranges, [28, 57, 88]):
+        assert pause <= cut / SAMPLE_RATE <= pause + 0.5
+    for prev, cur in zip(ranges, ranges[1:]):
+        assert cur[0] == prev[1] - 2 * SAMPLE_RATE
+
+
+def test_short_audio_is_one_segment():
+    samples = np.zeros(10 * SAMPLE_RATE, dtype=np.float32)
+    assert chunking.split_at_silence(samples, 30, 2) == [(0, len(samples))]
+
+
+def test_stitch_removes_overlap_duplicates():
+    texts = [
+        "Photosynthesis turns light into chemical energy in the chloroplast.",
+        "in the chloroplast. The light reactions happen in the thylakoid",
+        "ylakoid membrane, while the Calvin cycle runs in the stroma.",
+    ]
+    assert chunking.stitch(texts) == (
+        "Photosynthesis turns light into chemical energy in the chloroplast. "
+        "The light reactions happen in the thylakoid "
+        "ylakoid membrane, while the Calvin cycle runs in the stroma."
+    )
+    assert chunking.stitch(["a b c", "In the beginning"]) == "a b c In the beginning"
+
+
+def test_stitch_allows_partial_word_at_cut():
+    texts = ["we measure the voltage across the resistor", "stor across the resistor and then the current"]
+    assert chunking.stitch(texts) == "we measure the voltage across the resistor and then the current"
+
+
+def test_transcribe_parallel_maps_segments_in_order():
+    samples = speech_with_pauses(100, pauses=[28, 57, 88])
+    with ThreadPoolExecutor(2) as pool:
+        text = chunking.transcribe_parallel(
+            samples, "tiny", workers=2, segment_s=30, overlap_s=0, executor=pool,
+            fn=lambda seg: f"segment of {round(len(seg) / SAMPLE_RATE)} seconds",
+        )
+    assert text.count("segment of") == 4
+    assert text.startswith("segment of 28 seconds")
+
+
+def test_broken_pool_is_rebuilt_and_the_batch_retried(monkeypatch):
+    class Pool:
+        def __init__(self, broken):
+            self.broken, self.shut = broken, False
+
+        def map(self, fn, segments):
+            if self.broken:
+                raise BrokenProcessPool("worker died")
+            return map(fn, segments)
+
+        def shutdown(self, wait=True):
+            self.shut = True
+
+    pools = []
+    monkeypatch.setattr(chunking, "new_pool", lambda workers, model: pools.append(Pool(broken=not pools)) or pools[-1])
+    monkeypatch.setattr(chunking, "_POOL", None)
+    monkeypatch.setattr(chunking, "_POOL_KEY", None)
+
+    text = chunking.transcribe_parallel(np.zeros(10 * SAMPLE_RATE, dtype=np.float32), "tiny", workers=2,
+                                        fn=lambda seg: "recovered")
+
+    assert text == "recovered"
+    assert len(pools) == 2 and pools[0].shut
+    assert chunking.get_pool(2, "tiny") is pools[1]
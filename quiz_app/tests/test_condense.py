@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from quiz_app.services import condense, service
+
+
+def lecture(sentences: int) -> str:
+    return " ".join(f"Fact number {i} is that cells divide by mitosis in stage {i}." for i in range(sentences))
+
+
+def test_split_chunks_keeps_order_and_respects_budget():
+    text = lecture(200)
+    chunks = condense.split_chunks(text, 100)
+    assert len(chunks) > 1
+    assert all(len(c) <= 100 * condense.CHARS_PER_TOKEN for c in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+    unpunctuated = "word " * 5000
+    chunks = condense.split_chunks(unpunctuated, 100)
+    assert all(len(c) <= 400 for c in chunks)
+    assert sum(len(c.split()) for c in chunks) == 5000
+
+
+def test_short_transcript_is_not_condensed():
+    material, report = condense.condense("short text", lambda c: pytest.fail("called"), budget=100)
+    assert material == "short text"
+    assert report["rounds"] == 0 and report["tokens_saved"] == 0
+
+
+def test_long_transcript_is_condensed_in_parallel_in_order(monkeypatch):
+    monkeypatch.setenv("CONDENSE_CHUNK_TOKENS", "500")
+    threads, lock = set(), threading.Lock()
+
+    def extract(chunk):
+        with lock:
+            threads.add(threading.get_ident())
+        time.sleep(0.01)
+        return f"- {chunk.split()[2]}"
+
+    material, report = condense.condense(lecture(400), extract, budget=1000, max_workers=4)
+    facts = [int(line[2:]) for line in material.splitlines()]
+    assert facts == sorted(facts) and facts[0] == 0
+    assert report["calls"] == len(facts) > 1
+    assert report["condensed_tokens"] <= 1000 < report["input_tokens"]
+    assert report["tokens_saved"] == report["input_tokens"] - report["condensed_tokens"]
+    assert len(threads) > 1
+
+
+@pytest.mark.django_db
+def test_generate_quiz_sends_only_condensed_material(monkeypatch):
+    monkeypatch.setenv("GEMINI_INPUT_TOKEN_BUDGET", "500")
+    prompts = []
+    monkeypatch.setattr(service, "extract_key_facts", lambda chunk: "- key fact")
+    monkeypatch.setattr(service, "make_quiz_with_gemini", lambda t, progress=None: prompts.append(t) or {"title": "T", "questions": []})
+
+    service.generate_quiz(lecture(100))
+    assert prompts[-1].splitlines() == ["- key fact"] * len(prompts[-1].splitlines())
+
+    service.generate_quiz("Short lecture. " * 10)
+    assert prompts[-1] == "Short lecture. " * 10
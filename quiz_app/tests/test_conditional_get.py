@@ -0,0 +1,62 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from quiz_app.models import Question, Quiz
+
+pytestmark = pytest.mark.django_db
+
+
+def etag(api, url):
+    res = api.get(url)
+    assert res.status_code == status.HTTP_200_OK
+    return res["ETag"]
+
+
+def test_list_304_costs_one_query(api, user, django_assert_num_queries, make_quiz):
+    make_quiz(user)
+    url = reverse("quiz-list")
+    tag = etag(api, url)
+    with django_assert_num_queries(1):
+        res = api.get(url, HTTP_IF_NONE_MATCH=tag)
+    assert res.status_code == status.HTTP_304_NOT_MODIFIED
+    assert res["ETag"] == tag
+    assert etag(api, url + "?view=summary") != tag
+
+
+def test_list_etag_moves_on_create_patch_and_delete(api, user, make_quiz):
+    quiz = make_quiz(user)
+    url = reverse("quiz-list")
+    seen = {etag(api, url)}
+
+    other = make_quiz(user)
+    seen.add(etag(api, url))
+    api.patch(reverse("quiz-detail", kwargs={"id": quiz.id}), {"title": "Renamed"}, format="json")
+    seen.add(etag(api, url))
+    api.delete(reverse("quiz-detail", kwargs={"id": other.id}))
+    seen.add(etag(api, url))
+    Question.objects.filter(quiz=quiz).first().delete()
+    seen.add(etag(api, url))
+    assert len(seen) == 5
+
+
+def test_detail_last_modified_and_question_edits(api, user, make_quiz):
+    quiz = make_quiz(user)
+    url = reverse("quiz-detail", kwargs={"id": quiz.id})
+    res = api.get(url)
+    assert res["Last-Modified"]
+    assert api.get(url, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"]).status_code == status.HTTP_304_NOT_MODIFIED
+    assert api.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == status.HTTP_304_NOT_MODIFIED
+
+    q = quiz.questions.first()
+    q.answer = "b"
+    q.save()
+    assert api.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == status.HTTP_200_OK
+
+
+def test_no_304_for_someone_elses_quiz(api, django_user_model, make_quiz):
+    owner = django_user_model.objects.create_user(username="owner", password="x")
+    quiz = make_quiz(owner)
+    res = api.get(reverse("quiz-detail", kwargs={"id": quiz.id}), HTTP_IF_NONE_MATCH="*")
+    assert res.status_code == status.HTTP_403_FORBIDDEN
+    assert Quiz.objects.filter(id=quiz.id).exists()
@@ -0,0 +1,75 @@
+import datetime
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from quiz_app.api.renderers import ORJSONRenderer
+from quiz_app.models import Question, Quiz
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def quizzes(user):
+    for i in range(7):
+        quiz = Quiz.objects.create(user=user, title=f"Zellen {i} \u2028 ü 🧬", description='"quoted" \\ \n', video_url="https://x")
+        Question.objects.bulk_create(
+            Question(quiz=quiz, question_title=f"Q{j} \u2029", question_options=["a", "ß", None, 1], answer="a")
+            for j in range(i % 3))
+    # a stamp without microseconds formats differently
+    Quiz.objects.filter(title__startswith="Zellen 3").update(created_at=datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc))
+
+
+def stdlib_bytes(api, url, monkeypatch):
+    """The response as the ModelSerializers and DRF's JSONRenderer would have produced it."""
+    monkeypatch.setenv("FAST_SERIALIZERS_ENABLED", "false")
+    res = api.get(url)
+    monkeypatch.delenv("FAST_SERIALIZERS_ENABLED")
+    return JSONRenderer().render(res.data)
+
+
+@pytest.mark.parametrize("query", [
+    "", "?view=summary", "?fields=id,questions,updated_at", "?view=summary&fields=question_count,title",
+    "?page_size=3", "?view=summary&page_size=2",
+])
+def test_fast_list_is_byte_identical(api, quizzes, monkeypatch, query):
+    url = reverse("quiz-list") + query
+    expected = stdlib_bytes(api, url, monkeypatch)
+    res = api.get(url)
+    assert res.status_code == status.HTTP_200_OK
+    assert res.content == expected
+    assert b"\xe2\x80\xa8" not in expected and b"\xe2\x80\xa9" not in expected
+
+
+def test_fast_list_follows_cursor(api, quizzes):
+    first = api.get(reverse("quiz-list") + "?page_size=4").json()
+    second = api.get(first["next"]).json()
+    assert len(first["results"]) == 4 and len(second["results"]) == 3 and second["next"] is None
+
+
+def test_unknown_field_is_still_400(api, quizzes):
+    res = api.get(reverse("quiz-list") + "?fields=id,secret")
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+    assert "secret" in str(res.json()["fields"])
+
+
+def test_renderer_matches_stdlib_renderer():
+    data = {
+        "when": timezone.now(), "day": datetime.date(2024, 1, 2), "nested": [{"k": 1.5, 2: None}],
+        "text": "line\u2028sep\u2029 ✓", "big": 2 ** 70,
+    }
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert ORJSONRenderer().render(data, "application/json; indent=2") == JSONRenderer().render(data, "application/json; indent=2")
+
+
+def test_parser_accepts_json_and_reports_errors(api, user):
+    quiz = Quiz.objects.create(user=user, title="Old", video_url="https://x")
+    url = reverse("quiz-detail", kwargs={"id": quiz.id})
+    res = api.patch(url, '{"title": "Neu ü"}', content_type="application/json")
+    assert res.status_code == status.HTTP_200_OK and res.json()["title"] == "Neu ü"
+
+    res = api.patch(url, '{"title": ', content_type="application/json")
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+    assert res.json()["detail"].startswith("JSON parse error")
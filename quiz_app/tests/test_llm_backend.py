@@ -0,0 +1,101 @@
+import json
+import time
+
+import pytest
+
+from quiz_app.services import llm, service
+
+TRANSCRIPT = ("Mitochondria produce most of the energy in a cell. Ribosomes assemble proteins from amino acids. "
+              "The nucleus stores genetic information as DNA. Chloroplasts convert sunlight into chemical energy.")
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setenv("LLM_RETRY_BASE_SECONDS", "0")
+    monkeypatch.setenv("LLM_MAX_ATTEMPTS", "3")
+
+
+class Scripted(llm.Backend):
+    name = model = "scripted"
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def generate(self, prompt, schema=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, float):
+            time.sleep(outcome)
+            return "{}"
+        return outcome
+
+
+def test_fake_backend_is_deterministic_and_valid():
+    fake = llm.FakeBackend(latency=0)
+    prompt = service.QUIZ_PROMPT.format(transcript=TRANSCRIPT)
+    first = fake.generate(prompt, llm.QUIZ_SCHEMA)
+    assert first == fake.generate(prompt, llm.QUIZ_SCHEMA)
+    quiz = json.loads(first)
+    service.validate_quiz(quiz)
+    assert len(quiz["questions"]) == 10
+    assert json.loads(fake.generate(service.QUIZ_PROMPT.format(transcript="la la"), llm.QUIZ_SCHEMA)) == {
+        "error": "insufficient_content"}
+
+
+def test_malformed_output_is_retried_then_parsed():
+    backend = Scripted("not json", '{"questions": []}', '{"error": "insufficient_content"}')
+    data = llm.generate_json("p", validate=service.validate_quiz, backend=backend, breaker=llm.CircuitBreaker(5, 60))
+    assert data == {"error": "insufficient_content"}
+    assert backend.calls == 3
+
+
+def test_deadline_and_transient_errors_exhaust_retries(monkeypatch):
+    monkeypatch.setenv("LLM_TIMEOUT_SECONDS", "0.05")
+    backend = Scripted(0.5, ConnectionError("reset"), 0.5)
+    t0 = time.monotonic()
+    with pytest.raises(llm.LLMError, match="3 attempt"):
+        llm.call("p", backend=backend, breaker=llm.CircuitBreaker(10, 60))
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_non_transient_error_is_not_retried():
+    backend = Scripted(KeyError("bug"), "never")
+    with pytest.raises(KeyError):
+        llm.call("p", backend=backend, breaker=llm.CircuitBreaker(5, 60))
+    assert backend.calls == 1
+
+
+def test_circuit_breaker_opens_then_half_opens():
+    breaker = llm.CircuitBreaker(threshold=2, reset_seconds=0.05)
+    backend = Scripted(*[ConnectionError("down")] * 2, "ok", "again")
+    with pytest.raises(llm.LLMError):
+        llm.call("p", backend=backend, breaker=breaker)
+    assert breaker.state == "open" and backend.calls == 2
+
+    with pytest.raises(llm.CircuitOpen):
+        llm.call("p", backend=backend, breaker=breaker)
+    assert backend.calls == 2
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert llm.call("p", backend=backend, breaker=breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_backoff_uses_full_jitter_with_cap(monkeypatch):
+    monkeypatch.setenv("LLM_RETRY_BASE_SECONDS", "1")
+    monkeypatch.setenv("LLM_RETRY_MAX_SECONDS", "5")
+    delays = [llm.backoff(10) for _ in range(200)]
+    assert all(0 <= d <= 5 for d in delays)
+    assert len(set(delays)) > 100
+
+
+@pytest.mark.django_db
+def test_pipeline_runs_offline_on_fake_backend(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    quiz = service.generate_quiz(TRANSCRIPT)
+    assert len(quiz["questions"]) == 10
+    assert service._llm_model_name() == "fake"
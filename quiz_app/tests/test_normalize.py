@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from quiz_app.services import normalize, service
+
+
+def test_fillers_annotations_and_whitespace():
+    text = "[Music]  So, umm, the cell   uh divides. Ähm, das ist  er. Hmm...\n\nUmbrella and humm stay."
+    assert normalize.normalize(text) == "So, the cell divides. das ist er. Hmm... Umbrella and humm stay."
+
+
+def test_german_um_is_not_a_filler():
+    text = "Um drei Uhr geht es um die Zellteilung, ähm, ummm, um zu verstehen, warum."
+    assert normalize.normalize(text) == "Um drei Uhr geht es um die Zellteilung, um zu verstehen, warum."
+
+
+def test_repeated_sentences_and_phrase_loops_collapse():
+    text = ("Mitosis has four phases. Mitosis has four phases! "
+            "Thank you. Thank you. Thank you. Thank you. "
+            "the the the the end, very very good.")
+    assert normalize.normalize(text) == "Mitosis has four phases. Thank you. the end, very very good."
+
+
+def test_long_loop_is_cut_to_one_copy():
+    words = "we will see you in the next video".split()
+    assert normalize.collapse_loops(words * 50 + ["bye"]) == words + ["bye"]
+
+
+@pytest.mark.parametrize("unit", ["lorem ipsum dolor sit amet consectetur ", "la "])
+def test_normalize_is_linear_on_large_inputs(unit):
+    def timed(repeats):
+        text = "".join(f"{unit}{i}. " for i in range(repeats))
+        t0 = time.perf_counter()
+        normalize.normalize(text)
+        return time.perf_counter() - t0
+
+    small, large = timed(10000), timed(40000)
+    assert large < 8 * small + 0.5
+
+
+def test_looping_whisper_output_of_a_million_words_is_fast():
+    text = "and so on " * 300000 + "the end."
+    t0 = time.perf_counter()
+    assert normalize.normalize(text) == "and so on the end."
+    assert time.perf_counter() - t0 < 10
+
+
+@pytest.mark.django_db
+def test_pipeline_sends_normalized_transcript(monkeypatch):
+    raw = "Um, photosynthesis turns light into sugar. " * 3 + "Chlorophyll absorbs red and blue light. " * 4
+    monkeypatch.setattr(service, "get_transcript", lambda *a: (raw, "whisper"))
+    seen = []
+    monkeypatch.setattr(service, "generate_quiz", lambda t, fresh=False, **kw: seen.append(t) or {"questions": []})
+    with pytest.raises(ValueError, match="too short"):
+        service.build_quiz_data("https://youtu.be/x", lambda name: None)
+    assert not seen
+
+    monkeypatch.setenv("NORMALIZE_TRANSCRIPT", "false")
+    service.build_quiz_data("https://youtu.be/x", lambda name: None)
+    assert seen == [raw]
@@ -0,0 +1,102 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from quiz_app.models import Quiz, QuizJob
+from quiz_app.services import audio, captions, preflight, service, transcripts
+from quiz_app.api import views
+
+URL = "https://www.youtube.com/watch?v=abc"
+CAPTIONS = {"subtitles": {"en": [{"ext": "vtt", "url": "x"}]}}
+
+
+@pytest.fixture(autouse=True)
+def no_inprocess_workers(monkeypatch):
+    monkeypatch.setenv("QUIZ_JOB_INPROCESS_WORKERS", "0")
+
+
+@pytest.mark.parametrize("info, message", [
+    ({"live_status": "is_live"}, "Live"),
+    ({"live_status": "is_upcoming"}, "Live"),
+    ({"age_limit": 18}, "Age-restricted"),
+    ({"availability": "needs_auth"}, "not publicly"),
+    ({"duration": 5 * 3600}, "limit"),
+])
+def test_admit_rejects_before_download(info, message):
+    with pytest.raises(ValueError, match=message):
+        preflight.admit(URL, info={"id": "abc", **info})
+
+
+def test_span_admits_part_of_a_long_video():
+    info = {"id": "abc", "duration": 5 * 3600}
+    admission = preflight.admit(URL, span=(4 * 3600, 10 ** 6), info=info)
+    assert admission.span == (4 * 3600, 5 * 3600)
+    assert admission.duration == 3600
+    with pytest.raises(ValueError, match="beyond the end"):
+        preflight.admit(URL, span=(6 * 3600, 7 * 3600), info=info)
+
+
+def test_estimate_is_cheap_with_captions_and_scales_without(monkeypatch):
+    monkeypatch.setenv("PREFLIGHT_WHISPER_RTF", "0.5")
+    monkeypatch.setenv("QUIZ_SYNC_MAX_ESTIMATE_SECONDS", "120")
+    with_captions = preflight.admit(URL, info={"duration": 1800, **CAPTIONS})
+    without = preflight.admit(URL, info={"duration": 1800})
+    assert with_captions.has_captions and not with_captions.needs_queue
+    assert without.estimate == 1800 * 0.5 + 20
+    assert without.needs_queue
+
+    monkeypatch.setenv("PREFLIGHT_MAX_ESTIMATE_SECONDS", "600")
+    with pytest.raises(ValueError, match="too long to process"):
+        preflight.admit(URL, info={"duration": 1800})
+
+
+@pytest.mark.django_db
+def test_expensive_sync_request_is_queued_with_its_span(api, user, monkeypatch):
+    monkeypatch.setattr(preflight, "probe", lambda url: {"id": "abc", "duration": 7200})
+    monkeypatch.setattr(views, "create_quiz_from_url", lambda *a, **kw: pytest.fail("ran inline"))
+    res = api.post(reverse("create_quiz"), {"url": URL, "start": 60, "end": 3660}, format="json")
+    assert res.status_code == status.HTTP_202_ACCEPTED
+    assert QuizJob.objects.get(user=user).options == {"fresh": False, "span": [60, 3660]}
+
+
+@pytest.mark.django_db
+def test_explicit_sync_request_is_not_queued(api, monkeypatch):
+    monkeypatch.setattr(preflight, "probe", lambda url: {"id": "abc", "duration": 600})
+    monkeypatch.setattr(views, "create_quiz_from_url", lambda *a, **kw: pytest.fail("ran inline"))
+    res = api.post(reverse("create_quiz"), {"url": URL, "mode": "sync"}, format="json")
+    assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "mode" in res.data["detail"]
+    assert not QuizJob.objects.exists()
+
+
+@pytest.mark.django_db
+def test_cached_transcript_skips_preflight(api, user, monkeypatch):
+    transcripts.store(service.resolve_video_key(URL), service._whisper_model_name(), "cached text", "whisper")
+    monkeypatch.setattr(preflight, "probe", lambda url: pytest.fail("probed a cached video"))
+    monkeypatch.setattr(views, "create_quiz_from_url",
+                        lambda u, url, **kw: Quiz.objects.create(user=u, title="Cached", video_url=url))
+    res = api.post(reverse("create_quiz"), {"url": URL, "mode": "sync"}, format="json")
+    assert res.status_code == status.HTTP_201_CREATED
+    assert not QuizJob.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rejected_video_returns_400_without_job(api, monkeypatch):
+    monkeypatch.setattr(preflight, "probe", lambda url: {"id": "abc", "live_status": "is_live"})
+    res = api.post(reverse("create_quiz"), {"url": URL, "mode": "job"}, format="json")
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+    assert not QuizJob.objects.exists()
+
+    res = api.post(reverse("create_quiz"), {"url": URL, "start": 30}, format="json")
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+    assert "end" in res.data
+
+
+def test_span_limits_captions_download_and_cache_key():
+    vtt = "WEBVTT\n\n00:00:01.000 --> 00:00:02.000\nintro\n\n00:01:05.000 --> 00:01:07.000\nmiddle\n"
+    assert captions.parse_vtt(vtt, span=(60, 120)) == "middle"
+    assert captions.parse_srv('<transcript><text start="1">a</text><text start="70">b</text></transcript>',
+                              span=(60, 120)) == "b"
+    assert audio.range_opts(None) == {}
+    assert "download_ranges" in audio.range_opts((60, 120))
+    assert service._span_key("youtube:abc", (60, 120.5)) == "youtube:abc@60-120.5"
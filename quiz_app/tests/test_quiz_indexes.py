@@ -0,0 +1,57 @@
+import importlib
+
+import pytest
+from django.apps import apps
+from django.db import connection
+
+from quiz_app.api.pagination import QuizCursorPagination
+from quiz_app.models import Question, Quiz
+
+pytestmark = pytest.mark.django_db
+sqlite_only = pytest.mark.skipif(connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN output is SQLite's")
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def plan(queryset) -> str:
+    return queryset.explain()
+
+
+@sqlite_only
+def test_list_query_uses_user_created_index(user):
+    qs = Quiz.objects.filter(user=user).order_by("-created_at", "-id")
+    p = plan(qs)
+    assert "quiz_user_created_idx" in p
+    assert "SCAN" not in p and "TEMP B-TREE" not in p
+
+    quiz = Quiz.objects.create(user=user, title="t", video_url=URL)
+    cursor = QuizCursorPagination().encode_cursor(quiz)
+    created_at, pk = QuizCursorPagination().decode_cursor(cursor)
+    page = qs.filter(created_at__lt=created_at) | qs.filter(created_at=created_at, id__lt=pk)
+    assert "quiz_user_created_idx" in plan(page.order_by("-created_at", "-id"))
+
+
+@sqlite_only
+def test_video_detail_and_admin_lookups_use_indexes(user):
+    assert "quiz_video_created_idx" in plan(Quiz.objects.filter(video_id="youtube:x").order_by("-created_at"))
+    p = plan(Question.objects.filter(quiz_id=1).order_by("id"))
+    assert "question_quiz_id_idx" in p and "TEMP B-TREE" not in p
+    p = plan(Quiz.objects.order_by("-created_at", "-id"))
+    assert "quiz_created_idx" in p and "TEMP B-TREE" not in p
+
+
+def test_video_id_follows_video_url(user):
+    quiz = Quiz.objects.create(user=user, title="t", video_url=URL)
+    assert quiz.video_id == "youtube:dQw4w9WgXcQ"
+
+    quiz.video_url = "https://example.com/page"
+    quiz.save(update_fields=["video_url"])
+    assert Quiz.objects.get(id=quiz.id).video_id == ""
+
+
+def test_migration_backfills_existing_rows(user):
+    quiz = Quiz.objects.create(user=user, title="t", video_url="https://youtu.be/dQw4w9WgXcQ")
+    Quiz.objects.update(video_id="")
+    migration = importlib.import_module("quiz_app.migrations.0008_quiz_video_id_and_indexes")
+    migration.backfill_video_id(apps, None)
+    assert Quiz.objects.get(id=quiz.id).video_id == "youtube:dQw4w9WgXcQ"
@@ -0,0 +1,117 @@
+import datetime
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+from quiz_app.models import ImportCheckpoint, Question, Quiz
+from quiz_app.services import quiz_io, search, service
+
+pytestmark = pytest.mark.django_db
+
+
+def make_quizzes(user, n):
+    for i in range(n):
+        service._save_quiz({"title": f"Quiz {i} Ä", "questions": [
+            {"question_title": f"Q{i}.{j}", "question_options": ["a", "b", "c", "ü"], "answer": "a"} for j in range(2)
+        ]}, user, "https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    Quiz.objects.filter(title="Quiz 0 Ä").update(created_at=datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc))
+
+
+def export(tmp_path, **options):
+    path = tmp_path / "quizzes.ndjson"
+    call_command("export_quizzes", output=str(path), **options)
+    return path
+
+
+def test_export_streams_in_bounded_queries(user, django_assert_max_num_queries):
+    make_quizzes(user, 7)
+    with django_assert_max_num_queries(9):  # 2 per chunk of 2 quizzes + the empty last read
+        lines = list(quiz_io.export_lines(Quiz.objects.all(), chunk_size=2))
+    records = [json.loads(line) for line in lines]
+    assert [r["title"] for r in records] == [f"Quiz {i} Ä" for i in range(7)]
+    assert records[0]["questions"][1]["question_options"] == ["a", "b", "c", "ü"]
+    assert all(line.endswith(b"\n") and line.count(b"\n") == 1 for line in lines)
+
+
+def test_admin_action_streams_ndjson(admin_client, user):
+    make_quizzes(user, 3)
+    res = admin_client.post(reverse("admin:quiz_app_quiz_changelist"), {
+        "action": "export_quizzes_as_ndjson", "_selected_action": list(Quiz.objects.values_list("id", flat=True)),
+    })
+    assert res.streaming and res["Content-Type"] == "application/x-ndjson"
+    assert len(b"".join(res.streaming_content).splitlines()) == 3
+
+
+def test_admin_json_export_is_kept(admin_client, user):
+    make_quizzes(user, 3)
+    res = admin_client.post(reverse("admin:quiz_app_quiz_changelist"), {
+        "action": "export_quizzes_as_json", "_selected_action": list(Quiz.objects.values_list("id", flat=True)),
+    })
+    assert res["Content-Disposition"] == "attachment; filename=quizzes.json"
+    records = json.loads(b"".join(res.streaming_content))
+    assert [r["title"] for r in records] == [f"Quiz {i} Ä" for i in range(3)]
+    assert records[0]["questions"][0]["question_options"] == ["a", "b", "c", "ü"]
+    assert json.loads(b"".join(quiz_io.export_json_array(Quiz.objects.none()))) == []
+
+
+def test_round_trip_into_another_user(user, django_user_model, tmp_path):
+    make_quizzes(user, 5)
+    path = export(tmp_path)
+    target = django_user_model.objects.create_user(username="target", password="x")
+    call_command("import_quizzes", str(path), user="target", batch_size=2)
+
+    imported = Quiz.objects.filter(user=target).order_by("id")
+    assert imported.count() == 5 and Question.objects.filter(quiz__user=target).count() == 10
+    first = imported.first()
+    assert first.title == "Quiz 0 Ä" and first.created_at == datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    assert first.video_id == Quiz.objects.filter(user=user).first().video_id != ""
+    assert len(search.search("quiz", user_id=target.id)) == 5  # events ran for every batch
+
+
+def test_interrupted_import_resumes_without_duplicates(user, tmp_path, monkeypatch):
+    make_quizzes(user, 5)
+    path = export(tmp_path)
+    Quiz.objects.all().delete()
+    real_insert, calls = quiz_io._insert, []
+
+    def flaky_insert(records, user_for):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return real_insert(records, user_for)
+
+    monkeypatch.setattr(quiz_io, "_insert", flaky_insert)
+    with pytest.raises(KeyboardInterrupt):
+        call_command("import_quizzes", str(path), batch_size=2)
+    checkpoint = ImportCheckpoint.objects.get()
+    assert (checkpoint.lines, checkpoint.quizzes, Quiz.objects.count()) == (2, 2, 2)
+
+    call_command("import_quizzes", str(path), batch_size=2)
+    assert sorted(Quiz.objects.values_list("title", flat=True)) == [f"Quiz {i} Ä" for i in range(5)]
+    checkpoint.refresh_from_db()
+    assert checkpoint.finished_at is not None and checkpoint.offset == path.stat().st_size
+
+    call_command("import_quizzes", str(path))  # finished: nothing to do
+    assert Quiz.objects.count() == 5
+    call_command("import_quizzes", str(path), restart=True)
+    assert Quiz.objects.count() == 10
+
+
+def test_bad_line_stops_after_committed_batches(user, tmp_path):
+    path = tmp_path / "bad.ndjson"
+    path.write_text('{"title": "ok", "user_id": %d, "questions": []}\n\n{"title": 1}\n' % user.id)
+    with pytest.raises(CommandError, match="line 3"):
+        call_command("import_quizzes", str(path), batch_size=1)
+    assert Quiz.objects.filter(title="ok").count() == 1
+
+    for bad, message in (('"questions": [1]', "question 1 must be an object"),
+                         ('"questions": [{"question_options": "abc"}]', "question_options must be a list")):
+        path.write_text('{"title": "q", "user_id": %d, %s}\n' % (user.id, bad))
+        with pytest.raises(CommandError, match=message):
+            call_command("import_quizzes", str(path), restart=True)
+
+    path.write_text('{"title": "orphan", "user_id": 999999}\n')
+    with pytest.raises(CommandError, match="does not exist"):
+        call_command("import_quizzes", str(path), restart=True)
@@ -0,0 +1,63 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from quiz_app.models import Quiz, QuizJob
+from quiz_app.services import jobs
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def no_inprocess_workers(monkeypatch):
+    monkeypatch.setenv("QUIZ_JOB_INPROCESS_WORKERS", "0")
+    monkeypatch.setenv("PREFLIGHT_ENABLED", "false")
+
+
+def fake_pipeline(user, url, on_stage=None, **options):
+    for name in ("download", "transcribe", "generate", "save"):
+        on_stage(name)
+    return Quiz.objects.create(user=user, title="Quiz", video_url=url)
+
+
+def test_create_quiz_job_mode_returns_202(api, user):
+    res = api.post(reverse("create_quiz"), {
+        "url": "https://www.youtube.com/watch?v=abc", "mode": "job"}, format="json")
+    assert res.status_code == status.HTTP_202_ACCEPTED
+    assert res.data["state"] == "queued"
+    assert res["Location"] == reverse("quiz-job-detail", kwargs={"id": res.data["id"]})
+    assert QuizJob.objects.filter(user=user).count() == 1
+
+
+def test_worker_runs_job_and_status_reports_quiz(api, user, monkeypatch):
+    monkeypatch.setattr(jobs.service, "create_quiz_from_url", fake_pipeline)
+    job = jobs.enqueue_quiz_job(user, "https://www.youtube.com/watch?v=abc")
+
+    claimed = jobs.claim_next_job()
+    assert claimed.id == job.id
+    assert jobs.claim_next_job() is None
+    jobs.run_job(claimed)
+
+    res = api.get(reverse("quiz-job-detail", kwargs={"id": job.id}))
+    assert res.status_code == status.HTTP_200_OK
+    assert res.data["state"] == "succeeded"
+    assert res.data["stage"] == "done"
+    assert res.data["quiz_id"] == Quiz.objects.get(user=user).id
+
+
+def test_failed_job_reports_error(user, monkeypatch):
+    def boom(*args, **kwargs):
+        raise ValueError("Video not instructional; cannot create quiz.")
+
+    monkeypatch.setattr(jobs.service, "create_quiz_from_url", boom)
+    jobs.enqueue_quiz_job(user, "https://www.youtube.com/watch?v=abc")
+    job = jobs.run_job(jobs.claim_next_job())
+    assert job.state == QuizJob.State.FAILED
+    assert job.error == "Video not instructional; cannot create quiz."
+
+
+def test_job_status_is_owner_only(api, django_user_model):
+    other = django_user_model.objects.create_user(username="other", password="Test1234")
+    job = QuizJob.objects.create(user=other, url="https://www.youtube.com/watch?v=abc")
+    res = api.get(reverse("quiz-job-detail", kwargs={"id": job.id}))
+    assert res.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,65 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from quiz_app.models import Question, Quiz
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def quizzes(user, django_user_model):
+    other = django_user_model.objects.create_user(username="other", password="x")
+    Quiz.objects.create(user=other, title="not mine")
+    made = []
+    for i in range(25):
+        quiz = Quiz.objects.create(user=user, title=f"Quiz {i}", video_url="https://x")
+        Question.objects.bulk_create(
+            Question(quiz=quiz, question_title=f"Q{j}", question_options=["a", "b", "c", "d"], answer="a")
+            for j in range(i % 3))
+        made.append(quiz)
+    # half of them share one timestamp so the id tie-break matters
+    Quiz.objects.filter(id__in=[q.id for q in made[5:18]]).update(created_at=timezone.now())
+    return made
+
+
+def test_default_list_is_unpaginated_with_questions(api, quizzes):
+    res = api.get(reverse("quiz-list"))
+    assert isinstance(res.data, list) and len(res.data) == 25
+    assert "questions" in res.data[0]
+
+
+def test_cursor_pages_cover_every_quiz_once_in_order(api, quizzes):
+    expected = list(Quiz.objects.filter(user=quizzes[0].user).order_by("-created_at", "-id").values_list("id", flat=True))
+    seen, url, pages = [], reverse("quiz-list") + "?page_size=10&view=summary", 0
+    while url:
+        res = api.get(url)
+        assert res.status_code == status.HTTP_200_OK
+        seen += [row["id"] for row in res.data["results"]]
+        url, pages = res.data["next"], pages + 1
+    assert seen == expected
+    assert pages == 3
+
+
+def test_invalid_cursor_is_404(api, quizzes):
+    res = api.get(reverse("quiz-list") + "?cursor=bm9wZQ")
+    assert res.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_summary_counts_questions_in_one_query(api, quizzes, django_assert_num_queries):
+    with django_assert_num_queries(2):  # ETag aggregate + the annotated list
+        res = api.get(reverse("quiz-list") + "?view=summary")
+    counts = {row["title"]: row["question_count"] for row in res.data}
+    assert counts["Quiz 4"] == 1 and counts["Quiz 5"] == 2 and counts["Quiz 6"] == 0
+    assert "questions" not in res.data[0]
+
+
+def test_sparse_fields(api, quizzes, django_assert_num_queries):
+    with django_assert_num_queries(2):  # ETag aggregate + one page, no questions prefetch
+        res = api.get(reverse("quiz-list") + "?fields=id,title&page_size=5")
+    assert [set(row) for row in res.data["results"]] == [{"id", "title"}] * 5
+
+    res = api.get(reverse("quiz-list") + "?fields=id,secret")
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
+    assert "secret" in str(res.data["fields"])
@@ -0,0 +1,65 @@
+import pytest
+
+from quiz_app.models import QuizResponseCacheEntry
+from quiz_app.services import quiz_cache, service
+
+pytestmark = pytest.mark.django_db
+
+QUIZ = {"title": "Photosynthesis", "description": "Light reactions.", "questions": []}
+
+
+@pytest.fixture
+def gemini_calls(monkeypatch):
+    calls = []
+
+    def fake(transcript, progress=None):
+        calls.append(transcript)
+        return dict(QUIZ)
+
+    monkeypatch.setattr(service, "make_quiz_with_gemini", fake)
+    return calls
+
+
+def test_key_ignores_whitespace_but_not_model_or_prompt_version():
+    key = quiz_cache.make_key("some  text\n here", "gemini-2.5-flash", 1)
+    assert key == quiz_cache.make_key("some text here", "gemini-2.5-flash", 1)
+    assert key != quiz_cache.make_key("some text here", "gemini-2.5-pro", 1)
+    assert key != quiz_cache.make_key("some text here", "gemini-2.5-flash", 2)
+
+
+def test_repeat_transcript_reuses_cached_quiz(gemini_calls):
+    assert service.generate_quiz("the same transcript") == QUIZ
+    assert service.generate_quiz("the  same transcript ") == QUIZ
+    assert len(gemini_calls) == 1
+
+
+def test_fresh_bypasses_cache(gemini_calls):
+    service.generate_quiz("the same transcript")
+    service.generate_quiz("the same transcript", fresh=True)
+    assert len(gemini_calls) == 2
+
+
+def test_error_responses_are_not_cached(monkeypatch):
+    monkeypatch.setattr(service, "make_quiz_with_gemini", lambda t, progress=None: {"error": "insufficient_content"})
+    service.generate_quiz("la la la")
+    assert not QuizResponseCacheEntry.objects.exists()
+
+
+def test_lru_eviction_keeps_recently_used(monkeypatch):
+    monkeypatch.setenv("QUIZ_RESPONSE_CACHE_MAX_ENTRIES", "2")
+    quiz_cache.store("a", QUIZ)
+    quiz_cache.store("b", QUIZ)
+    quiz_cache.lookup("a")
+    quiz_cache.store("c", QUIZ)
+    assert set(QuizResponseCacheEntry.objects.values_list("key", flat=True)) == {"a", "c"}
+
+
+def test_eviction_under_the_limit_is_one_read(monkeypatch, django_assert_num_queries):
+    monkeypatch.setenv("QUIZ_RESPONSE_CACHE_MAX_ENTRIES", "5")
+    for key in "abc":
+        quiz_cache.store(key, QUIZ)
+    with django_assert_num_queries(1):
+        assert quiz_cache.evict() == 0
+    monkeypatch.setenv("QUIZ_RESPONSE_CACHE_MAX_ENTRIES", "1")
+    assert quiz_cache.evict() == 2
+    assert list(QuizResponseCacheEntry.objects.values_list("key", flat=True)) == ["c"]
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.admin.sites import site
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from quiz_app.api import snapshots
+from quiz_app.models import Question, Quiz, QuizSnapshot
+
+pytestmark = pytest.mark.django_db
+
+
+def serialized(quiz_id):
+    return snapshots.render(Quiz.objects.get(id=quiz_id))
+
+
+def test_detail_is_one_query_and_matches_serializer(api, user, django_assert_num_queries, monkeypatch, make_quiz):
+    quiz = make_quiz(user)
+    url = reverse("quiz-detail", kwargs={"id": quiz.id})
+    with django_assert_num_queries(1):
+        res = api.get(url)
+    assert res.status_code == status.HTTP_200_OK
+    assert res["Content-Type"] == "application/json"
+    assert res.content == serialized(quiz.id)
+
+    monkeypatch.setenv("QUIZ_SNAPSHOTS_ENABLED", "false")
+    assert api.get(url).content == res.content
+
+
+def test_writes_refresh_the_snapshot(api, user, make_quiz):
+    quiz = make_quiz(user)
+    url = reverse("quiz-detail", kwargs={"id": quiz.id})
+
+    api.patch(url, {"title": "Renamed"}, format="json")
+    assert api.get(url).json()["title"] == "Renamed"
+
+    q = quiz.questions.first()
+    q.answer = "b"
+    q.save()
+    assert api.get(url).json()["questions"][0]["answer"] == "b"
+
+    q.delete()
+    assert len(api.get(url).json()["questions"]) == 2
+    assert api.get(url).content == serialized(quiz.id)
+
+
+def test_admin_inline_edit_refreshes_snapshot(user, make_quiz):
+    quiz = make_quiz(user, n=1)
+    q = quiz.questions.get()
+    Question.objects.filter(id=q.id).update(answer="c")  # bypasses save(), snapshot is stale now
+    assert b'"answer":"c"' not in QuizSnapshot.objects.get(quiz=quiz).payload
+
+    form = SimpleNamespace(instance=quiz, initial={"user": user.id}, save_m2m=lambda: None)
+    site._registry[Quiz].save_related(RequestFactory().post("/"), form, [], True)
+    assert bytes(QuizSnapshot.objects.get(quiz=quiz).payload) == serialized(quiz.id)
+
+
+def test_admin_inline_save_emits_once(admin_client, user, make_quiz, changed_events):
+    quiz = make_quiz(user, n=3)
+    questions = list(quiz.questions.order_by("id"))
+    data = {"user": user.id, "title": quiz.title, "description": "", "video_url": quiz.video_url,
+            "questions-TOTAL_FORMS": 3, "questions-INITIAL_FORMS": 3,
+            "questions-MIN_NUM_FORMS": 0, "questions-MAX_NUM_FORMS": 1000}
+    for i, q in enumerate(questions):
+        data.update({f"questions-{i}-id": q.id, f"questions-{i}-quiz": quiz.id, f"questions-{i}-question_title": f"Edited {i}",
+                     f"questions-{i}-question_options": '["a", "b"]', f"questions-{i}-answer": "a"})
+    data["questions-2-DELETE"] = "on"
+    changed_events.clear()
+    res = admin_client.post(reverse("admin:quiz_app_quiz_change", args=[quiz.id]), data)
+    assert res.status_code == 302
+    assert changed_events == [[quiz.id]]
+    assert list(quiz.questions.order_by("id").values_list("question_title", flat=True)) == ["Edited 0", "Edited 1"]
+    assert bytes(QuizSnapshot.objects.get(quiz=quiz).payload) == serialized(quiz.id)
+
+
+def test_missing_snapshot_is_built_on_first_read(api, user, make_quiz):
+    quiz = make_quiz(user)
+    QuizSnapshot.objects.all().delete()
+    res = api.get(reverse("quiz-detail", kwargs={"id": quiz.id}))
+    assert res.status_code == status.HTTP_200_OK
+    assert QuizSnapshot.objects.filter(quiz=quiz).exists()
+
+
+def test_snapshot_and_serialized_reads_share_one_etag(api, user, monkeypatch, make_quiz):
+    quiz = make_quiz(user)
+    url = reverse("quiz-detail", kwargs={"id": quiz.id})
+    tag = api.get(url)["ETag"]
+    monkeypatch.setenv("QUIZ_SNAPSHOTS_ENABLED", "false")
+    assert api.get(url)["ETag"] == tag
+    assert api.get(url, HTTP_IF_NONE_MATCH=tag).status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_snapshot_etag_304_and_other_users(api, user, django_user_model, django_assert_num_queries, make_quiz):
+    quiz = make_quiz(user)
+    url = reverse("quiz-detail", kwargs={"id": quiz.id})
+    tag = api.get(url)["ETag"]
+    with django_assert_num_queries(1):
+        assert api.get(url, HTTP_IF_NONE_MATCH=tag).status_code == status.HTTP_304_NOT_MODIFIED
+
+    other = make_quiz(django_user_model.objects.create_user(username="owner", password="x"))
+    res = api.get(reverse("quiz-detail", kwargs={"id": other.id}))
+    assert res.status_code == status.HTTP_403_FORBIDDEN
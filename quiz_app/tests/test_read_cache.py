@@ -0,0 +1,162 @@
+import pytest
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+
+from quiz_app.api import read_cache
+from quiz_app.models import CacheCounter, Quiz, QuizSnapshot
+from quiz_app.services import events, llm, search, service
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(params=["locmem", "file"])
+def cache_backend(request, settings, tmp_path, monkeypatch):
+    backend = {
+        "locmem": "django.core.cache.backends.locmem.LocMemCache",
+        "file": "django.core.cache.backends.filebased.FileBasedCache",
+    }[request.param]
+    settings.CACHES = {**settings.CACHES, "quiz_reads": {"BACKEND": backend, "LOCATION": str(tmp_path)}}
+    monkeypatch.setenv("QUIZ_READ_CACHE_COUNTER_FLUSH", "1000")
+    yield
+    read_cache._cache().clear()
+    read_cache.flush_counters()
+
+
+def test_repeated_reads_skip_the_database(api, user, cache_backend, django_assert_num_queries, make_quiz):
+    quiz = make_quiz(user)
+    for url in (reverse("quiz-list"), reverse("quiz-list") + "?view=summary", reverse("quiz-detail", kwargs={"id": quiz.id})):
+        first = api.get(url)
+        with django_assert_num_queries(0):
+            second = api.get(url)
+        assert second.status_code == status.HTTP_200_OK
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"] and second["Content-Type"] == first["Content-Type"]
+        with django_assert_num_queries(0):
+            assert api.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_writes_invalidate_only_the_owner(api, user, django_user_model, cache_backend, django_assert_num_queries,
+                                          client_for, make_quiz):
+    quiz = make_quiz(user)
+    other = django_user_model.objects.create_user(username="other", password="x")
+    other_api, other_quiz = client_for(other), make_quiz(other, "Theirs")
+    list_url, detail_url = reverse("quiz-list"), reverse("quiz-detail", kwargs={"id": quiz.id})
+    other_list, other_detail = reverse("quiz-list"), reverse("quiz-detail", kwargs={"id": other_quiz.id})
+    for client, url in ((api, list_url), (api, detail_url), (other_api, other_list), (other_api, other_detail)):
+        client.get(url)
+
+    api.patch(detail_url, {"title": "Renamed"}, format="json")
+    assert api.get(detail_url).json()["title"] == "Renamed"
+    assert api.get(list_url).json()[0]["title"] == "Renamed"
+
+    question = quiz.questions.first()
+    question.answer = "d"
+    question.save()
+    assert api.get(detail_url).json()["questions"][0]["answer"] == "d"
+
+    make_quiz(user, "Second")
+    assert len(api.get(list_url).json()) == 2
+
+    api.delete(detail_url)
+    assert api.get(detail_url).status_code == status.HTTP_404_NOT_FOUND
+    assert [q["title"] for q in api.get(list_url).json()] == ["Second"]
+
+    with django_assert_num_queries(0):  # still cached
+        other_api.get(other_list)
+        other_api.get(other_detail)
+
+
+def test_admin_reassign_invalidates_both_owners(api, user, django_user_model, admin_client, cache_backend,
+                                                client_for, make_quiz):
+    quiz = make_quiz(user)
+    other = django_user_model.objects.create_user(username="other", password="x")
+    other_api = client_for(other)
+    assert len(api.get(reverse("quiz-list")).json()) == 1
+    assert other_api.get(reverse("quiz-list")).json() == []
+
+    res = admin_client.post(reverse("admin:quiz_app_quiz_change", args=[quiz.id]), {
+        "user": other.id, "title": quiz.title, "description": "", "video_url": quiz.video_url,
+        "questions-TOTAL_FORMS": "0", "questions-INITIAL_FORMS": "0",
+    })
+    assert res.status_code == 302
+    assert api.get(reverse("quiz-list")).json() == []
+    assert [q["id"] for q in other_api.get(reverse("quiz-list")).json()] == [quiz.id]
+
+
+def test_hit_rate_counters(api, user, admin_user, cache_backend, client_for, make_quiz):
+    make_quiz(user)
+    for _ in range(4):
+        api.get(reverse("quiz-list"))
+    assert api.get(reverse("cache-stats")).status_code == status.HTTP_403_FORBIDDEN
+
+    stats = client_for(admin_user).get(reverse("cache-stats")).json()
+    assert stats["quiz_reads"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+    assert CacheCounter.objects.get(name="quiz_reads").hits == 3
+
+
+def test_disabled_without_a_quiz_reads_cache(api, user, django_assert_num_queries, make_quiz):
+    assert not read_cache.enabled()
+    make_quiz(user)
+    api.get(reverse("quiz-list"))
+    with django_assert_num_queries(3):  # ETag aggregate, quizzes, questions
+        api.get(reverse("quiz-list"))
+    assert Quiz.objects.count() == 1
+
+
+TRANSCRIPT = ("Mitochondria produce most of the energy in a cell. Ribosomes assemble proteins from amino acids. "
+              "The nucleus stores genetic information as DNA. Chloroplasts convert sunlight into chemical energy. ")
+
+
+def test_failed_generation_drops_the_cached_partial_quiz(api, user, cache_backend, monkeypatch):
+    class Broken(llm.Backend):
+        name = model = "broken"
+
+        def generate_stream(self, prompt, schema=None):
+            yield '{"title": "Partial", "questions": [{"question_title": "Q1", "question_options": ["a", "b", "c", "d"], "answer": "a"}'
+            yield ', {"question_title": "broken"}]}'
+
+    monkeypatch.setenv("LLM_BACKEND", "broken")
+    monkeypatch.setenv("LLM_RETRY_BASE_SECONDS", "0")
+    monkeypatch.setenv("LLM_MAX_ATTEMPTS", "1")
+    monkeypatch.setitem(llm._BACKENDS, "broken", Broken())
+    monkeypatch.setattr(service, "get_transcript", lambda *a: (TRANSCRIPT, "captions"))
+    seen = []
+
+    def on_progress(quiz, ready):
+        # a client polls while the questions stream in
+        seen.append(quiz.id)
+        assert [q["id"] for q in api.get(reverse("quiz-list")).json()] == [quiz.id]
+        assert api.get(reverse("quiz-detail", kwargs={"id": quiz.id})).status_code == status.HTTP_200_OK
+
+    with pytest.raises(llm.LLMError):
+        service.create_quiz_from_url(user, "https://www.youtube.com/watch?v=abc", on_progress=on_progress)
+    assert seen
+    assert api.get(reverse("quiz-list")).json() == []
+    assert api.get(reverse("quiz-detail", kwargs={"id": seen[0]})).status_code == status.HTTP_404_NOT_FOUND
+    assert search.search("partial", user_id=user.id) == []
+
+
+def test_events_wait_for_commit_and_rollback_drops_them(user, make_quiz, changed_events):
+    question = make_quiz(user).questions.first()
+    changed_events.clear()
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            question.save()
+            raise RuntimeError
+    assert changed_events == []
+
+    with transaction.atomic():
+        question.save()
+        assert changed_events == []
+    assert changed_events == [[question.quiz_id]]
+
+
+def test_failing_listener_does_not_fail_the_write(user, make_quiz, monkeypatch, caplog):
+    def broken(ids, users):
+        raise RuntimeError("listener down")
+
+    monkeypatch.setitem(events._listeners, "changed", [broken, *events._listeners["changed"]])
+    quiz = make_quiz(user)
+    assert "listener down" in caplog.text
+    assert QuizSnapshot.objects.filter(quiz=quiz).exists()  # later listeners still ran
@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from quiz_app.models import Question, Quiz
+from quiz_app.services import search
+
+pytestmark = pytest.mark.django_db
+
+
+def titles(api, q, **params):
+    res = api.get(reverse("quiz-search"), {"q": q, **params})
+    assert res.status_code == status.HTTP_200_OK
+    return [item["title"] for item in res.json()]
+
+
+def test_ranked_user_scoped_results(api, user, django_user_model, make_quiz):
+    make_quiz(user, "Cell biology", questions=["What do mitochondria produce?"])
+    make_quiz(user, "Mitochondria basics", "All about mitochondria")
+    make_quiz(user, "Plate tectonics", questions=["Which plate is largest?"])
+    make_quiz(django_user_model.objects.create_user(username="other", password="x"), "Mitochondria for others")
+
+    assert titles(api, "mitochondria") == ["Mitochondria basics", "Cell biology"]
+    assert titles(api, "mito") == ["Mitochondria basics", "Cell biology"]  # prefix on the last word
+    assert titles(api, "cell mitochondria") == ["Cell biology"]
+    assert titles(api, "mitochondria", limit=1) == ["Mitochondria basics"]
+    assert titles(api, "volcano") == []
+
+
+def test_options_diacritics_and_fts_syntax(api, user, make_quiz):
+    make_quiz(user, "Über Zellen", questions=["Was ist das?"], options=("Zellkern", "Ribosom", "Golgi", "Plasma"))
+    assert titles(api, "uber") == ["Über Zellen"]
+    assert titles(api, "ribosom") == ["Über Zellen"]
+    assert titles(api, '"zellen*)(') == ["Über Zellen"]  # FTS syntax is not passed through
+
+
+def test_index_follows_writes(api, user, make_quiz):
+    quiz = make_quiz(user, "Photosynthesis", questions=["Where does it happen?"])
+    api.patch(reverse("quiz-detail", kwargs={"id": quiz.id}), {"title": "Respiration"}, format="json")
+    assert titles(api, "photosynthesis") == []
+    assert titles(api, "respiration") == ["Respiration"]
+
+    question = quiz.questions.get()
+    question.question_title = "Which organelle holds chlorophyll?"
+    question.save()
+    assert titles(api, "chlorophyll") == ["Respiration"]
+    question.delete()
+    assert titles(api, "chlorophyll") == []
+
+    api.delete(reverse("quiz-detail", kwargs={"id": quiz.id}))
+    assert titles(api, "respiration") == []
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {search.TABLE}")
+        assert cursor.fetchone()[0] == 0
+
+
+def test_summary_shape_and_sparse_fields(api, user, make_quiz):
+    make_quiz(user, "Genetics", questions=["Q1", "Q2"])
+    item = api.get(reverse("quiz-search"), {"q": "genetics"}).json()[0]
+    assert item["question_count"] == 2 and "questions" not in item
+    assert api.get(reverse("quiz-search"), {"q": "genetics", "fields": "id,title"}).json()[0].keys() == {"id", "title"}
+
+
+def test_empty_query_is_400(api):
+    assert api.get(reverse("quiz-search"), {"q": " ?! "}).status_code == status.HTTP_400_BAD_REQUEST
+    assert api.get(reverse("quiz-search")).status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_admin_search_uses_the_index(admin_client, user, make_quiz):
+    make_quiz(user, "Enzymes", questions=["What lowers activation energy?"])
+    make_quiz(user, "Volcanoes")
+    res = admin_client.get(reverse("admin:quiz_app_quiz_changelist"), {"q": "activation"})
+    assert [quiz.title for quiz in res.context["cl"].result_list] == ["Enzymes"]
+    res = admin_client.get(reverse("admin:quiz_app_quiz_changelist"), {"q": "test"})  # owner's username
+    assert len(res.context["cl"].result_list) == 2
+
+
+def test_rebuild_indexes_existing_rows(user):
+    quiz = Quiz.objects.create(user=user, title="Untracked", video_url="https://x")
+    Question.objects.bulk_create([Question(quiz=quiz, question_title="Bulk inserted", question_options=[], answer="")])
+    assert search.search("bulk") == []
+    search.rebuild()
+    assert search.search("bulk", user_id=user.id) == [quiz.id]
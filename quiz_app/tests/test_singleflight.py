@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+from django.db import OperationalError, connection
+
+from quiz_app.models import PipelineFlight, Quiz
+from quiz_app.services import service, singleflight
+
+QUIZ = {"title": "Shared", "description": "", "questions": [
+    {"question_title": "Q1", "question_options": ["A", "B", "C", "D"], "answer": "A"},
+]}
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setenv("SINGLEFLIGHT_POLL_SECONDS", "0.01")
+
+
+@pytest.mark.django_db
+def test_each_user_gets_own_quiz_from_one_pipeline_run(django_user_model, monkeypatch):
+    calls = []
+
+    def build(url, stage, fresh=False, **kw):
+        calls.append(url)
+        return QUIZ
+
+    monkeypatch.setattr(service, "build_quiz_data", build)
+    alice = django_user_model.objects.create_user(username="alice", password="x")
+    bob = django_user_model.objects.create_user(username="bob", password="x")
+
+    q1 = service.create_quiz_from_url(alice, URL)
+    q2 = service.create_quiz_from_url(bob, "https://youtu.be/dQw4w9WgXcQ")
+
+    assert len(calls) == 1
+    assert q1.id != q2.id
+    assert {q.user_id for q in Quiz.objects.all()} == {alice.id, bob.id}
+    assert q2.questions.count() == 1
+
+
+@pytest.mark.django_db
+def test_fresh_requests_do_not_join_a_flight(django_user_model, monkeypatch):
+    calls = []
+    monkeypatch.setattr(service, "build_quiz_data", lambda url, stage, fresh=False, **kw: calls.append(url) or QUIZ)
+    user = django_user_model.objects.create_user(username="alice", password="x")
+    service.create_quiz_from_url(user, URL)
+    service.create_quiz_from_url(user, URL, fresh=True)
+    assert len(calls) == 2
+
+
+@pytest.mark.django_db
+def test_owner_value_error_is_shared_with_waiters():
+    with pytest.raises(ValueError):
+        singleflight.run_once("k", lambda hb: (_ for _ in ()).throw(ValueError("too short")))
+    with pytest.raises(ValueError, match="too short"):
+        singleflight.run_once("k", lambda hb: QUIZ)
+
+
+@pytest.mark.django_db
+def test_expired_lease_is_taken_over(monkeypatch):
+    monkeypatch.setenv("SINGLEFLIGHT_LEASE_SECONDS", "-1")
+    PipelineFlight.objects.create(key="k", owner="dead", lease_expires_at="2000-01-01T00:00Z")
+    assert singleflight.run_once("k", lambda hb: QUIZ) == QUIZ
+
+
+def test_only_lock_errors_are_retried():
+    calls = []
+
+    def op(error):
+        calls.append(error)
+        if len(calls) == 1:
+            raise OperationalError(error)
+        return "ok"
+
+    assert singleflight._retrying(lambda: op("database is locked")) == "ok"
+    calls.clear()
+    with pytest.raises(OperationalError, match="no such table"):
+        singleflight._retrying(lambda: op("no such table: quiz_app_pipelineflight"))
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_callers_wait_for_single_execution():
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def work(heartbeat):
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        heartbeat()
+        return QUIZ
+
+    def call():
+        try:
+            results.append(singleflight.run_once("video", work))
+        finally:
+            connection.close()
+
+    owner = threading.Thread(target=call)
+    owner.start()
+    assert started.wait(5)
+    waiters = [threading.Thread(target=call) for _ in range(3)]
+    for t in waiters:
+        t.start()
+    release.set()
+    for t in [owner, *waiters]:
+        t.join(10)
+
+    assert len(calls) == 1
+    assert results == [QUIZ] * 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_lease_is_renewed_while_a_long_stage_runs(monkeypatch):
+    monkeypatch.setenv("SINGLEFLIGHT_LEASE_SECONDS", "3")
+
+    def work(heartbeat):
+        first = PipelineFlight.objects.get(key="k").lease_expires_at
+        time.sleep(1.5)  # one stage, no heartbeat() call of its own
+        assert PipelineFlight.objects.get(key="k").lease_expires_at > first
+        return QUIZ
+
+    assert singleflight.run_once("k", work) == QUIZ
+
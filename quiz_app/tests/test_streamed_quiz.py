@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from quiz_app.models import Quiz, QuizJob
+from quiz_app.services import jobs, llm, service
+
+pytestmark = pytest.mark.django_db
+
+TRANSCRIPT = ("Mitochondria produce most of the energy in a cell. Ribosomes assemble proteins from amino acids. "
+              "The nucleus stores genetic information as DNA. Chloroplasts convert sunlight into chemical energy. ") * 2
+
+
+def question(i):
+    return {"question_title": f"Q{i} \"quoted\" {{braces}} [x]?", "question_options": ["a", "b", "c", "d"],
+            "answer": "b"}
+
+
+class Streamer(llm.Backend):
+    """Streams a quiz one question per piece; each call to generate_stream uses the next attempt."""
+    name = model = "streamer"
+
+    def __init__(self, *attempts):
+        self.attempts = list(attempts)
+
+    def generate_stream(self, prompt, schema=None):
+        questions = self.attempts.pop(0)
+        yield '{"title": "Cells", "description": "Organelles", "questions": ['
+        for i, q in enumerate(questions):
+            yield ("," if i else "") + json.dumps(q)
+        yield "]}"
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    def install(*attempts):
+        b = Streamer(*attempts)
+        monkeypatch.setenv("LLM_BACKEND", "streamer")
+        monkeypatch.setitem(llm._BACKENDS, "streamer", b)
+        return b
+    monkeypatch.setenv("LLM_RETRY_BASE_SECONDS", "0")
+    monkeypatch.setattr(service, "get_transcript", lambda *a: (TRANSCRIPT, "captions"))
+    return install
+
+
+def test_array_item_stream_yields_items_as_they_close():
+    text = json.dumps({"title": 'A "q" ]}', "questions": [question(1), question(2)], "description": "d"})
+    parser, seen = llm.ArrayItemStream("questions"), []
+    for i in range(0, len(text), 3):
+        seen += [(len(seen), item) for item in parser.feed(text[i:i + 3])]
+    assert [item for _, item in seen] == [question(1), question(2)]
+    assert parser.fields == {"title": 'A "q" ]}', "description": "d"}
+
+
+def test_questions_are_saved_while_the_response_streams(user, backend):
+    backend([question(i) for i in range(10)])
+    snapshots = []
+
+    def on_progress(quiz, ready):
+        snapshots.append((ready, quiz.questions.count(), Quiz.objects.get(id=quiz.id).title))
+
+    quiz = service.create_quiz_from_url(user, "https://example.com/v", on_progress=on_progress)
+    assert snapshots[0] == (1, 1, "Cells")
+    assert [s[0] for s in snapshots] == list(range(1, 11)) + [10]
+    assert quiz.questions.count() == 10
+    assert quiz.transcript_source == "captions"
+
+
+def test_streamed_questions_refresh_readers_in_batches(user, backend, changed_events):
+    backend([question(i) for i in range(10)])
+    quiz = service.create_quiz_from_url(user, "https://example.com/v")
+    # first question, then every ProgressiveQuiz.emit_every (5), then finish
+    assert changed_events == [[quiz.id]] * 3
+
+
+def test_retry_drops_questions_of_the_failed_attempt(user, backend):
+    bad = {"question_title": "broken", "question_options": ["a"], "answer": "z"}
+    streamer = backend([question(1), question(2), bad], [question(i) for i in range(10)])
+    ready = []
+    quiz = service.create_quiz_from_url(user, "https://example.com/v", on_progress=lambda q, n: ready.append(n))
+    assert ready[:3] == [1, 2, 0]
+    assert [q.question_title for q in quiz.questions.order_by("id")] == [question(i)["question_title"] for i in range(10)]
+    assert not streamer.attempts
+
+
+def test_failed_generation_removes_partial_quiz(user, backend, monkeypatch):
+    monkeypatch.setenv("LLM_MAX_ATTEMPTS", "1")
+    backend([question(1), {"question_title": "broken"}])
+    with pytest.raises(llm.LLMError):
+        service.create_quiz_from_url(user, "https://example.com/v")
+    assert not Quiz.objects.exists()
+
+
+def test_job_status_reports_questions_ready(user, backend, monkeypatch):
+    monkeypatch.setenv("QUIZ_JOB_INPROCESS_WORKERS", "0")
+    backend([question(i) for i in range(10)])
+    job = jobs.enqueue_quiz_job(user, "https://example.com/v")
+    seen = []
+    update = service.ProgressiveQuiz.add
+
+    def add(self, q, fields):
+        update(self, q, fields)
+        seen.append(QuizJob.objects.values_list("questions_ready", "quiz_id").get(id=job.id))
+
+    monkeypatch.setattr(service.ProgressiveQuiz, "add", add)
+    job = jobs.run_job(jobs.claim_next_job())
+    assert job.state == QuizJob.State.SUCCEEDED
+    assert seen[0] == (1, job.quiz_id)
+    assert job.questions_ready == 10
@@ -0,0 +1,86 @@
+import io
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from quiz_app.services import streaming
+from quiz_app.services.audio import SAMPLE_RATE
+from quiz_app.services.timing import StageTimer
+
+
+class SlowStream(io.BytesIO):
+    """PCM source that trickles in like a network download."""
+
+    def read(self, size=-1):
+        time.sleep(0.02)
+        return super().read(size)
+
+
+def lecture(seconds, pause_every):
+    rng = np.random.default_rng(1)
+    samples = (rng.standard_normal(seconds * SAMPLE_RATE) * 0.3).astype(np.float32)
+    for at in range(pause_every, seconds, pause_every):
+        samples[at * SAMPLE_RATE:(at * SAMPLE_RATE) + SAMPLE_RATE // 2] = 0
+    return samples
+
+
+def test_segments_are_transcribed_while_downloading():
+    samples = lecture(60, pause_every=10)
+    seen = []
+
+    def transcribe(segment):
+        time.sleep(0.05)
+        seen.append(len(segment) / SAMPLE_RATE)
+        return f"part{len(seen)}"
+
+    timer = StageTimer()
+    text = streaming.transcribe_stream(SlowStream(samples.tobytes()), transcribe, timer,
+                                       segment_s=10, overlap_s=0)
+
+    assert text == " ".join(f"part{i}" for i in range(1, len(seen) + 1))
+    assert abs(sum(seen) - 60) < 0.1
+    report = timer.report()
+    assert set(report["stages"]) == {"download", "transcribe"}
+    assert report["overlap"] > 0
+
+
+def test_short_stream_is_one_segment():
+    samples = np.zeros(3 * SAMPLE_RATE, dtype=np.float32)
+    text = streaming.transcribe_stream(io.BytesIO(samples.tobytes()), lambda seg: "hello world",
+                                       StageTimer(), segment_s=10, overlap_s=1)
+    assert text == "hello world"
+
+
+def test_download_errors_are_raised():
+    class Broken(io.BytesIO):
+        def read(self, size=-1):
+            raise OSError("connection reset")
+
+    with pytest.raises(OSError, match="connection reset"):
+        streaming.transcribe_stream(Broken(), lambda seg: "", StageTimer(), segment_s=10)
+
+
+def test_ffmpeg_dying_midway_is_a_failure(monkeypatch):
+    # writes one second of audio, then exits like a killed ffmpeg
+    script = f"import sys; sys.stdout.buffer.write(bytes({4 * SAMPLE_RATE})); sys.stdout.flush(); sys.exit(-9 % 256)"
+    monkeypatch.setattr(streaming, "resolve_stream", lambda url, info=None: ("https://media", {}))
+    monkeypatch.setattr(streaming, "ffmpeg_cmd", lambda *a, **kw: [sys.executable, "-c", script])
+    with pytest.raises(ValueError, match="Audio stream failed"):
+        streaming.stream_transcribe("https://youtu.be/x", lambda seg: "partial", StageTimer())
+
+    script = f"import sys; sys.stdout.buffer.write(bytes({4 * SAMPLE_RATE}))"
+    assert streaming.stream_transcribe("https://youtu.be/x", lambda seg: "whole", StageTimer()) == "whole"
+
+
+def test_stage_timer_reports_overlap():
+    timer = StageTimer()
+    timer.start("download")
+    timer.start("transcribe")
+    time.sleep(0.05)
+    timer.stop("download")
+    timer.stop("transcribe")
+    report = timer.report()
+    assert report["serial"] >= 0.1
+    assert report["overlap"] >= 0.04
@@ -0,0 +1,57 @@
+import pytest
+
+from quiz_app.models import TranscriptCacheEntry
+from quiz_app.services.timing import StageTimer
+from quiz_app.services import counters, service, transcripts
+from quiz_app.services.video import resolve_video_key
+
+pytestmark = pytest.mark.django_db
+
+TRANSCRIPT = "In this lecture we look at photosynthesis and the light reactions. " * 20
+
+
+def test_resolve_video_key_is_canonical():
+    assert resolve_video_key("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10") == "youtube:dQw4w9WgXcQ"
+    assert resolve_video_key("https://youtu.be/dQw4w9WgXcQ") == "youtube:dQw4w9WgXcQ"
+    assert resolve_video_key("https://example.com/page") is None
+
+
+def test_store_compresses_and_lookup_counts_hits():
+    assert transcripts.lookup("youtube:abc", "base") == (None, None)
+    transcripts.store("youtube:abc", "base", TRANSCRIPT, "whisper")
+
+    entry = TranscriptCacheEntry.objects.get()
+    assert entry.size < len(TRANSCRIPT)
+    assert transcripts.lookup("youtube:abc", "base") == (TRANSCRIPT, "whisper")
+    assert transcripts.lookup("youtube:abc", "small") == (None, None)
+    assert counters.stats()["transcripts"] == {"hits": 1, "misses": 2, "hit_rate": 0.3333}
+
+
+def test_evict_by_size_drops_least_recently_used(monkeypatch):
+    transcripts.store("youtube:old", "base", TRANSCRIPT)
+    transcripts.store("youtube:new", "base", TRANSCRIPT + "x")
+    transcripts.lookup("youtube:new", "base")
+    size = TranscriptCacheEntry.objects.get(video_key="youtube:new").size
+    monkeypatch.setenv("TRANSCRIPT_CACHE_MAX_MB", str(size / 1024 / 1024))
+
+    assert transcripts.evict() == 1
+    assert list(TranscriptCacheEntry.objects.values_list("video_key", flat=True)) == ["youtube:new"]
+
+
+def test_evict_by_age(monkeypatch):
+    transcripts.store("youtube:abc", "base", TRANSCRIPT)
+    monkeypatch.setenv("TRANSCRIPT_CACHE_MAX_AGE_DAYS", "0")
+    assert transcripts.lookup("youtube:abc", "base") == (None, None)
+    assert transcripts.evict() == 1
+
+
+def test_cache_hit_skips_download_and_whisper(monkeypatch, tmp_path):
+    def fail(*args, **kwargs):
+        raise AssertionError("pipeline stage should be skipped")
+
+    monkeypatch.setattr(service, "fetch_audio", fail)
+    monkeypatch.setattr(service, "transcribe_with_whisper", fail)
+    transcripts.store("youtube:dQw4w9WgXcQ", service._whisper_model_name(), TRANSCRIPT)
+
+    text, source = service.get_transcript("https://youtu.be/dQw4w9WgXcQ", str(tmp_path), lambda name: None, StageTimer())
+    assert (text, source) == (TRANSCRIPT, "cache")
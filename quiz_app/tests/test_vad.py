@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from quiz_app.services import service, vad
+from quiz_app.services.audio import SAMPLE_RATE
+from quiz_app.services.timing import StageTimer
+
+rng = np.random.default_rng(0)
+
+
+def speech(seconds):
+    """Noise bursts with a ~4 Hz syllable rhythm."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * 4 * t) > -0.2).astype(np.float32)
+    return (rng.standard_normal(len(t)) * 0.2 * envelope).astype(np.float32)
+
+
+def music(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * 440 * t) + 0.2 * np.sin(2 * np.pi * 660 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * 0.001).astype(np.float32)
+
+
+def test_trim_keeps_speech_and_drops_intro_and_outro():
+    audio = np.concatenate([music(20), speech(30), silence(10)])
+    trimmed, ratio = vad.trim(audio)
+    assert 0.45 < ratio < 0.6
+    assert 29 <= len(trimmed) / SAMPLE_RATE <= 32
+
+
+def test_gate_fails_fast_on_music_after_probe():
+    gate = vad.SpeechGate(min_ratio=0.2, probe_seconds=60, reject=True)
+    assert len(gate(music(30))) == 0
+    with pytest.raises(ValueError, match="too little speech"):
+        gate(music(30))
+
+
+def test_gate_stops_trimming_after_probe_without_reject():
+    gate = vad.SpeechGate(min_ratio=0.2, probe_seconds=60, reject=False)
+    assert len(gate(music(30))) == 0
+    assert len(gate(music(30))) == 30 * SAMPLE_RATE
+    assert len(gate(music(10))) == 10 * SAMPLE_RATE
+
+
+def test_gate_passes_lecture_with_padding():
+    gate = vad.SpeechGate(min_ratio=0.2, probe_seconds=0)
+    out = gate(np.concatenate([silence(5), speech(60), music(5)]))
+    assert gate.ratio > 0.8
+    assert len(out) < 70 * SAMPLE_RATE
+
+
+def test_pipeline_rejects_music_before_whisper(monkeypatch, tmp_path):
+    def fail(source):
+        raise AssertionError("Whisper must not run")
+
+    monkeypatch.setenv("AUDIO_DOWNLOAD_MODE", "pcm")
+    monkeypatch.setattr(service, "fetch_audio", lambda url, out, span=None: music(120))
+    monkeypatch.setattr(service, "transcribe_with_whisper", fail)
+    with pytest.raises(ValueError, match="too little speech"):
+        service._audio_transcript("https://youtu.be/x", str(tmp_path), lambda n: None, StageTimer())
+
+
+def test_pipeline_falls_through_to_whisper_without_reject(monkeypatch, tmp_path):
+    seen = []
+    monkeypatch.setenv("AUDIO_DOWNLOAD_MODE", "pcm")
+    monkeypatch.setenv("VAD_REJECT", "false")
+    monkeypatch.setattr(service, "fetch_audio", lambda url, out, span=None: music(120))
+    monkeypatch.setattr(service, "transcribe_with_whisper", lambda s: seen.append(len(s)) or "text")
+    assert service._audio_transcript("https://youtu.be/x", str(tmp_path), lambda n: None, StageTimer()) == "text"
+    assert seen == [120 * SAMPLE_RATE]
+
+
+def test_pipeline_sends_only_speech_to_whisper(monkeypatch, tmp_path):
+    seen = []
+    monkeypatch.setenv("AUDIO_DOWNLOAD_MODE", "pcm")
+    monkeypatch.setattr(service, "fetch_audio", lambda url, out, span=None: np.concatenate([music(30), speech(60)]))
+    monkeypatch.setattr(service, "transcribe_with_whisper", lambda s: seen.append(len(s)) or "text")
+    service._audio_transcript("https://youtu.be/x", str(tmp_path), lambda n: None, StageTimer())
+    assert seen and seen[0] / SAMPLE_RATE < 62
@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+import pytest
+
+from quiz_app.services import service, whisper_server
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, source, **kwargs):
+        if isinstance(source, str) and source.endswith("broken.wav"):
+            raise RuntimeError("cannot decode")
+        self.calls.append(source)
+        if isinstance(source, str):
+            return {"text": f"file {source.rsplit('/', 1)[-1]}"}
+        return {"text": f"{len(source)} samples"}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    path = str(tmp_path / "w.sock")
+    monkeypatch.setenv("WHISPER_SERVER_SOCKET", path)
+    srv = whisper_server.WhisperServer(path, FakeModel(), "fake")
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_health_reports_queue_depth(server):
+    info = whisper_server.health()
+    assert info["ok"] and info["model"] == "fake"
+    assert info["queue_depth"] == 0 and info["processed"] == 0
+
+
+def test_transcribe_pcm_and_path(server):
+    samples = np.linspace(-1, 1, 32000, dtype=np.float32)
+    assert whisper_server.transcribe(samples) == "32000 samples"
+    np.testing.assert_array_equal(server.model.calls[0], samples)
+    assert whisper_server.transcribe("/data/audio.webm") == "file audio.webm"
+    assert whisper_server.health()["processed"] == 2
+
+
+def test_transcription_errors_are_reported(server):
+    with pytest.raises(RuntimeError, match="cannot decode"):
+        whisper_server.transcribe("/data/broken.wav")
+    assert whisper_server.health()["failed"] == 1
+
+
+def test_server_backend_and_local_fallback(server, monkeypatch, tmp_path):
+    monkeypatch.setenv("WHISPER_BACKEND", "server")
+    monkeypatch.setattr(service, "_transcribe_local", lambda source: "local text")
+    assert service.transcribe_with_whisper("/data/a.webm") == "file a.webm"
+
+    monkeypatch.setenv("WHISPER_SERVER_SOCKET", str(tmp_path / "missing.sock"))
+    assert service.transcribe_with_whisper("/data/a.webm") == "local text"
+
+
+def test_server_timeout_is_a_failure_not_a_fallback(monkeypatch):
+    monkeypatch.setenv("WHISPER_BACKEND", "server")
+    monkeypatch.setattr(service, "_transcribe_local", lambda source: pytest.fail("fell back"))
+
+    def slow(source):
+        raise TimeoutError("timed out")
+
+    monkeypatch.setattr(whisper_server, "transcribe", slow)
+    with pytest.raises(TimeoutError):
+        service.transcribe_with_whisper("/data/a.webm")
+